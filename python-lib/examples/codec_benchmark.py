@@ -0,0 +1,56 @@
+"""
+Compares the compiled request codec against interpreting the signal layout on every frame, which
+is how Request.encode/decode worked before the operation tables were introduced.
+
+Usage: python examples/codec_benchmark.py [network.json] [request], run from the python-lib folder
+"""
+import sys
+import timeit
+
+from line_protocol.network import load_network, SignalValue, SignalValueContainer
+
+def interpreted_encode(request, signals):
+    data = 0
+    for signal in request.signals:
+        if signal.name in signals:
+            value = signal.encoder.encode(signals[signal.name]) if signal.encoder else signals[signal.name]
+        else:
+            value = signal.encoder.encode(signal.initial) if signal.encoder else signal.initial
+        data |= (value & ((1 << signal.width) - 1)) << signal.offset
+    return list(data.to_bytes(request.size, byteorder='little'))
+
+def interpreted_decode(request, data):
+    raw_data = int.from_bytes(bytes(data), byteorder='little')
+    decoded = {signal.name: (raw_data >> signal.offset) & ((1 << signal.width) - 1)
+               for signal in request.signals}
+    signals = []
+    for signal in request.signals:
+        raw_value = decoded[signal.name]
+        phy_value = signal.encoder.decode(raw_value) if signal.encoder else raw_value
+        signals.append(SignalValue(signal, phy_value, raw_value))
+    return SignalValueContainer(signals)
+
+def main():
+    network = load_network(sys.argv[1] if len(sys.argv) > 1 else 'tests/data/network-1.json')
+    request = network.get_request(sys.argv[2]) if len(sys.argv) > 2 else network.requests[0]
+    values = {signal.name: signal.initial for signal in request.signals[::2]}
+    data = request.encode(values)
+    container = request.decode(data)
+    number = 100000
+
+    cases = [
+        ('encode', lambda: interpreted_encode(request, values), lambda: request.encode(values)),
+        ('decode', lambda: interpreted_decode(request, data), lambda: request.decode(data)),
+        ('decode_into', lambda: interpreted_decode(request, data),
+                        lambda: request.decode_into(data, container)),
+    ]
+    print(f'{request.name}: {len(request.signals)} signals, {request.size} bytes, {number} frames')
+    for (name, before, after) in cases:
+        before_time = timeit.timeit(before, number=number)
+        after_time = timeit.timeit(after, number=number)
+        print(f'{name:12} interpreted {before_time * 1e6 / number:6.2f}us '
+              f'compiled {after_time * 1e6 / number:6.2f}us '
+              f'speedup {before_time / after_time:4.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -5,4 +5,6 @@ from line_protocol.network.request import (Request, Signal, SignalRef,
                                            SignalEncoder, FormulaEncoder, MappingEncoder,
                                            NoneEncoder,
                                            SignalValue, SignalValueContainer)
-from line_protocol.network.schedule import Schedule, ScheduleExecutor, FixedOrderSchedule, PriorityAgingSchedule
+from line_protocol.network.schedule import (Schedule, ScheduleExecutor, ScheduleStatistics, FixedOrderSchedule,
+                                            PriorityAgingSchedule)
+from line_protocol.network.diff import NetworkDiff, diff_networks
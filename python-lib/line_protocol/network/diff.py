@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import Set, Dict, Tuple
+
+from line_protocol.network.network import Network
+from line_protocol.network.request import Request, SignalEncoder
+from line_protocol.network.schedule import (Schedule, ScheduleEntry, RequestScheduleEntry,
+                                            PriorityScheduleEntry)
+
+@dataclass
+class NetworkDiff():
+    """
+    Differences between two network definitions. Requests are identified by their code, nodes by
+    their address and schedules by their name. A request is changed when its name or layout
+    differs, a node when a different node uses the address.
+    """
+    added_requests: Set[int] = field(default_factory=set)
+    removed_requests: Set[int] = field(default_factory=set)
+    changed_requests: Set[int] = field(default_factory=set)
+    changed_nodes: Set[int] = field(default_factory=set)
+    added_schedules: Set[str] = field(default_factory=set)
+    removed_schedules: Set[str] = field(default_factory=set)
+    changed_schedules: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return any((self.added_requests, self.removed_requests, self.changed_requests,
+                    self.changed_nodes, self.added_schedules, self.removed_schedules,
+                    self.changed_schedules))
+
+def _encoder_signature(encoder: SignalEncoder | None) -> Tuple:
+    if encoder is None:
+        return ()
+    return (type(encoder).__name__, tuple(sorted((key, repr(value)) for (key, value) in vars(encoder).items())))
+
+def request_signature(request: Request) -> Tuple:
+    """
+    Returns a comparable description of the request's name and layout.
+
+    :param request: Request
+    :type request: Request
+    :return: Signature of the request
+    :rtype: Tuple
+    """
+    return (request.name, request.id, request.size,
+            tuple((signal.name, signal.offset, signal.width, signal.initial,
+                   _encoder_signature(signal.encoder)) for signal in request.signals))
+
+def _entry_signature(entry: ScheduleEntry) -> Tuple:
+    if isinstance(entry, PriorityScheduleEntry):
+        return ('priority', entry.cycle, entry.max_age, _entry_signature(entry.entry))
+    if isinstance(entry, RequestScheduleEntry):
+        return (type(entry).__name__, entry.request.id)
+    node = getattr(entry, 'node', None)
+    return (type(entry).__name__, node.address if node is not None else None)
+
+def schedule_signature(schedule: Schedule) -> Tuple:
+    """
+    Returns a comparable description of the schedule's settings and entries.
+
+    :param schedule: Schedule
+    :type schedule: Schedule
+    :return: Signature of the schedule
+    :rtype: Tuple
+    """
+    settings = tuple(sorted((key, repr(value)) for (key, value) in vars(schedule).items()
+                            if key != 'entries'))
+    entries = tuple(_entry_signature(entry) for entry in getattr(schedule, 'entries', []))
+    return (type(schedule).__name__, settings, entries)
+
+def _node_names(network: Network) -> Dict[int, str]:
+    names: Dict[int, str] = {}
+    for node in network.nodes:
+        names.setdefault(node.address, node.name)
+    return names
+
+def diff_networks(old: Network, new: Network) -> NetworkDiff:
+    """
+    Compares two network definitions.
+
+    :param old: Current network
+    :type old: Network
+    :param new: New network
+    :type new: Network
+    :return: Differences
+    :rtype: NetworkDiff
+    """
+    diff = NetworkDiff()
+
+    old_requests = {request.id: request for request in old.requests}
+    new_requests = {request.id: request for request in new.requests}
+    diff.added_requests = set(new_requests) - set(old_requests)
+    diff.removed_requests = set(old_requests) - set(new_requests)
+    diff.changed_requests = {id for id in set(old_requests) & set(new_requests)
+                             if request_signature(old_requests[id]) != request_signature(new_requests[id])}
+
+    old_nodes = _node_names(old)
+    new_nodes = _node_names(new)
+    diff.changed_nodes = {address for address in set(old_nodes) | set(new_nodes)
+                          if old_nodes.get(address) != new_nodes.get(address)}
+
+    old_schedules = {schedule.name: schedule for schedule in old.schedules}
+    new_schedules = {schedule.name: schedule for schedule in new.schedules}
+    diff.added_schedules = set(new_schedules) - set(old_schedules)
+    diff.removed_schedules = set(old_schedules) - set(new_schedules)
+    diff.changed_schedules = {name for name in set(old_schedules) & set(new_schedules)
+                              if schedule_signature(old_schedules[name]) != schedule_signature(new_schedules[name])}
+    return diff
@@ -1,4 +1,11 @@
 import json
+import os
+import sys
+import hashlib
+import pickle
+import tempfile
+import logging
+from importlib import metadata
 from typing import List
 
 from line_protocol.network.network import Network
@@ -13,6 +20,17 @@ from line_protocol.network.schedule import (ScheduleEntry, Schedule, FixedOrderS
 
 from line_protocol.protocol.constants import *
 
+logger = logging.getLogger(__name__)
+
+# Bumped when the pickled representation of the network changes
+_CACHE_FORMAT = 2
+
+def _library_version() -> str:
+    try:
+        return metadata.version('line-protocol')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
 def to_int(value: str) -> int:
     if isinstance(value, int):
         return value
@@ -55,7 +73,8 @@ def parse_fixed_order_schedule(name: str, schedule: dict, network) -> FixedOrder
     entries = []
     for entry in schedule['entries']:
         entries.append(parse_schedule_entry(name, entry, network))
-    return FixedOrderSchedule(name, entries, schedule['slots'] if 'slots' in schedule else 'variable', reserve_slots=True, delay=schedule['delay'])
+    return FixedOrderSchedule(name, entries, schedule['slots'] if 'slots' in schedule else 'variable', reserve_slots=schedule.get('reserveSlots', True), delay=schedule['delay'],
+                              overrun=schedule.get('overrun', 'skip'))
 
 def parse_priority_aging_schedule(name: str, schedule: dict, network) -> PriorityAgingSchedule:
     entries = []
@@ -63,7 +82,8 @@ def parse_priority_aging_schedule(name: str, schedule: dict, network) -> Priorit
         if 'cycle' not in entry or 'maxAge' not in entry:
             raise ValueError(f"{name}: Priority aging entry must have 'cycle' and 'maxAge' defined")
         entries.append(PriorityScheduleEntry(parse_schedule_entry(name, entry, network), entry['cycle'], entry['maxAge']))
-    return PriorityAgingSchedule(name, entries, schedule['slots'] if 'slots' in schedule else 'variable', schedule['phase'], reserve_slots=True, delay=schedule['delay'])
+    return PriorityAgingSchedule(name, entries, schedule['slots'] if 'slots' in schedule else 'variable', schedule['phase'], reserve_slots=schedule.get('reserveSlots', True), delay=schedule['delay'],
+                                 overrun=schedule.get('overrun', 'skip'))
 
 def load_schedules(network, obj: dict) -> List[Schedule]:
     schedules = []
@@ -106,21 +126,20 @@ def parse_signal(name: str, signal: dict, encoder: SignalEncoder) -> Signal:
     initial = signal.get('initial', 0)
     return Signal(name, offset, width, initial, encoder)
 
-def load_network(path: str) -> Network:
-    with open(path, 'r') as f:
-        data = json.load(f)
-
+def parse_network(data: dict) -> Network:
     network = Network()
     network.baudrate = data['baudrate']
 
     for (name, enc) in data['encoders'].items():
         network.encoders.append(parse_encoder(name, enc))
 
+    # Signals without an encoder share a single instance
+    none_encoder = NoneEncoder('none')
     for (name, req) in data['requests'].items():
         signals = []
         for (sig_name, sig) in req['layout'].items():
             if 'encoder' not in sig:
-                encoder = NoneEncoder('none')
+                encoder = none_encoder
             else:
                 encoder = network.get_encoder(sig['encoder'])
 
@@ -141,3 +160,65 @@ def load_network(path: str) -> Network:
     network.schedules += schedules
 
     return network
+
+def _cache_path(cache_dir: str, content: bytes) -> str:
+    digest = hashlib.sha256(content)
+    digest.update(f'{_library_version()}/{_CACHE_FORMAT}/{sys.version_info[0]}.{sys.version_info[1]}'.encode())
+    return os.path.join(cache_dir, f'network-{digest.hexdigest()}.pickle')
+
+def _read_cache(path: str) -> Network | None:
+    try:
+        with open(path, 'rb') as f:
+            network = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning("Ignoring unreadable network cache %s: %s", path, exc)
+        return None
+    return network if isinstance(network, Network) else None
+
+def _write_cache(path: str, network: Network):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a temporary file first, concurrent loaders never see a partial cache entry
+        (fd, temp_path) = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(network, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as exc:
+        logger.warning("Unable to write network cache %s: %s", path, exc)
+
+def load_network(path: str, cache_dir: str | None = None) -> Network:
+    """
+    Loads a network definition from a JSON file.
+
+    When a cache directory is given, or set through the LINE_NETWORK_CACHE environment variable,
+    the parsed network is stored there and reused as long as the file content and the library
+    version are the same. A changed file simply misses the cache and is parsed again. The cache
+    entries are pickles, the directory must only be writable by trusted users.
+
+    :param path: Path of the network file
+    :type path: str
+    :param cache_dir: Directory of the compiled network cache, defaults to None
+    :type cache_dir: str | None, optional
+    :return: Network
+    :rtype: Network
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if cache_dir is None:
+        cache_dir = os.environ.get('LINE_NETWORK_CACHE')
+    if not cache_dir:
+        return parse_network(json.loads(content))
+
+    cache_path = _cache_path(cache_dir, content)
+    network = _read_cache(cache_path)
+    if network is None:
+        network = parse_network(json.loads(content))
+        _write_cache(cache_path, network)
+    return network
@@ -1,18 +1,149 @@
-from typing import Union, List, TYPE_CHECKING
+from typing import Union, List, Dict, Callable, Any, Iterable, TYPE_CHECKING
+from operator import attrgetter
 
 from line_protocol.network.request import Request, SignalEncoder, SignalRef
 from line_protocol.network.nodes import Node
 from line_protocol.network.schedule import Schedule
 
+class IndexedList(list):
+    """
+    List that maintains lookup tables of its items by one or more keys, e.g.: name and address.
+
+    The tables are built on the first lookup and dropped whenever the list is modified, so they
+    always reflect the items in the list. Changing the key attribute of an item that's already in
+    the list isn't tracked. When several items share a key the first one is found, like a linear
+    search would.
+
+    :param keys: Function extracting each key from an item
+    :type keys: Dict[str, Callable[[Any], Any]]
+    :param items: Initial items, defaults to ()
+    :type items: Iterable, optional
+    """
+
+    def __init__(self, keys: Dict[str, Callable[[Any], Any]], items: Iterable = ()) -> None:
+        super().__init__(items)
+        self._keys = keys
+        self._indexes: Dict[str, Dict[Any, Any]] | None = None
+
+    def lookup(self, key: str, value: Any) -> Any | None:
+        """
+        Returns the first item whose key matches the value.
+
+        :param key: Name of the key
+        :type key: str
+        :param value: Value to look for
+        :type value: Any
+        :return: The item or None if there's no match
+        :rtype: Any | None
+        """
+        indexes = self._indexes
+        if indexes is None:
+            indexes = {name: {} for name in self._keys}
+            for item in self:
+                for (name, extract) in self._keys.items():
+                    indexes[name].setdefault(extract(item), item)
+            self._indexes = indexes
+        return indexes[key].get(value)
+
+    def _invalidate(self):
+        self._indexes = None
+
+    def __getstate__(self) -> dict:
+        return {'_keys': self._keys, '_indexes': None}
+
+    def append(self, item):
+        super().append(item)
+        self._invalidate()
+
+    def extend(self, items):
+        super().extend(items)
+        self._invalidate()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._invalidate()
+
+    def remove(self, item):
+        super().remove(item)
+        self._invalidate()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._invalidate()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+        self._invalidate()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._invalidate()
+
+    def __iadd__(self, items):
+        result = super().__iadd__(items)
+        self._invalidate()
+        return result
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._invalidate()
+        return result
+
 class Network:
 
     def __init__(self) -> None:
         self.baudrate: int = 0
         self.master: Node | None = None
         self.nodes = []
-        self.requests: List[Request] = []
-        self.encoders: List[SignalEncoder] = []
-        self.schedules: List[Schedule] = []
+        self.requests = []
+        self.encoders = []
+        self.schedules = []
+
+    # The lists are indexed, assigning a plain list wraps it so lookups stay consistent
+    @property
+    def nodes(self) -> List[Node]:
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: List[Node]):
+        self._nodes = IndexedList({'name': attrgetter('name'), 'address': attrgetter('address')}, nodes)
+
+    @property
+    def requests(self) -> List[Request]:
+        return self._requests
+
+    @requests.setter
+    def requests(self, requests: List[Request]):
+        self._requests = IndexedList({'name': attrgetter('name'), 'id': attrgetter('id')}, requests)
+
+    @property
+    def encoders(self) -> List[SignalEncoder]:
+        return self._encoders
+
+    @encoders.setter
+    def encoders(self, encoders: List[SignalEncoder]):
+        self._encoders = IndexedList({'name': attrgetter('name')}, encoders)
+
+    @property
+    def schedules(self) -> List[Schedule]:
+        return self._schedules
+
+    @schedules.setter
+    def schedules(self, schedules: List[Schedule]):
+        self._schedules = IndexedList({'name': attrgetter('name')}, schedules)
 
     def get_node(self, name: str) -> 'Node':
         """
@@ -24,9 +155,9 @@ class Network:
         :return: Node
         :rtype: Node
         """
-        for a in self.nodes:
-            if a.name == name:
-                return a
+        node = self._nodes.lookup('name', name)
+        if node is not None:
+            return node
         raise LookupError(f'No such node: {name}')
     
     def get_node_by_address(self, address: int) -> 'Node':
@@ -39,9 +170,9 @@ class Network:
         :return: Node
         :rtype: Node
         """
-        for a in self.nodes:
-            if a.address == address:
-                return a
+        node = self._nodes.lookup('address', address)
+        if node is not None:
+            return node
         raise LookupError(f'No such node: {address}')
     
     def get_nodes(self) -> List['Node']:
@@ -57,9 +188,9 @@ class Network:
         :return: Request
         :rtype: Request
         """
-        for a in self.requests:
-            if a.name == id or a.id == id:
-                return a
+        request = self._requests.lookup('name' if isinstance(id, str) else 'id', id)
+        if request is not None:
+            return request
         raise LookupError(f'No such request: {id}')
     
     def get_signal(self, request: Union[int, str], name: str) -> 'SignalRef':
@@ -87,9 +218,9 @@ class Network:
         :return: SignalEncoder
         :rtype: SignalEncoder
         """
-        for a in self.encoders:
-            if a.name == name:
-                return a
+        encoder = self._encoders.lookup('name', name)
+        if encoder is not None:
+            return encoder
         raise LookupError(f'No such encoder: {name}')
     
     def get_schedule(self, name: str) -> 'Schedule':
@@ -102,7 +233,7 @@ class Network:
         :return: Schedule
         :rtype: Schedule
         """
-        for a in self.schedules:
-            if a.name == name:
-                return a
+        schedule = self._schedules.lookup('name', name)
+        if schedule is not None:
+            return schedule
         raise LookupError(f'No such schedule: {name}')
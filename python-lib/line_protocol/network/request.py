@@ -1,7 +1,19 @@
 from dataclasses import dataclass
-from typing import List, Union, Dict, Iterable
+from typing import List, Union, Dict, Sequence, TYPE_CHECKING
 import ctypes
 
+if TYPE_CHECKING:
+    import numpy
+
+def _import_numpy():
+    # NumPy is only needed for the batch operations, it's installed with the 'numpy' extra
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("NumPy is required for batch operations, "
+                          "install it with: pip install line-protocol[numpy]") from exc
+    return numpy
+
 class SignalEncoder:
     """
     SignalEncoder is an interface for classes that can convert in between the network representation
@@ -33,6 +45,32 @@ class SignalEncoder:
         """
         raise NotImplementedError()
 
+    def encode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Encodes an array of physical values, by default every element is encoded separately.
+        Encoders override this with a vectorized implementation.
+
+        :param values: Physical values
+        :type values: numpy.ndarray
+        :return: Raw values
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        return numpy.array([self.encode(value.item()) for value in numpy.asarray(values)], dtype=numpy.int64)
+
+    def decode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        Decodes an array of raw values, by default every element is decoded separately. Encoders
+        override this with a vectorized implementation.
+
+        :param values: Raw values
+        :type values: numpy.ndarray
+        :return: Physical values
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        return numpy.array([self.decode(int(value)) for value in values])
+
 class NoneEncoder(SignalEncoder):
     """
     NoneEncoder does no conversion when encoding or decoding, inputs are restricted to integers.
@@ -49,6 +87,16 @@ class NoneEncoder(SignalEncoder):
     def decode(self, value: int) -> int:
         return value
 
+    def encode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        values = numpy.asarray(values)
+        if values.dtype.kind not in 'iu':
+            raise ValueError(f"Unable to encode non-integer array of {values.dtype}")
+        return values
+
+    def decode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        return values
+
 class FormulaEncoder(SignalEncoder):
     """
     Formula encoder takes a physical value and maps it to an integer range
@@ -68,6 +116,17 @@ class FormulaEncoder(SignalEncoder):
     def decode(self, value: int) -> float:
         return value * self.scale + self.offset
 
+    def encode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        values = numpy.asarray(values, dtype=numpy.float64)
+        # Truncated towards zero, same as the scalar encoder
+        return numpy.trunc((values - self.offset) / self.scale).astype(numpy.int64)
+
+    def decode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        # Raw columns come in their narrowest dtype, integer factors would compute in it and wrap
+        return numpy.asarray(values).astype(numpy.float64) * self.scale + self.offset
+
 class MappingEncoder(SignalEncoder):
     """
     Mapping encoder takes labels and maps them to integer values
@@ -76,11 +135,14 @@ class MappingEncoder(SignalEncoder):
     def __init__(self, name: str, mapping: Dict[int, str]) -> None:
         super().__init__(name)
         self.mapping = mapping
+        # Reverse index, when labels repeat the first value is used
+        self._reverse: Dict[str, int] = {}
+        for (key, val) in mapping.items():
+            self._reverse.setdefault(val, key)
 
     def encode(self, value: str) -> int:
-        for (key, val) in self.mapping.items():
-            if val == value:
-                return key
+        if value in self._reverse:
+            return self._reverse[value]
         raise ValueError(f'{self.name}: Unable to encode {value}')
 
     def decode(self, value: int) -> str:
@@ -88,6 +150,19 @@ class MappingEncoder(SignalEncoder):
             return self.mapping[value]
         raise ValueError(f'{self.name}: Value {value} is not mapped')
 
+    def encode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        # Only the distinct labels are looked up
+        (labels, inverse) = numpy.unique(numpy.asarray(values), return_inverse=True)
+        codes = numpy.array([self.encode(label.item()) for label in labels], dtype=numpy.int64)
+        return codes[inverse].reshape(numpy.shape(values))
+
+    def decode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        (codes, inverse) = numpy.unique(numpy.asarray(values), return_inverse=True)
+        labels = numpy.array([self.decode(int(code)) for code in codes])
+        return labels[inverse].reshape(numpy.shape(values))
+
 class TwosComplementEncoder(SignalEncoder):
     """
     TwosComplementEncoder is a special encoder for signed integers
@@ -107,6 +182,16 @@ class TwosComplementEncoder(SignalEncoder):
             return value - (1 << self.width)
         return value
 
+    def encode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        values = numpy.asarray(values, dtype=numpy.int64)
+        return numpy.where(values < 0, values + (1 << self.width), values)
+
+    def decode_array(self, values: 'numpy.ndarray') -> 'numpy.ndarray':
+        numpy = _import_numpy()
+        values = values.astype(numpy.int64)
+        return values - (((values >> (self.width - 1)) & 1) << self.width)
+
 @dataclass(unsafe_hash=True)
 class Signal():
     name: str
@@ -115,17 +200,36 @@ class Signal():
     initial: Union[int, float, str]
     encoder: SignalEncoder
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class SignalValue:
     signal: Signal
     phy: Union[int, float, str]
     raw: int
 
+    def copy(self) -> 'SignalValue':
+        """
+        Returns a copy of the value, used to keep values that are updated in place.
+
+        :return: Copy of the signal value
+        :rtype: SignalValue
+        """
+        return SignalValue(self.signal, self.phy, self.raw)
+
 class SignalValueContainer():
 
     def __init__(self, signals: List[SignalValue]) -> None:
         self._signals = {signal.signal.name: signal for signal in signals}
 
+    def snapshot(self) -> 'SignalValueContainer':
+        """
+        Returns a copy of the container and its values. Containers decoded in place are updated by
+        the next response, a snapshot is unaffected by it.
+
+        :return: Copy of the container
+        :rtype: SignalValueContainer
+        """
+        return SignalValueContainer([signal.copy() for signal in self._signals.values()])
+
     def get_signal(self, name: str) -> SignalValue:
         if name in self._signals:
             return self._signals[name]
@@ -140,6 +244,36 @@ class SignalValueContainer():
     def __iter__(self):
         return iter(self._signals.values())
 
+class _SignalOp():
+    """
+    Precomputed layout of a signal within the frame
+    """
+    __slots__ = ('signal', 'name', 'shift', 'width', 'mask', 'encode', 'decode')
+
+    def __init__(self, signal: Signal) -> None:
+        self.signal = signal
+        self.name = signal.name
+        self.shift = signal.offset
+        self.width = signal.width
+        self.mask = (1 << signal.width) - 1
+        self.encode = signal.encoder.encode if signal.encoder is not None else None
+        self.decode = signal.encoder.decode if signal.encoder is not None else None
+
+class _RequestCodec():
+    """
+    Operation table of a request, compiled once so frames are encoded and decoded without
+    interpreting the layout on every call. The initial values of all signals are folded into a
+    single word that encoding starts from.
+    """
+
+    def __init__(self, request: 'Request') -> None:
+        self.ops = [_SignalOp(signal) for signal in request.signals]
+        self.by_name = {op.name: op for op in self.ops}
+        self.initial = 0
+        for op in self.ops:
+            value = op.encode(op.signal.initial) if op.encode is not None else op.signal.initial
+            self.initial |= (value & op.mask) << op.shift
+
 class Request():
 
     def __init__(self, name: str, id: int, size: int, signals: List[Signal]) -> None:
@@ -151,9 +285,40 @@ class Request():
             if signal.offset < 0 or signal.width <= 0 or signal.offset + signal.width > size * 8:
                 raise ValueError(f'{signal.name} spans outside the frame!')
         self.data_class = ctypes.c_uint8 * size
+        self._codec: _RequestCodec | None = None
+
+    def __getstate__(self) -> dict:
+        # The ctypes array type and the compiled codec are derived, they're rebuilt when unpickled
+        state = self.__dict__.copy()
+        del state['data_class']
+        state['_codec'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.data_class = ctypes.c_uint8 * self.size
+
+    @property
+    def codec(self) -> _RequestCodec:
+        """Compiled operation table of the request, built on first use"""
+        if self._codec is None:
+            self._codec = _RequestCodec(self)
+        return self._codec
 
     def __len__(self):
-        return self.size + 1 + 2 + 1 + 1 # sync, id, size, crc
+        return Request.frame_length(self.size)
+
+    @staticmethod
+    def frame_length(size: int) -> int:
+        """
+        Returns the number of bytes a frame with the given data size occupies on the bus.
+
+        :param size: Data size in bytes
+        :type size: int
+        :return: Frame length in bytes
+        :rtype: int
+        """
+        return size + 1 + 2 + 1 + 1 # sync, id, size, crc
 
     @staticmethod
     def packer(signals, size):
@@ -184,47 +349,191 @@ class Request():
                 return x
         raise KeyError()
 
+    def _encode_raw_word(self, signals: Dict[str, int]) -> int:
+        codec = self.codec
+        data = codec.initial
+        for (name, value) in signals.items():
+            op = codec.by_name.get(name)
+            if op is None:
+                continue
+            data = (data & ~(op.mask << op.shift)) | ((value & op.mask) << op.shift)
+        return data
+
     def encode_raw(self, signals: Dict[str, int]) -> List[int]:
-        raise NotImplementedError()
+        """
+        Encodes raw signal values, e.g.: the output of :meth:`decode_raw`, without converting them
+        through the encoders. Missing signals use their initial value.
+
+        :param signals: Raw value of each signal
+        :type signals: Dict[str, int]
+        :return: Frame data
+        :rtype: List[int]
+        """
+        return list(self._encode_raw_word(signals).to_bytes(self.size, byteorder='little'))
+
+    def encode_raw_into(self, signals: Dict[str, int], buffer: Union[bytearray, memoryview],
+                        offset: int = 0) -> None:
+        """
+        Encodes raw signal values directly into a buffer, e.g.: a transmit buffer that's reused for
+        every frame.
+
+        :param signals: Raw value of each signal
+        :type signals: Dict[str, int]
+        :param buffer: Writable buffer
+        :type buffer: Union[bytearray, memoryview]
+        :param offset: Position of the frame data in the buffer, defaults to 0
+        :type offset: int, optional
+        :raises ValueError: If the frame doesn't fit into the buffer
+        """
+        if offset < 0 or len(buffer) - offset < self.size:
+            raise ValueError(f'{self.name}: Buffer too small for {self.size} bytes at offset {offset}')
+        buffer[offset:offset + self.size] = self._encode_raw_word(signals).to_bytes(self.size, byteorder='little')
 
     def encode(self, signals: Dict[str, Union[str, int, float]]) -> List[int]:
-        data = 0
-        for signal in self.signals:
-            if signal.name in signals:
-                if signal.encoder != None:
-                    value = signal.encoder.encode(signals[signal.name])
-                else:
-                    value = signals[signal.name]
-            else:
-                if signal.encoder != None:
-                    value = signal.encoder.encode(signal.initial)
-                else:
-                    value = signal.initial
-            data |= (value & ((1 << signal.width) - 1)) << signal.offset
+        codec = self.codec
+        data = codec.initial
+        for (name, value) in signals.items():
+            op = codec.by_name.get(name)
+            if op is None:
+                continue
+            if op.encode is not None:
+                value = op.encode(value)
+            data = (data & ~(op.mask << op.shift)) | ((value & op.mask) << op.shift)
         return list(data.to_bytes(self.size, byteorder='little'))
 
     def decode_raw(self, data) -> Dict[str, int]:
-        payload = bytes(data)
-        if len(payload) != self.size:
-            raise ValueError(f'{self.name}: Expected {self.size} bytes, got {len(payload)}')
-        raw_data = int.from_bytes(payload, byteorder='little')
-        return {
-            signal.name: (raw_data >> signal.offset) & ((1 << signal.width) - 1)
-            for signal in self.signals
-        }
-
-    def decode(self, data: Iterable[int]) -> SignalValueContainer:
-        decoded = self.decode_raw(data)
+        if len(data) != self.size:
+            raise ValueError(f'{self.name}: Expected {self.size} bytes, got {len(data)}')
+        raw_data = int.from_bytes(data, byteorder='little')
+        return {op.name: (raw_data >> op.shift) & op.mask for op in self.codec.ops}
+
+    def decode(self, data: Sequence[int]) -> SignalValueContainer:
+        if len(data) != self.size:
+            raise ValueError(f'{self.name}: Expected {self.size} bytes, got {len(data)}')
+        raw_data = int.from_bytes(data, byteorder='little')
         signals = []
-        for signal in self.signals:
-            if signal.name in decoded:
-                raw_value = decoded[signal.name]
-                phy_value = signal.encoder.decode(raw_value) if signal.encoder else raw_value
-                signals.append(SignalValue(signal, phy_value, raw_value))
-            else:
-                raise KeyError(f'Signal {signal.name} not found in decoded data')
+        for op in self.codec.ops:
+            raw_value = (raw_data >> op.shift) & op.mask
+            signals.append(SignalValue(op.signal,
+                                       op.decode(raw_value) if op.decode is not None else raw_value,
+                                       raw_value))
         return SignalValueContainer(signals)
 
+    def decode_into(self, data: Sequence[int], container: SignalValueContainer) -> SignalValueContainer:
+        """
+        Decodes the response into an existing container, updating its values in place instead of
+        allocating new ones.
+
+        :param data: Response data
+        :type data: Sequence[int]
+        :param container: Container of the request's signals, e.g.: created by :meth:`decode`
+        :type container: SignalValueContainer
+        :raises ValueError: If the data length doesn't match the request size
+        :return: The updated container
+        :rtype: SignalValueContainer
+        """
+        if len(data) != self.size:
+            raise ValueError(f'{self.name}: Expected {self.size} bytes, got {len(data)}')
+        raw_data = int.from_bytes(data, byteorder='little')
+        by_name = self.codec.by_name
+        for value in container:
+            op = by_name[value.signal.name]
+            raw_value = (raw_data >> op.shift) & op.mask
+            value.raw = raw_value
+            value.phy = op.decode(raw_value) if op.decode is not None else raw_value
+        return container
+
+    def encode_many(self, signals: Dict[str, Union['numpy.ndarray', str, int, float]],
+                    count: int | None = None) -> 'numpy.ndarray':
+        """
+        Encodes many frames at once, e.g.: to generate waveforms for a simulation. Signals are given
+        as arrays of physical values or as a single value used in every frame, missing signals use
+        their initial value.
+
+        Example:
+        >>> frames = request.encode_many({'FrontSpeed': numpy.linspace(0, 50, 1000)})
+
+        :param signals: Values of each signal
+        :type signals: Dict[str, Union[numpy.ndarray, str, int, float]]
+        :param count: Number of frames, defaults to None in which case it's the length of the arrays
+        :type count: int | None, optional
+        :raises ValueError: If the arrays have different lengths
+        :return: An (N, size) uint8 array of frames
+        :rtype: numpy.ndarray
+        """
+        numpy = _import_numpy()
+        if count is None:
+            lengths = {len(values) for values in signals.values() if numpy.ndim(values) > 0}
+            if len(lengths) > 1:
+                raise ValueError(f'{self.name}: Signal arrays have different lengths')
+            count = lengths.pop() if lengths else 1
+
+        frames = numpy.zeros((count, self.size), dtype=numpy.uint8)
+        for op in self.codec.ops:
+            value = signals.get(op.name, op.signal.initial)
+            if op.encode is not None:
+                raw = op.signal.encoder.encode_array(numpy.broadcast_to(value, (count,)))
+            else:
+                raw = numpy.broadcast_to(value, (count,))
+            raw = (numpy.asarray(raw).astype(numpy.uint64) & numpy.uint64(op.mask)) \
+                << numpy.uint64(op.shift % 8)
+            # The word is spread over the bytes the signal spans
+            for index in range(op.shift // 8, (op.shift + op.width - 1) // 8 + 1):
+                byte = (raw >> numpy.uint64((index - op.shift // 8) * 8)) & numpy.uint64(0xFF)
+                frames[:, index] |= byte.astype(numpy.uint8)
+        return frames
+
+    def decode_many(self, data: Union[bytes, bytearray, memoryview, 'numpy.ndarray'],
+                    phy: bool = False) -> Dict[str, 'numpy.ndarray']:
+        """
+        Decodes many responses of this request at once, e.g.: frames captured from the bus. The
+        signals are extracted from all frames with vectorized bit operations, which requires NumPy.
+
+        Example:
+        >>> columns = request.decode_many(capture, phy=True)
+        >>> columns['FrontSpeed'].mean()
+
+        :param data: An (N, size) uint8 array or a contiguous buffer of N frames
+        :type data: Union[bytes, bytearray, memoryview, numpy.ndarray]
+        :param phy: Convert the raw values to physical values using the encoders, defaults to False
+        :type phy: bool, optional
+        :raises ValueError: If the data doesn't consist of whole frames
+        :return: Array of values for each signal
+        :rtype: Dict[str, numpy.ndarray]
+        """
+        numpy = _import_numpy()
+        if isinstance(data, numpy.ndarray):
+            frames = numpy.ascontiguousarray(data, dtype=numpy.uint8)
+        else:
+            frames = numpy.frombuffer(data, dtype=numpy.uint8)
+        if frames.ndim == 1 and frames.size % self.size == 0:
+            frames = frames.reshape(-1, self.size)
+        if frames.ndim != 2 or frames.shape[1] != self.size:
+            raise ValueError(f'{self.name}: Expected frames of {self.size} bytes, got {frames.shape}')
+
+        columns = {}
+        for op in self.codec.ops:
+            # Only the bytes the signal spans are combined into a word, then shifted and masked
+            first = op.shift // 8
+            last = (op.shift + op.width - 1) // 8
+            if last - first < 8:
+                word = numpy.zeros(len(frames), dtype=numpy.uint64)
+                for index in range(first, last + 1):
+                    word |= frames[:, index].astype(numpy.uint64) << numpy.uint64((index - first) * 8)
+                raw = ((word >> numpy.uint64(op.shift % 8)) & numpy.uint64(op.mask)) \
+                    .astype(numpy.min_scalar_type(op.mask))
+            else:
+                # Unaligned signals wider than 56 bits span 9 bytes, the word is built from Python ints
+                word = numpy.zeros(len(frames), dtype=object)
+                for index in range(first, last + 1):
+                    word |= frames[:, index].astype(object) << ((index - first) * 8)
+                raw = ((word >> (op.shift % 8)) & op.mask).astype(numpy.min_scalar_type(op.mask))
+            if phy and op.signal.encoder is not None:
+                columns[op.name] = op.signal.encoder.decode_array(raw)
+            else:
+                columns[op.name] = raw
+        return columns
+
 @dataclass
 class SignalRef:
     request: Request
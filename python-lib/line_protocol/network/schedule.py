@@ -1,16 +1,32 @@
 import time
-from typing import List, TYPE_CHECKING, Literal, Union
+import heapq
+from threading import Lock
+import math
+from typing import List, Dict, Tuple, TYPE_CHECKING, Literal, Union, Callable
+from dataclasses import dataclass
 
 from line_protocol.network.request import Request
 from line_protocol.network.nodes import Node
 
 if TYPE_CHECKING:
     from ..protocol import LineMaster
+    from ..protocol.transmit_queue import TransmitPriority
+
+def _schedule_priority() -> 'TransmitPriority':
+    # The protocol package depends on this one, so it's only imported once a schedule runs
+    from line_protocol.protocol.transmit_queue import TransmitPriority
+    return TransmitPriority.SCHEDULE
 
 class ScheduleEntry():
 
     def perform(self, master: 'LineMaster'):
         raise NotImplementedError()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of bytes the entry occupies on the bus, including the response.
+        """
+        raise NotImplementedError()
     
 class RequestScheduleEntry(ScheduleEntry):
 
@@ -18,22 +34,35 @@ class RequestScheduleEntry(ScheduleEntry):
         self.request = request
 
     def perform(self, master: 'LineMaster'):
-        master.request(self.request.name)
+        # The request is resolved when the schedule is loaded, not for every slot
+        master.request(self.request.id, priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return len(self.request)
     
 class WakeupScheduleEntry(ScheduleEntry):
 
     def perform(self, master: 'LineMaster'):
-        master.wakeup()
+        master.wakeup(priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(0)
 
 class IdleScheduleEntry(ScheduleEntry):
 
     def perform(self, master: 'LineMaster'):
-        master.idle()
+        master.idle(priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(0)
 
 class ShutdownScheduleEntry(ScheduleEntry):
 
     def perform(self, master: 'LineMaster'):
-        master.shutdown()
+        master.shutdown(priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(0)
 
 class GetOperationStatusScheduleEntry(ScheduleEntry):
 
@@ -41,7 +70,10 @@ class GetOperationStatusScheduleEntry(ScheduleEntry):
         self.node = node
 
     def perform(self, master: 'LineMaster'):
-        master.get_operation_status(self.node.address, wait=False)
+        master.get_operation_status(self.node.address, wait=False, priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(1)
 
 class GetPowerStatusScheduleEntry(ScheduleEntry):
 
@@ -49,7 +81,10 @@ class GetPowerStatusScheduleEntry(ScheduleEntry):
         self.node = node
 
     def perform(self, master: 'LineMaster'):
-        master.get_power_status(self.node.address, wait=False)
+        master.get_power_status(self.node.address, wait=False, priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(4)
 
 class GetSerialNumberScheduleEntry(ScheduleEntry):
 
@@ -57,7 +92,10 @@ class GetSerialNumberScheduleEntry(ScheduleEntry):
         self.node = node
 
     def perform(self, master: 'LineMaster'):
-        master.get_serial_number(self.node.address, wait=False)
+        master.get_serial_number(self.node.address, wait=False, priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(4)
 
 class GetSoftwareVersionScheduleEntry(ScheduleEntry):
 
@@ -65,9 +103,145 @@ class GetSoftwareVersionScheduleEntry(ScheduleEntry):
         self.node = node
 
     def perform(self, master: 'LineMaster'):
-        master.get_software_version(self.node.address, wait=False)
+        master.get_software_version(self.node.address, wait=False, priority=_schedule_priority())
+
+    def __len__(self) -> int:
+        return Request.frame_length(4)
+
+OverrunPolicy = Literal['catch-up', 'skip']
+
+@dataclass
+class ScheduleStatistics():
+    """
+    Timing of a running schedule. The lateness is the difference between the actual and the
+    planned start of a slot. An overrun is a slot that was already due when the previous one
+    finished, with the 'skip' policy the slots that were missed entirely are skipped.
+    """
+    slots: int
+    overruns: int
+    skipped: int
+    last_lateness: float
+    max_lateness: float
+    average_lateness: float
 
 class ScheduleExecutor:
+    """
+    Base class of the schedule executors. The slots are planned on an absolute timeline, the k-th
+    slot starts at start + k * slot time, so the time spent performing an entry or waking up late
+    doesn't accumulate over the cycles. The timeline starts when the executor is created.
+
+    With variable slots the slot time is the schedule's delay. With fixed slots it's the wire time
+    of the longest entry at the given baudrate plus the delay, the bus then runs at the highest
+    frame rate the schedule can sustain.
+
+    Entries can be disabled and enabled while the schedule runs. A disabled entry keeps its place
+    in the order, with reserve_slots its slot stays empty, otherwise the slot is skipped.
+
+    :param schedule: Schedule to execute
+    :type schedule: Schedule
+    :param baudrate: Bus baudrate, required for fixed slots, defaults to 0
+    :type baudrate: int, optional
+    :raises ValueError: If the schedule uses fixed slots and no baudrate is given
+    """
+
+    def __init__(self, schedule: 'Schedule', baudrate: int = 0) -> None:
+        self.schedule = schedule
+        if schedule.slots == 'fixed':
+            if baudrate <= 0:
+                raise ValueError(f'{schedule.name}: Fixed slots require the bus baudrate.')
+            from line_protocol.protocol.util import frame_time
+            longest = max((len(entry) for entry in schedule.entries), default=0)
+            self.slot_time = frame_time(longest, baudrate) + schedule.delay
+        else:
+            self.slot_time = schedule.delay
+
+        # Entries can be referred to by index or by the entry itself
+        self._indices: Dict[ScheduleEntry, int] = {}
+        for (index, entry) in enumerate(schedule.entries):
+            self._indices.setdefault(entry, index)
+            if isinstance(entry, PriorityScheduleEntry):
+                self._indices.setdefault(entry.entry, index)
+        self._enabled = [True] * len(schedule.entries)
+        self._enabled_lock = Lock()
+
+        self._deadline = time.monotonic()
+        self._slots = 0
+        self._overruns = 0
+        self._skipped = 0
+        self._last_lateness = 0.0
+        self._max_lateness = 0.0
+        self._total_lateness = 0.0
+
+    def wait(self, sleep: Callable[[float], None] | None = None) -> None:
+        """
+        Wait for the start of the next slot. Every slot takes the slot time, also when no entry was
+        due. The slots of disabled entries are already passed over by next() unless the schedule
+        reserves them.
+
+        :param sleep: Function used to sleep, it may return early e.g.: when the schedule is
+                      stopped, the slot then isn't counted, defaults to None meaning time.sleep
+        :type sleep: Callable[[float], None] | None, optional
+        """
+        slot_time = self.slot_time
+        now = time.monotonic()
+        self._deadline += slot_time
+
+        if now >= self._deadline:
+            self._overruns += 1
+            if self.schedule.overrun == 'skip' and slot_time > 0:
+                # Drop the slots that are over completely, the late one is started right away
+                missed = int((now - self._deadline) // slot_time)
+                self._deadline += missed * slot_time
+                self._skipped += missed
+        else:
+            (sleep or time.sleep)(self._deadline - now)
+            if time.monotonic() < self._deadline:
+                return
+
+        lateness = max(time.monotonic() - self._deadline, 0.0)
+        self._slots += 1
+        self._last_lateness = lateness
+        self._max_lateness = max(self._max_lateness, lateness)
+        self._total_lateness += lateness
+
+    def continue_timeline(self, previous: 'ScheduleExecutor') -> None:
+        """
+        Continues the slot timeline of another executor, used when switching schedules so the
+        first slot of this executor starts when the next slot of the previous one would have.
+
+        :param previous: Executor that ran before
+        :type previous: ScheduleExecutor
+        """
+        self._deadline = previous._deadline
+
+    def restart_timeline(self) -> None:
+        """
+        Starts a new slot timeline at the current time, e.g.: when the schedule is resumed after
+        a pause. The position in the schedule is kept.
+        """
+        self._deadline = time.monotonic()
+
+    def at_cycle_end(self) -> bool:
+        """
+        Returns whether the executor is at the boundary between two cycles of the schedule,
+        switching to another schedule there doesn't cut a cycle short. Executors without a
+        repeating cycle are always at a boundary.
+
+        :return: True if the next slot starts a new cycle
+        :rtype: bool
+        """
+        return True
+
+    def get_statistics(self) -> ScheduleStatistics:
+        """
+        Returns the actual slot timing compared to the planned timeline.
+
+        :return: Schedule statistics
+        :rtype: ScheduleStatistics
+        """
+        average = self._total_lateness / self._slots if self._slots else 0.0
+        return ScheduleStatistics(self._slots, self._overruns, self._skipped,
+                                  self._last_lateness, self._max_lateness, average)
 
     def next(self) -> ScheduleEntry:
         """
@@ -76,27 +250,68 @@ class ScheduleExecutor:
         """
         raise NotImplementedError()
 
-    def wait(self) -> None:
-        """
-        Wait for the next entry to be executed.
-        """
-        raise NotImplementedError()
+    def _index(self, entry: Union[int, ScheduleEntry]) -> int:
+        if isinstance(entry, int):
+            if entry < 0 or entry >= len(self._enabled):
+                raise LookupError(f'{self.schedule.name}: No such entry: {entry}')
+            return entry
+        if entry not in self._indices:
+            raise LookupError(f'{self.schedule.name}: Entry is not part of the schedule')
+        return self._indices[entry]
+
+    def _set_enabled(self, entry: Union[int, ScheduleEntry], enabled: bool):
+        index = self._index(entry)
+        with self._enabled_lock:
+            self._enabled[index] = enabled
 
     def disable_entry(self, entry: Union[int, ScheduleEntry]) -> None:
-        raise NotImplementedError()
+        """
+        Disables an entry, it isn't performed until it's enabled again. Can be called while the
+        schedule is running.
+
+        :param entry: Index of the entry in the schedule or the entry itself
+        :type entry: Union[int, ScheduleEntry]
+        :raises LookupError: If the entry isn't part of the schedule
+        """
+        self._set_enabled(entry, False)
 
     def enable_entry(self, entry: Union[int, ScheduleEntry]) -> None:
-        raise NotImplementedError()
+        """
+        Enables a disabled entry. Can be called while the schedule is running.
+
+        :param entry: Index of the entry in the schedule or the entry itself
+        :type entry: Union[int, ScheduleEntry]
+        :raises LookupError: If the entry isn't part of the schedule
+        """
+        self._set_enabled(entry, True)
+
+    def is_entry_enabled(self, entry: Union[int, ScheduleEntry]) -> bool:
+        """
+        Returns whether the entry is enabled.
+
+        :param entry: Index of the entry in the schedule or the entry itself
+        :type entry: Union[int, ScheduleEntry]
+        :raises LookupError: If the entry isn't part of the schedule
+        :return: True if the entry is enabled
+        :rtype: bool
+        """
+        return self._enabled[self._index(entry)]
 
 class Schedule:
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, overrun: OverrunPolicy = 'skip') -> None:
+        if overrun not in ('catch-up', 'skip'):
+            raise ValueError(f'{name}: Unknown overrun policy: {overrun}')
         self.name = name
+        self.overrun = overrun
     
-    def create_executor(self) -> ScheduleExecutor:
+    def create_executor(self, baudrate: int = 0) -> ScheduleExecutor:
         """
         Create a schedule executor for this schedule. This is used to execute the schedule and
         manage the cycle counters.
+
+        :param baudrate: Bus baudrate, required for fixed slots, defaults to 0
+        :type baudrate: int, optional
         """
         raise NotImplementedError()
 
@@ -111,22 +326,30 @@ class FixedOrderSchedule(Schedule):
     delay.
 
     If reserve_slots is True, the schedule will insert a delay even for entries which are disabled.
+    Fixed slots need the bus baudrate to calculate the wire time, it's passed to create_executor.
+
+    When a slot starts after the following one was already due the overrun policy applies:
+    'catch-up' performs the missed slots back to back, 'skip' drops them and continues with the
+    next slot on the planned timeline.
     """
 
     def __init__(self, name: str, entries: List[ScheduleEntry], slots: Literal['variable', 'fixed'],
-                 reserve_slots: bool, delay: float) -> None:
-        super().__init__(name)
+                 reserve_slots: bool, delay: float, overrun: OverrunPolicy = 'skip') -> None:
+        super().__init__(name, overrun)
         self.entries = entries
         self.slots = slots
         self.reserve_slots = reserve_slots
         self.delay = delay
 
-    def create_executor(self) -> 'FixedOrderScheduleExecutor':
+    def create_executor(self, baudrate: int = 0) -> 'FixedOrderScheduleExecutor':
         """
         Create a schedule executor for this schedule. This is used to execute the schedule and
         manage the cycle counters.
+
+        :param baudrate: Bus baudrate, required for fixed slots, defaults to 0
+        :type baudrate: int, optional
         """
-        return FixedOrderScheduleExecutor(self)
+        return FixedOrderScheduleExecutor(self, baudrate)
 
 class FixedOrderScheduleExecutor(ScheduleExecutor):
     """
@@ -134,24 +357,24 @@ class FixedOrderScheduleExecutor(ScheduleExecutor):
     executing the schedule and managing the cycle counters.
     """
 
-    def __init__(self, schedule: FixedOrderSchedule) -> None:
-        self.schedule = schedule
+    def __init__(self, schedule: FixedOrderSchedule, baudrate: int = 0) -> None:
+        super().__init__(schedule, baudrate)
         self.entry_index = 0
 
     def next(self) -> ScheduleEntry:
-        entry = self.schedule.entries[self.entry_index]
-        self.entry_index += 1
-        if self.entry_index >= len(self.schedule.entries):
-            self.entry_index = 0
-        return entry
-
-    def wait(self) -> None:
-        if self.schedule.slots == 'variable':
-            time.sleep(self.schedule.delay)
-        else:
-            # TODO: Implement fixed slot scheduling
-            # sleep based on last request length
-            pass
+        for _ in range(len(self.schedule.entries)):
+            index = self.entry_index
+            self.entry_index += 1
+            if self.entry_index >= len(self.schedule.entries):
+                self.entry_index = 0
+            if self._enabled[index]:
+                return self.schedule.entries[index]
+            if self.schedule.reserve_slots:
+                break
+        return None
+
+    def at_cycle_end(self) -> bool:
+        return self.entry_index == 0
 
 class PriorityScheduleEntry(ScheduleEntry):
     def __init__(self, entry: ScheduleEntry, cycle: int, max_age: int) -> None:
@@ -162,6 +385,9 @@ class PriorityScheduleEntry(ScheduleEntry):
     def perform(self, master: 'LineMaster'):
         self.entry.perform(master)
 
+    def __len__(self) -> int:
+        return len(self.entry)
+
 class PriorityAgingSchedule(Schedule):
     """
     A schedule that executes a set of entries in order of priority.
@@ -180,59 +406,165 @@ class PriorityAgingSchedule(Schedule):
     """
 
     def __init__(self, name: str, entries: List[PriorityScheduleEntry], slots: Literal['variable', 'fixed'],
-                 phase: Literal['zero', 'adjusted'], reserve_slots: bool, delay: float) -> None:
-        super().__init__(name)
+                 phase: Literal['zero', 'adjusted'], reserve_slots: bool, delay: float,
+                 overrun: OverrunPolicy = 'skip') -> None:
+        super().__init__(name, overrun)
         self.entries = entries
         self.slots = slots
         self.phase = phase
         self.reserve_slots = reserve_slots
         self.delay = delay
 
-    def create_executor(self) -> 'PriorityAgingScheduleExecutor':
+    def create_executor(self, baudrate: int = 0) -> 'PriorityAgingScheduleExecutor':
         """
         Create a schedule executor for this schedule. This is used to execute the schedule and
         manage the cycle counters.
+
+        :param baudrate: Bus baudrate, required for fixed slots, defaults to 0
+        :type baudrate: int, optional
         """
-        return PriorityAgingScheduleExecutor(self)
+        return PriorityAgingScheduleExecutor(self, baudrate)
+
+def _age_step(entries: List[PriorityScheduleEntry], counters: List[float]) -> int | None:
+    # Increment all cycle counters
+    for i in range(len(entries)):
+        counters[i] += 1
+
+    # Check if any entry has a cycle counter higher than the maximum age
+    for i in range(len(entries)):
+        if counters[i] >= entries[i].max_age:
+            # Reset the cycle counter and return the entry
+            counters[i] = 0
+            return i
+
+    # Check if any entry has a cycle counter higher than the cycle value
+    for i in range(len(entries)):
+        if counters[i] >= entries[i].cycle:
+            # Reset the cycle counter and return the entry
+            counters[i] = 0
+            return i
+
+    return None
 
 class PriorityAgingScheduleExecutor(ScheduleExecutor):
     """
     A schedule executor that executes a PriorityAgingSchedule. The executor is responsible for
     executing the schedule and managing the cycle counters.
-    """
 
-    def __init__(self, schedule: PriorityAgingSchedule) -> None:
-        self.schedule = schedule
-        if schedule.phase == 'zero':
-            self.cycle_counters = [0] * len(schedule.entries)
-        elif schedule.phase == 'adjusted':
-            self.cycle_counters = [entry.cycle / 2 for entry in schedule.entries]
-    
-    def next(self) -> ScheduleEntry:
-        # Increment all cycle counters
-        for i in range(len(self.schedule.entries)):
-            self.cycle_counters[i] += 1
-
-        # Check if any entry has a cycle counter higher than the maximum age
-        for i in range(len(self.schedule.entries)):
-            if self.cycle_counters[i] >= self.schedule.entries[i].max_age:
-                # Reset the cycle counter and return the entry
-                self.cycle_counters[i] = 0
-                return self.schedule.entries[i].entry
-
-        # Check if any entry has a cycle counter higher than the cycle value
-        for i in range(len(self.schedule.entries)):
-            if self.cycle_counters[i] >= self.schedule.entries[i].cycle:
-                # Reset the cycle counter and return the entry
-                self.cycle_counters[i] = 0
-                return self.schedule.entries[i].entry
+    The selected entry only depends on the cycle counters, once they return to an earlier state the
+    order repeats. The executor runs the counters ahead of time and stores the order as a slot
+    table, next() then just steps through the table. When the common period of the cycles and
+    maximum ages exceeds max_table_slots, or the order doesn't repeat soon enough, the due times of
+    the entries are kept in heaps instead.
+    """
 
+    max_table_slots = 4096
+
+    def __init__(self, schedule: PriorityAgingSchedule, baudrate: int = 0) -> None:
+        super().__init__(schedule, baudrate)
+        (self._table, self._loop) = self._compile()
+        self._position = 0
+        if self._table is None:
+            self._slot = 0
+            self._versions = [0] * len(schedule.entries)
+            # (due slot, kind, index, version), kind 0 is the maximum age and 1 the cycle
+            self._pending: List[Tuple[int, int, int, int]] = []
+            # Indices of the due entries for each kind
+            self._due: Tuple[List[Tuple[int, int]], ...] = ([], [])
+            for (index, counter) in enumerate(self._initial_counters()):
+                self._push(index, counter)
+
+    def _initial_counters(self) -> List[float]:
+        if self.schedule.phase == 'zero':
+            return [0] * len(self.schedule.entries)
+        elif self.schedule.phase == 'adjusted':
+            return [entry.cycle / 2 for entry in self.schedule.entries]
+        raise ValueError(f'{self.schedule.name}: Unknown phase: {self.schedule.phase}')
+
+    def _slot_limit(self) -> int:
+        # The order repeats with the common period of the entries after a settling phase, when
+        # that period is too long for a table the heaps are used right away
+        limits = [int(limit) for entry in self.schedule.entries
+                  for limit in (entry.cycle, entry.max_age) if limit >= 1]
+        period = math.lcm(*limits) if limits else 1
+        if period > self.max_table_slots:
+            return 0
+        return min(self.max_table_slots, 4 * period + 2 * max(limits, default=0))
+
+    def _state_at(self, slot: int) -> List[float]:
+        counters = self._initial_counters()
+        for _ in range(slot):
+            _age_step(self.schedule.entries, counters)
+        return counters
+
+    def _compile(self) -> Tuple[List[int | None] | None, int]:
+        limit = self._slot_limit()
+        counters = self._initial_counters()
+        # Only the hashes of the counter states are kept, a match is confirmed by replaying
+        seen: Dict[int, List[int]] = {}
+        table: List[int | None] = []
+        while len(table) <= limit:
+            key = hash(tuple(counters))
+            for slot in seen.get(key, ()):
+                if self._state_at(slot) == counters:
+                    return (table, slot)
+            seen.setdefault(key, []).append(len(table))
+            table.append(_age_step(self.schedule.entries, counters))
+        return (None, 0)
+
+    def _push(self, index: int, counter: float):
+        # The counter is incremented every slot, it reaches a limit after ceil(limit - counter) slots
+        entry = self.schedule.entries[index]
+        version = self._versions[index]
+        heapq.heappush(self._pending, (self._slot + math.ceil(entry.max_age - counter), 0, index, version))
+        heapq.heappush(self._pending, (self._slot + math.ceil(entry.cycle - counter), 1, index, version))
+
+    def _next_due(self) -> int | None:
+        self._slot += 1
+        while self._pending and self._pending[0][0] <= self._slot:
+            (_, kind, index, version) = heapq.heappop(self._pending)
+            if version == self._versions[index]:
+                heapq.heappush(self._due[kind], (index, version))
+
+        for due in self._due:
+            while due:
+                (index, version) = heapq.heappop(due)
+                if version == self._versions[index]:
+                    # Reset the cycle counter, the entry's other due times are outdated
+                    self._versions[index] += 1
+                    self._push(index, 0)
+                    return index
         return None
 
-    def wait(self) -> None:
-        if self.schedule.slots == 'variable':
-            time.sleep(self.schedule.delay)
-        else:
-            # TODO: Implement fixed slot scheduling
-            # sleep based on last request length
-            pass
+    def _next_index(self) -> int | None:
+        if self._table is None:
+            return self._next_due()
+        index = self._table[self._position]
+        self._position += 1
+        if self._position == len(self._table):
+            self._position = self._loop
+        return index
+
+    def next(self) -> ScheduleEntry:
+        index = self._next_index()
+        if index is not None and not self._enabled[index] and not self.schedule.reserve_slots:
+            # Skip the slots of disabled entries, at most once around the table. Without a table,
+            # every entry is due within its maximum age, after that only disabled ones come up.
+            if self._table is not None:
+                bound = len(self._table)
+            else:
+                bound = len(self.schedule.entries) * max(math.ceil(entry.max_age)
+                                                         for entry in self.schedule.entries)
+            for _ in range(bound):
+                index = self._next_index()
+                if index is None or self._enabled[index]:
+                    break
+        if index is not None and not self._enabled[index]:
+            index = None
+
+        return None if index is None else self.schedule.entries[index].entry
+
+    def at_cycle_end(self) -> bool:
+        if self._table is None:
+            return True
+        return self._position == 0 or self._position == self._loop
@@ -1,7 +1,11 @@
-from line_protocol.protocol.master import LineMaster
-from line_protocol.protocol.transport import (LineSerialTransport, LineTransportListener,
-                                              LineTransportError, LineTransportDataError,
+from line_protocol.protocol.master import LineMaster, SignalSubscription
+from line_protocol.protocol.async_master import AsyncLineMaster
+from line_protocol.protocol.transport import (LineTransport, LineSerialTransport, LineTransportListener,
+                                              LineResponseParser, LineTransportError, LineTransportDataError,
                                               LineTransportRequestError, LineTransportTimeout)
+from line_protocol.protocol.transmit_queue import TransmitPriority, LineRequestExpired, LineQueueOverflow
+from line_protocol.protocol.dispatch import ListenerDispatcher
 from line_protocol.protocol.constants import *
 from line_protocol.protocol.virtual_bus import VirtualBus
 from line_protocol.protocol.simulation import SimulatedPeripheral
+from line_protocol.protocol.loopback import LineLoopbackTransport
@@ -0,0 +1,470 @@
+# System imports
+import asyncio
+from typing import Union, Dict, List, Literal, Callable, Any
+
+# Local imports
+from line_protocol.protocol.constants import *
+from line_protocol.protocol.transport import LineTransport, LineTransportTimeout
+from line_protocol.protocol.master import (LineMaster, RxRequest, TxRequest, TransmitEvent,
+                                           RequestListener, NodeStatusListener, NodeStatus,
+                                           PowerStatus, SignalCallback, SignalSubscription,
+                                           RequestResult, NodeStatusProperty, _NODE_STATUS_REQUESTS)
+from line_protocol.protocol.transmit_queue import TransmitPriority, QueueStatistics, OverflowPolicy
+from line_protocol.protocol.dispatch import ListenerDispatcher, DispatchStatistics
+from line_protocol.protocol.util import OperationStatus
+from line_protocol.protocol.virtual_bus import VirtualBus
+from line_protocol.network import Network, Schedule, SignalValue, ScheduleStatistics
+from line_protocol.network.schedule import ScheduleEntry
+from line_protocol.network.diff import NetworkDiff
+
+class AsyncLineMaster():
+    """
+    asyncio interface of the :class:`LineMaster`, every bus operation is a coroutine.
+
+    The frames are processed by the master's bus thread, the awaiting coroutines are resumed
+    through the event loop once their frame is complete. Awaiting a request doesn't occupy a
+    thread, so any number of coroutines can wait for the bus concurrently.
+
+    Example:
+    >>> async with AsyncLineMaster(transport, network) as master:
+    ...     response = await master.request('WheelSpeed', timeout=1)
+
+    :param transport: Transport used to access the bus, defaults to None
+    :type transport: LineTransport | None, optional
+    :param network: Network definition, defaults to None
+    :type network: Network | None, optional
+    :param queue_size: Maximum number of queued frames, zero means unbounded, defaults to 0
+    :type queue_size: int, optional
+    :param overflow: Policy when the queue is full, defaults to 'block' which is only allowed for
+                     an unbounded queue, waiting for space would block the event loop
+    :type overflow: OverflowPolicy, optional
+    :param coalesce: Attach requests to pending requests of the same identifier, defaults to False
+    :type coalesce: bool, optional
+    :param dispatcher: Calls the listeners outside of the master thread, defaults to None
+    :type dispatcher: ListenerDispatcher | None, optional
+    :param decode_in_place: Update the buffered signal values instead of allocating new ones for
+                            every response, defaults to False
+    :type decode_in_place: bool, optional
+    :raises ValueError: If the queue is bounded and the overflow policy is 'block'
+    """
+
+    def __init__(self, transport: 'LineTransport | None' = None, network: 'Network | None' = None,
+                 queue_size: int = 0, overflow: OverflowPolicy = 'block', coalesce: bool = False,
+                 dispatcher: ListenerDispatcher | None = None, decode_in_place: bool = False) -> None:
+        if queue_size > 0 and overflow == 'block':
+            raise ValueError("A bounded queue requires the 'drop-oldest' or 'reject' overflow policy.")
+        self.master = LineMaster(transport, network, queue_size, overflow, coalesce, dispatcher,
+                                 decode_in_place)
+
+    @property
+    def network(self) -> 'Network | None':
+        return self.master.network
+
+    @property
+    def virtual_bus(self) -> VirtualBus:
+        return self.master.virtual_bus
+
+    async def __aenter__(self) -> 'AsyncLineMaster':
+        self.master.__enter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # Joining the master thread blocks, so it's done outside of the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.master.__exit__, exc_type, exc_value, traceback)
+
+    def add_request_listener(self, listener: RequestListener,
+                             requests: List[Union[int, str]] | None = None):
+        """
+        Adds a listener for request events, see :meth:`LineMaster.add_request_listener`
+        """
+        self.master.add_request_listener(listener, requests)
+
+    def subscribe_signal(self, request: Union[int, str], signal: str, callback: SignalCallback,
+                         deadband: float | None = None, on_change_only: bool = True) -> SignalSubscription:
+        """
+        Subscribes to changes of a single signal, see :meth:`LineMaster.subscribe_signal`
+        """
+        return self.master.subscribe_signal(request, signal, callback, deadband, on_change_only)
+
+    def unsubscribe_signal(self, subscription: SignalSubscription):
+        """
+        Removes a signal subscription, see :meth:`LineMaster.unsubscribe_signal`
+        """
+        self.master.unsubscribe_signal(subscription)
+
+    def add_node_status_listener(self, listener: NodeStatusListener):
+        """
+        Adds a listener for node status changes, see :meth:`LineMaster.add_node_status_listener`
+        """
+        self.master.add_node_status_listener(listener)
+
+    def enable_schedule(self, schedule: Union[str, Schedule],
+                        switch: Literal['immediate', 'cycle-end'] = 'immediate'):
+        """
+        Starts the schedule or switches to it, see :meth:`LineMaster.enable_schedule`
+        """
+        self.master.enable_schedule(schedule, switch)
+
+    async def disable_schedule(self):
+        """
+        Stops the schedule, see :meth:`LineMaster.disable_schedule`
+        """
+        # Waits for the entry in progress, so it's done outside of the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.master.disable_schedule)
+
+    async def pause_schedule(self):
+        """
+        Pauses the schedule, see :meth:`LineMaster.pause_schedule`
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.master.pause_schedule)
+
+    def resume_schedule(self):
+        """
+        Resumes the schedule, see :meth:`LineMaster.resume_schedule`
+        """
+        self.master.resume_schedule()
+
+    def enable_schedule_entry(self, entry: Union[int, ScheduleEntry]):
+        """
+        Enables an entry of the active schedule, see :meth:`LineMaster.enable_schedule_entry`
+        """
+        self.master.enable_schedule_entry(entry)
+
+    def disable_schedule_entry(self, entry: Union[int, ScheduleEntry]):
+        """
+        Disables an entry of the active schedule, see :meth:`LineMaster.disable_schedule_entry`
+        """
+        self.master.disable_schedule_entry(entry)
+
+    def get_node_status(self, node: Union[int, str]) -> NodeStatus:
+        """
+        Returns the buffered status of a node, see :meth:`LineMaster.get_node_status`
+        """
+        return self.master.get_node_status(node)
+
+    def get_queue_statistics(self) -> QueueStatistics:
+        """
+        Returns the statistics of the transmit queue, see :meth:`LineMaster.get_queue_statistics`
+        """
+        return self.master.get_queue_statistics()
+
+    def get_dispatch_statistics(self) -> DispatchStatistics | None:
+        """
+        Returns the statistics of the listener dispatcher, see :meth:`LineMaster.get_dispatch_statistics`
+        """
+        return self.master.get_dispatch_statistics()
+
+    def get_schedule_statistics(self) -> ScheduleStatistics | None:
+        """
+        Returns the statistics of the active schedule, see :meth:`LineMaster.get_schedule_statistics`
+        """
+        return self.master.get_schedule_statistics()
+
+    async def reload_network(self, network: Network) -> NetworkDiff:
+        """
+        Replaces the network definition of the running master, see :meth:`LineMaster.reload_network`
+
+        :param network: New network definition
+        :type network: Network
+        :return: Differences that were applied
+        :rtype: NetworkDiff
+        """
+        # The reload waits for the frame in progress and the schedule thread, so it's done
+        # outside of the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.master.reload_network, network)
+
+    @staticmethod
+    def _wait(event: TransmitEvent) -> asyncio.Future:
+        # Resolves an asyncio future through the event loop once the event is processed
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(event: TransmitEvent):
+            if not future.done():
+                future.set_result(event)
+
+        event.add_done_callback(lambda event: loop.call_soon_threadsafe(resolve, event))
+        return future
+
+    async def _collect(self, events: List[TransmitEvent], timeout: float | None,
+                       value: Callable[[TransmitEvent], Any] | None = None) -> List[RequestResult]:
+        # Same as LineMaster._collect, the budget is shared by the batch
+        loop = asyncio.get_running_loop()
+        futures = [self._wait(event) for event in events]
+        deadline = None if timeout is None else loop.time() + timeout * len(events)
+        results = []
+        for (event, future) in zip(events, futures):
+            remaining = None if deadline is None else max(deadline - loop.time(), 0)
+            result = RequestResult(event.frame.request)
+            try:
+                await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                result.exception = LineTransportTimeout("Request wasn't processed in time.")
+            else:
+                if event.exception:
+                    result.exception = event.exception
+                else:
+                    result.response = event.response
+                    result.value = value(event) if value is not None else None
+            results.append(result)
+        return results
+
+    async def _transmit(self, frame: RxRequest | TxRequest, timeout: float | None,
+                        priority: TransmitPriority = TransmitPriority.DIAGNOSTIC,
+                        deadline: float | None = None, coalesce: bool | None = None) -> TransmitEvent:
+        event = self.master._schedule_frame(frame, priority, deadline, coalesce)
+        return await asyncio.wait_for(self._wait(event), timeout)
+
+    async def _receive(self, request: int, timeout: float | None,
+                       priority: TransmitPriority = TransmitPriority.DIAGNOSTIC,
+                       deadline: float | None = None, coalesce: bool | None = None) -> TransmitEvent:
+        event = await self._transmit(RxRequest(request), timeout, priority, deadline, coalesce)
+        if event.exception:
+            raise event.exception
+        return event
+
+    # Frame insertion
+    async def request(self, request: Union[int, str], timeout: float | None = None,
+                      priority: TransmitPriority = TransmitPriority.USER,
+                      deadline: float | None = None) -> List[int]:
+        """
+        Sends a request to the bus and waits for the response.
+
+        :param request: Request code or name
+        :type request: Union[int, str]
+        :param timeout: Time to wait for a response, defaults to None
+        :type timeout: float | None, optional
+        :param priority: Priority class of the frame, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, defaults to None
+        :type deadline: float | None, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        :raises event.exception: If an error occurs during the request
+        :return: The response from the bus
+        :rtype: List[int]
+        """
+        event = await self._receive(self.master._resolve_request(request), timeout, priority, deadline)
+        return event.response
+
+    async def request_many(self, requests: List[Union[int, str]], timeout: float | None = 1,
+                           priority: TransmitPriority = TransmitPriority.USER,
+                           deadline: float | None = None) -> List[RequestResult]:
+        """
+        Sends multiple requests back-to-back and waits for all responses, see
+        :meth:`LineMaster.request_many`. Failures are reported per request instead of raising.
+
+        :param requests: Request codes or names
+        :type requests: List[Union[int, str]]
+        :param timeout: Time to wait for each request, defaults to 1
+        :type timeout: float | None, optional
+        :param priority: Priority class of the frames, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frames have to be transmitted, defaults to None
+        :type deadline: float | None, optional
+        :return: Result of each request in the same order as the requests
+        :rtype: List[RequestResult]
+        """
+        frames = [RxRequest(self.master._resolve_request(request)) for request in requests]
+        events = self.master._schedule_frames(frames, priority, deadline)
+        return await self._collect(events, timeout, lambda event: self.master._detached(event.signals))
+
+    async def get_signal(self, request: Union[int, str], name: str, max_age: float | None = 0.2,
+                         timeout: float | None = 1) -> SignalValue:
+        """
+        Returns the last received value of a signal, polling the request when the value is older
+        than max_age, see :meth:`LineMaster.get_signal`.
+
+        :param request: Request code or name
+        :type request: Union[int, str]
+        :param name: Signal name
+        :type name: str
+        :param max_age: Maximum age of the buffered value in seconds, defaults to 0.2
+        :type max_age: float | None, optional
+        :param timeout: Time to wait for the poll, defaults to 1
+        :type timeout: float | None, optional
+        :raises asyncio.TimeoutError: If the poll wasn't processed in time
+        :raises event.exception: If an error occurs during the poll
+        :return: Signal value
+        :rtype: SignalValue
+        """
+        (request, value) = self.master._buffered_signal(request, name, max_age)
+        if value is not None:
+            return value
+
+        event = await self._receive(request, timeout, TransmitPriority.USER, coalesce=True)
+        return self.master._detached(event.signals[name])
+
+    async def send_request(self, request: int, data: List[int], checksum: int | None = None,
+                           timeout: float | None = None,
+                           priority: TransmitPriority = TransmitPriority.USER,
+                           deadline: float | None = None) -> None:
+        """
+        Sends a request to the bus with the specified data and waits for the transmission.
+
+        :param request: The request code to send
+        :type request: int
+        :param data: Data to send with the request
+        :type data: List[int]
+        :param checksum: Checksum value, defaults to None in which case the checksum is calculated
+        :type checksum: int, optional
+        :param timeout: Time to wait for the transmission, defaults to None
+        :type timeout: float, optional
+        :param priority: Priority class of the frame, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, defaults to None
+        :type deadline: float | None, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        """
+        await self._transmit(TxRequest(request, data, checksum), timeout, priority, deadline)
+
+    # Broadcast commands
+    async def wakeup(self, timeout: float | None = None) -> None:
+        """
+        Sends a wakeup request to all nodes on the bus.
+
+        :param timeout: Time to wait for the transmission, defaults to None
+        :type timeout: float | None, optional
+        """
+        await self._transmit(TxRequest(LINE_DIAG_REQUEST_WAKEUP, [], None), timeout)
+
+    async def idle(self, timeout: float | None = None) -> None:
+        """
+        Sends an idle request to all nodes on the bus.
+
+        :param timeout: Time to wait for the transmission, defaults to None
+        :type timeout: float | None, optional
+        """
+        await self._transmit(TxRequest(LINE_DIAG_REQUEST_IDLE, [], None), timeout)
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Sends a shutdown request to all nodes on the bus.
+
+        :param timeout: Time to wait for the transmission, defaults to None
+        :type timeout: float | None, optional
+        """
+        await self._transmit(TxRequest(LINE_DIAG_REQUEST_SHUTDOWN, [], None), timeout)
+
+    # Diagnostic unicast commands
+    async def get_node_statuses(self, nodes: List[Union[int, str]],
+                                properties: List[NodeStatusProperty] | None = None,
+                                timeout: float | None = 1,
+                                priority: TransmitPriority = TransmitPriority.DIAGNOSTIC,
+                                deadline: float | None = None) -> Dict[Union[int, str], Dict[NodeStatusProperty, RequestResult]]:
+        """
+        Requests the given status properties of multiple nodes in a single batch, see
+        :meth:`LineMaster.get_node_statuses`.
+
+        :param nodes: Node addresses or names
+        :type nodes: List[Union[int, str]]
+        :param properties: Properties to request, defaults to None meaning all properties
+        :type properties: List[NodeStatusProperty] | None, optional
+        :param timeout: Time to wait for each request, defaults to 1
+        :type timeout: float | None, optional
+        :param priority: Priority class of the frames, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frames have to be transmitted, defaults to None
+        :type deadline: float | None, optional
+        :return: Result of each property request by node, the value is the property of the node
+        :rtype: Dict[Union[int, str], Dict[NodeStatusProperty, RequestResult]]
+        """
+        if properties is None:
+            properties = list(NodeStatusProperty)
+        targets = [(node, self.master._resolve_node(node), prop) for node in nodes for prop in properties]
+        events = self.master._schedule_frames([RxRequest(_NODE_STATUS_REQUESTS[prop] | address)
+                                               for (_, address, prop) in targets], priority, deadline)
+        results = await self._collect(events, timeout)
+
+        statuses = {}
+        for ((node, address, prop), result) in zip(targets, results):
+            if result.exception is None:
+                result.value = getattr(self.master._node_status[address], prop.value)
+            statuses.setdefault(node, {})[prop] = result
+        return statuses
+
+    async def conditional_change_address(self, serial: int, new_address: int, timeout: float | None = 1) -> None:
+        """
+        Sends a conditional change address request to a node with the specified serial number.
+
+        :param serial: The serial number of the node
+        :type serial: int
+        :param new_address: The new address to assign to the node
+        :type new_address: int
+        :param timeout: Time to wait for the transmission, defaults to 1
+        :type timeout: float, optional
+        """
+        await self._transmit(TxRequest(LINE_DIAG_REQUEST_COND_CHANGE_ADDRESS,
+                                       list(serial.to_bytes(4, 'little')) + [new_address], None),
+                             timeout)
+
+    async def get_operation_status(self, node: Union[int, str], timeout: float | None = 1) -> OperationStatus:
+        """
+        Returns the operation status of a node.
+
+        :param node: Node address or name
+        :type node: Union[int, str]
+        :param timeout: Time to wait for a response, defaults to 1sec
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        :raises event.exception: If an error occurs during the request
+        :return: Node's operation status
+        :rtype: OperationStatus
+        """
+        node = self.master._resolve_node(node)
+        await self._receive(LINE_DIAG_REQUEST_OP_STATUS | node, timeout)
+        return self.master._node_status[node].op_status
+
+    async def get_power_status(self, node: Union[int, str], timeout: float | None = 1) -> PowerStatus:
+        """
+        Returns the power status of a node.
+
+        :param node: Node address or name
+        :type node: Union[int, str]
+        :param timeout: Time to wait for a response, defaults to 1sec
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        :raises event.exception: If an error occurs during the request
+        :return: Node's power status
+        :rtype: PowerStatus
+        """
+        node = self.master._resolve_node(node)
+        await self._receive(LINE_DIAG_REQUEST_POWER_STATUS | node, timeout)
+        return self.master._node_status[node].power_status
+
+    async def get_serial_number(self, node: Union[int, str], timeout: float | None = 1) -> int:
+        """
+        Returns the serial number of a node.
+
+        :param node: Node address or name
+        :type node: Union[int, str]
+        :param timeout: Time to wait for a response, defaults to 1sec
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        :raises event.exception: If an error occurs during the request
+        :return: Serial number
+        :rtype: int
+        """
+        node = self.master._resolve_node(node)
+        await self._receive(LINE_DIAG_REQUEST_SERIAL_NUMBER | node, timeout)
+        return self.master._node_status[node].serial_number
+
+    async def get_software_version(self, node: Union[int, str], timeout: float | None = 1) -> str:
+        """
+        Returns the software version of a node.
+
+        :param node: Node address or name
+        :type node: Union[int, str]
+        :param timeout: Time to wait for a response, defaults to 1sec
+        :type timeout: float, optional
+        :raises asyncio.TimeoutError: If the frame wasn't processed in time
+        :raises event.exception: If an error occurs during the request
+        :return: Software version
+        :rtype: str
+        """
+        node = self.master._resolve_node(node)
+        await self._receive(LINE_DIAG_REQUEST_SW_NUMBER | node, timeout)
+        return self.master._node_status[node].software_version
@@ -4,9 +4,13 @@ LINE_REQUEST_PARITY_MASK = 0x3FFF
 LINE_REQUEST_PARITY_POS = 14
 LINE_DATA_CHECKSUM_OFFSET = 0xA3
 
+LINE_ECHO_TIMEOUT = 1.0
 LINE_REQUEST_TIMEOUT = 0.100
 LINE_DATA_TIMEOUT = 0.100
 
+# Start bit, 8 data bits and a stop bit
+LINE_BITS_PER_BYTE = 10
+
 # Diagnostic codes
 LINE_DIAG_BROADCAST_ID_MIN = 0x0100
 LINE_DIAG_BROADCAST_ID_MAX = 0x01FF
@@ -0,0 +1,193 @@
+# System imports
+from typing import Callable, Dict, Tuple, Any
+from threading import Thread, Condition
+from collections import deque
+from dataclasses import dataclass
+import logging
+import time
+
+# Local imports
+from line_protocol.protocol.transmit_queue import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class DispatchStatistics():
+    """
+    Statistics of the listener dispatcher. The lag is the time between a callback being queued by
+    the master thread and the listener being called.
+    """
+    depth: int
+    dispatched: int
+    dropped: int
+    last_lag: float
+    max_lag: float
+
+class _Worker():
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.queue: deque = deque()
+        self.thread: Thread | None = None
+
+class ListenerDispatcher():
+    """
+    Calls the master's listeners from worker threads instead of the bus thread, so slow listeners
+    don't delay the next frame on the bus.
+
+    Every listener is bound to a single worker, the callbacks of a listener are therefore called
+    in the order they were queued. The binding is kept until the listener is released.
+
+    The queue is bounded by maxsize, when it's full the overflow policy decides whether the oldest
+    callback is dropped (the default), the new callback is dropped ('reject') or the master thread
+    blocks. Blocking delivers every callback, but a listener that can't keep up then holds up the
+    bus again.
+
+    Example:
+    >>> with LineMaster(transport, network, dispatcher=ListenerDispatcher(maxsize=256)) as master:
+    ...     master.add_request_listener(DatabaseWriter())
+
+    :param maxsize: Maximum number of queued callbacks, zero means unbounded, defaults to 1024
+    :type maxsize: int, optional
+    :param overflow: Policy when the queue is full, defaults to 'drop-oldest'
+    :type overflow: OverflowPolicy, optional
+    :param workers: Number of worker threads, defaults to 1
+    :type workers: int, optional
+    """
+
+    def __init__(self, maxsize: int = 1024, overflow: OverflowPolicy = 'drop-oldest', workers: int = 1) -> None:
+        if overflow not in ('block', 'drop-oldest', 'reject'):
+            raise ValueError(f'Unknown overflow policy: {overflow}')
+        if workers < 1:
+            raise ValueError('At least one worker is required.')
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._workers = [_Worker(f'line-dispatch-{index}') for index in range(workers)]
+        # The listener is kept with its worker, so its id can't be reused while it's assigned
+        self._assigned: Dict[int, Tuple[Any, _Worker]] = {}
+        self._next_worker = 0
+        self._condition = Condition()
+        self._size = 0
+        self._running = False
+
+        self._dispatched = 0
+        self._dropped = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    def _full(self) -> bool:
+        return self.maxsize > 0 and self._size >= self.maxsize
+
+    def _worker(self, listener: Any) -> _Worker:
+        assigned = self._assigned.get(id(listener))
+        if assigned is not None:
+            return assigned[1]
+        worker = self._workers[self._next_worker]
+        self._next_worker = (self._next_worker + 1) % len(self._workers)
+        self._assigned[id(listener)] = (listener, worker)
+        return worker
+
+    def release(self, listener: Any):
+        """
+        Unbinds a removed listener from its worker. Callbacks that are already queued are still
+        delivered in order.
+
+        :param listener: Listener that was removed
+        :type listener: Any
+        """
+        with self._condition:
+            self._assigned.pop(id(listener), None)
+
+    def start(self):
+        """
+        Starts the worker threads.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        for worker in self._workers:
+            worker.thread = Thread(target=self._run, args=(worker,), name=worker.name, daemon=True)
+            worker.thread.start()
+
+    def stop(self):
+        """
+        Stops the worker threads after the queued callbacks were delivered.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            if worker.thread is not None:
+                worker.thread.join()
+                worker.thread = None
+
+    def __enter__(self) -> 'ListenerDispatcher':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def submit(self, listener: Any, fn: Callable[..., None], *args) -> bool:
+        """
+        Queues a listener callback.
+
+        :param listener: Listener the callback belongs to, used to keep the callbacks in order
+        :type listener: Any
+        :param fn: Function to call
+        :type fn: Callable[..., None]
+        :return: False if the callback was dropped
+        :rtype: bool
+        """
+        with self._condition:
+            worker = self._worker(listener)
+            if self._full():
+                if self.overflow == 'reject':
+                    self._dropped += 1
+                    logger.warning("Dropping listener callback, dispatch queue is full")
+                    return False
+                elif self.overflow == 'block':
+                    self._condition.wait_for(lambda: not self._full() or not self._running)
+                else:
+                    oldest = min((other for other in self._workers if other.queue),
+                                 key=lambda other: other.queue[0][0])
+                    oldest.queue.popleft()
+                    self._size -= 1
+                    self._dropped += 1
+                    logger.warning("Dropping listener callback, dispatch queue is full")
+            worker.queue.append((time.monotonic(), fn, args))
+            self._size += 1
+            self._condition.notify_all()
+        return True
+
+    def _run(self, worker: _Worker):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: worker.queue or not self._running)
+                if not worker.queue:
+                    return
+                (queued, fn, args) = worker.queue.popleft()
+                self._size -= 1
+                lag = time.monotonic() - queued
+                self._last_lag = lag
+                self._max_lag = max(self._max_lag, lag)
+                self._dispatched += 1
+                self._condition.notify_all()
+
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("Error in listener callback")
+
+    def get_statistics(self) -> DispatchStatistics:
+        """
+        Returns the dispatch queue depth, the number of delivered and dropped callbacks and the
+        dispatch lag.
+
+        :return: Dispatch statistics
+        :rtype: DispatchStatistics
+        """
+        with self._condition:
+            return DispatchStatistics(self._size, self._dispatched, self._dropped,
+                                      self._last_lag, self._max_lag)
@@ -0,0 +1,126 @@
+# System imports
+from threading import Condition
+import logging
+
+# Local imports
+from line_protocol.protocol.transport import (LineSerialTransport, LineTransportListener,
+                                              LineTransportTimeout, LineTransportDataError,
+                                              LineTransportRequestError)
+from line_protocol.protocol.virtual_bus import VirtualBus
+from line_protocol.protocol.util import request_code, data_checksum
+from line_protocol.protocol.constants import *
+
+logger = logging.getLogger(__name__)
+
+class LoopbackSerial():
+    """
+    In-memory replacement for a serial port where the other end of the line is a virtual bus.
+
+    Every write is treated as the start of a transaction: request headers are decoded and forwarded
+    to the bus members, whose response is serialized back into the receive buffer. Complete frames
+    written by the master are parsed and delivered to the bus members the way a peripheral would
+    receive them. On one-wire buses the written bytes are echoed back before the response.
+    """
+
+    def __init__(self, bus: LineTransportListener, one_wire: bool = True) -> None:
+        self.bus = bus
+        self.one_wire = one_wire
+        self.port = None
+        self.timeout: float | None = None
+        self.is_open = False
+        self._rx = bytearray()
+        self._condition = Condition()
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._rx)
+
+    def reset_input_buffer(self):
+        with self._condition:
+            self._rx.clear()
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        response = self._process(data)
+        with self._condition:
+            if self.one_wire:
+                self._rx += data
+            if response is not None:
+                self._rx += response
+            self._condition.notify_all()
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._rx) >= size, self.timeout)
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+        return data
+
+    def _process(self, data: bytes) -> bytes | None:
+        if len(data) < 3 or data[0] != LINE_SYNC_BYTE:
+            logger.debug('RX Garbled data %s', data.hex())
+            return None
+
+        request = (data[1] << 8) | data[2]
+        if request_code(request & LINE_REQUEST_PARITY_MASK) != request:
+            logger.error("RX Request parity error! 0x%04X", request)
+            self.bus.on_error(request & LINE_REQUEST_PARITY_MASK,
+                              LineTransportRequestError('Invalid request parity.'))
+            return None
+        request &= LINE_REQUEST_PARITY_MASK
+
+        if len(data) == 3:
+            # Only a header was sent, one of the peripherals is expected to respond
+            response = self.bus.on_request(request)
+            if response is None:
+                return None
+            self.bus.on_request_complete(request, response)
+            return bytes([len(response)] + list(response) + [data_checksum(response)])
+
+        size = data[3]
+        payload = list(data[4:4 + size])
+        if len(data) < 4 + size + 1:
+            self.bus.on_error(request, LineTransportTimeout('Incomplete frame.'))
+        elif data_checksum(payload) != data[4 + size]:
+            self.bus.on_error(request, LineTransportDataError('Invalid checksum.'))
+        else:
+            self.bus.on_request_complete(request, payload)
+        return None
+
+class LineLoopbackTransport(LineSerialTransport):
+    """
+    Serial transport without hardware, the frames are encoded and parsed exactly like on a real
+    serial port but the peripherals are simulated in the same process.
+
+    Example:
+    >>> with LineLoopbackTransport() as transport:
+    ...     transport.add(SimulatedPeripheral(network.get_node('RotorSensor')))
+    ...     with LineMaster(transport, network) as master:
+    ...         master.request('WheelSpeed', wait=True)
+
+    :param baudrate: Baudrate of the simulated bus, defaults to 19200
+    :type baudrate: int, optional
+    :param one_wire: Whether transmitted bytes are echoed back, defaults to True
+    :type one_wire: bool, optional
+    """
+
+    def __init__(self, baudrate: int = 19200, one_wire: bool = True) -> None:
+        super().__init__(None, baudrate, one_wire)
+        self.bus = VirtualBus()
+        self._serial = LoopbackSerial(self.bus, one_wire)
+
+    def add(self, listener: LineTransportListener):
+        """
+        Connects a listener, e.g.: a SimulatedPeripheral to the other end of the line.
+
+        :param listener: Listener to add to the bus
+        :type listener: LineTransportListener
+        """
+        self.bus.add(listener)
@@ -1,19 +1,25 @@
 # System imports
 import time
 import logging
-from typing import Union, Dict, List
-from threading import Event, Thread
-from queue import Queue, Empty
+from typing import Union, Dict, List, Set, Tuple, Callable, Any, Literal
+from threading import Event, Thread, Lock, RLock, Condition, current_thread
+from concurrent.futures import Future
+from queue import Empty, Full
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from urllib import request
 
 # Local imports
 from line_protocol.protocol.constants import *
-from line_protocol.protocol.transport import LineSerialTransport, LineTransportTimeout, LineTransportError
+from line_protocol.protocol.transport import LineTransport, LineTransportTimeout, LineTransportError
+from line_protocol.protocol.transmit_queue import (TransmitQueue, TransmitPriority, QueueStatistics,
+                                                   LineRequestExpired, LineQueueOverflow, OverflowPolicy)
 from line_protocol.protocol.virtual_bus import VirtualBus
-from line_protocol.network import (Network, Request, SignalValueContainer, SignalValue, NodeRef,
-                                   ScheduleExecutor, Schedule)
+from line_protocol.protocol.dispatch import ListenerDispatcher, DispatchStatistics
+from line_protocol.network import (Network, Request, SignalValueContainer, SignalValue, SignalRef,
+                                   NodeRef, MappingEncoder, ScheduleExecutor, Schedule, ScheduleStatistics)
+from line_protocol.network.schedule import ScheduleEntry
+from line_protocol.network.diff import NetworkDiff, diff_networks
 from line_protocol.protocol.util import op_status_str, OperationStatus
 
 logger = logging.getLogger(__name__)
@@ -69,6 +75,8 @@ class TransmitEvent():
     frame: TxRequest | RxRequest
     event_id: int
     event: Event
+    priority: TransmitPriority
+    deadline: float | None
 
     # These will be filled in when the event is processed
     timestamp: float | None
@@ -76,14 +84,55 @@ class TransmitEvent():
     signals: SignalValueContainer | None
     exception: Exception | None
 
-    def __init__(self, frame: TxRequest | RxRequest, event_id: int, event: Event) -> None:
+    def __init__(self, frame: TxRequest | RxRequest, event_id: int, event: Event,
+                 priority: TransmitPriority = TransmitPriority.USER, deadline: float | None = None) -> None:
         self.frame = frame
         self.event_id = event_id
         self.event = event
+        self.priority = priority
+        self.deadline = deadline
         self.timestamp = None
         self.response = None
         self.signals = None
         self.exception = None
+        self._lock = Lock()
+        self._callbacks: List[Callable[['TransmitEvent'], None]] = []
+
+    def add_done_callback(self, fn: Callable[['TransmitEvent'], None]) -> None:
+        """
+        Registers a function that's called with the event once it's processed. The function is
+        called from the master thread, or immediately if the event is already complete.
+
+        :param fn: Callback function
+        :type fn: Callable[[TransmitEvent], None]
+        """
+        with self._lock:
+            if not self.event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _complete(self) -> None:
+        with self._lock:
+            self.event.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                logger.exception("Error in completion callback of event %d", self.event_id)
+
+@dataclass
+class RequestResult():
+    """
+    Outcome of a request made as part of a batch, either the response or the exception is set.
+    The value is the signals of user requests or the node property of diagnostic requests.
+    """
+    request: int
+    response: List[int] | None = None
+    value: Any = None
+    exception: Exception | None = None
 
 class NodeStatusProperty(Enum):
     OP_STATUS = "op_status"
@@ -94,33 +143,62 @@ class NodeStatusProperty(Enum):
     def __str__(self):
         return self.value
 
+_NODE_STATUS_REQUESTS = {
+    NodeStatusProperty.OP_STATUS: LINE_DIAG_REQUEST_OP_STATUS,
+    NodeStatusProperty.POWER_STATUS: LINE_DIAG_REQUEST_POWER_STATUS,
+    NodeStatusProperty.SERIAL_NUMBER: LINE_DIAG_REQUEST_SERIAL_NUMBER,
+    NodeStatusProperty.SOFTWARE_VERSION: LINE_DIAG_REQUEST_SW_NUMBER,
+}
+
 class UserRequest:
     """
-    Used to buffer responses to user requests
+    Used to buffer responses to user requests. When decoding in place the signal values are
+    allocated once and updated by every response, including resets.
     """
 
-    def __init__(self, request: Request) -> None:
+    def __init__(self, request: Request, in_place: bool = False) -> None:
         self.request = request
+        self.in_place = in_place
         self.last_timestamp: float | None = None
-        self.buffer = self.request.encode({})
-        self.signals = SignalValueContainer([SignalValue(signal,
-                                                         signal.initial,
-                                                         signal.encoder.encode(signal.initial))
-                                             for signal in request.signals])
+        self.last_update: float | None = None
+        self.buffer = self.request.encode_raw({})
+        self._initial = [(signal, signal.initial, signal.encoder.encode(signal.initial))
+                         for signal in request.signals]
+        self.signals = self._initial_signals()
         self.exception: Exception | None = None
 
+    def _initial_signals(self) -> SignalValueContainer:
+        return SignalValueContainer([SignalValue(signal, phy, raw) for (signal, phy, raw) in self._initial])
+
     def reset(self):
         """
         Resets the request to its initial state.
         """
         self.last_timestamp = None
-        self.buffer = self.request.encode({})
-        self.signals = SignalValueContainer([SignalValue(signal,
-                                                         signal.initial,
-                                                         signal.encoder.encode(signal.initial))
-                                             for signal in self.request.signals])
+        self.last_update = None
+        self.buffer = self.request.encode_raw({})
+        if self.in_place:
+            for (value, (_, phy, raw)) in zip(self.signals, self._initial):
+                value.phy = phy
+                value.raw = raw
+        else:
+            self.signals = self._initial_signals()
         self.exception = None
-    
+
+    def decode(self, data: List[int]) -> SignalValueContainer:
+        """
+        Decodes a response into the buffered signals, either in place or into a new container.
+
+        :param data: Response data
+        :type data: List[int]
+        :return: Decoded signals
+        :rtype: SignalValueContainer
+        """
+        if self.in_place:
+            return self.request.decode_into(data, self.signals)
+        self.signals = self.request.decode(data)
+        return self.signals
+
 class RequestListener:
     """
     Interface for request listeners. The listener will be called when a request is made or an error
@@ -179,30 +257,112 @@ class NodeStatusListener:
         """
         raise NotImplementedError()
 
+SignalCallback = Callable[[float, SignalValue], None]
+
+class SignalSubscription():
+    """
+    Subscription to a single signal, created by :meth:`LineMaster.subscribe_signal`. The last
+    value that was delivered to the callback is kept for change detection.
+    """
+
+    def __init__(self, ref: SignalRef, callback: SignalCallback, deadband: float | None,
+                 on_change_only: bool) -> None:
+        self.ref = ref
+        self.callback = callback
+        self.deadband = deadband
+        self.on_change_only = on_change_only
+        self.last_raw: int | None = None
+        self.last_phy: Union[int, float, str, None] = None
+
+    def _accept(self, value: SignalValue) -> bool:
+        if self.last_raw is not None and self.on_change_only:
+            # Comparing the raw values is cheap and filters the common case of an unchanged signal
+            if value.raw == self.last_raw:
+                return False
+            if self.deadband is not None and abs(value.phy - self.last_phy) < self.deadband:
+                return False
+        # Plain values are kept, the signal value itself may be updated in place
+        self.last_raw = value.raw
+        self.last_phy = value.phy
+        return True
+
 class LineMaster():
+    """
+    Bus master, frames are queued by the callers and transmitted by the master thread.
+
+    The transmit queue is unbounded by default, when a queue size is set the overflow policy
+    decides whether callers block, the oldest frames are evicted or new frames are rejected.
+    With coalescing enabled a request whose identifier is already pending isn't queued again,
+    the caller receives the result of the pending one. When the caller's priority class is more
+    important the pending request is moved to it.
+
+    :param transport: Transport used to access the bus, defaults to None
+    :type transport: LineTransport | None, optional
+    :param network: Network definition, defaults to None
+    :type network: Network | None, optional
+    :param queue_size: Maximum number of queued frames, zero means unbounded, defaults to 0
+    :type queue_size: int, optional
+    :param overflow: Policy when the queue is full, defaults to 'block'
+    :type overflow: OverflowPolicy, optional
+    :param coalesce: Attach requests to pending requests of the same identifier, defaults to False
+    :type coalesce: bool, optional
+    :param dispatcher: Calls the listeners outside of the master thread, defaults to None in which
+                       case the listeners are called by the master thread
+    :type dispatcher: ListenerDispatcher | None, optional
+    :param decode_in_place: Update the buffered signal values instead of allocating new ones for
+                            every response, the containers passed to the listeners are then only
+                            valid until the next response, use snapshot() to keep them. Values
+                            returned by get_signal() and request_many() are always copies,
+                            defaults to False
+    :type decode_in_place: bool, optional
+    """
 
-    def __init__(self, transport: 'LineSerialTransport | None' = None, network: 'Network | None' = None) -> None:
+    def __init__(self, transport: 'LineTransport | None' = None, network: 'Network | None' = None,
+                 queue_size: int = 0, overflow: OverflowPolicy = 'block', coalesce: bool = False,
+                 dispatcher: ListenerDispatcher | None = None, decode_in_place: bool = False) -> None:
         self.transport = transport
         self.network = network
         self.virtual_bus = VirtualBus()
+        self.dispatcher = dispatcher
+        self.decode_in_place = decode_in_place
 
         # Master thread
-        self._queue: 'Queue[TransmitEvent]' = Queue(maxsize=0)
+        self._queue = TransmitQueue(queue_size, overflow)
+        self._coalesce = coalesce
+        self._expired = 0
+        self._dropped = 0
+        self._coalesced = 0
         self._event_id = 0
+        self._event_lock = Lock()
+        self._thread: Thread | None = None
+
+        # Requests that are queued or being transmitted, used for coalescing
+        self._pending: Dict[int, TransmitEvent] = {}
+        self._pending_lock = Lock()
         self._running = False
+        # Held while a frame is processed, network reloads are applied in between frames
+        self._frame_lock = RLock()
 
         # Status buffers
         self._user_requests: Dict[int, UserRequest] = {}
         self._node_status: Dict[int, NodeStatus] = {}
 
         # Listeners
-        self._request_listeners: List[RequestListener] = []
+        self._request_listeners: List[Tuple[RequestListener, Set[int] | None]] = []
+        self._request_routes: Dict[int, List[RequestListener]] = {}
+        self._signal_subscriptions: Dict[int, List[SignalSubscription]] = {}
         self._node_status_listeners: List[NodeStatusListener] = []
 
-        # Schedule thread
+        # Schedule thread, started with the first schedule and kept until the master is stopped
         self._schedule_running: bool = False
+        self._schedule_paused: bool = False
+        self._schedule_busy: bool = False
+        self._schedule_stop: bool = False
+        self._schedule_condition = Condition()
         self._schedule_thread: Thread | None = None
         self._active_schedule: ScheduleExecutor | None = None
+        self._pending_schedule: ScheduleExecutor | None = None
+        self._pending_at_cycle_end: bool = False
 
     def reset_user_requests(self):
         """
@@ -223,21 +383,86 @@ class LineMaster():
         timestamp = time.time()
 
         # Notify all listeners that the node statuses have been reset
-        for node_id, node_status in self._node_status.items():
-            for listener in self._node_status_listeners:
-                listener.on_node_change(timestamp, NodeRef(node_status._name, node_id), node_status, NodeStatusProperty.OP_STATUS)
-                listener.on_node_change(timestamp, NodeRef(node_status._name, node_id), node_status, NodeStatusProperty.POWER_STATUS)
-                listener.on_node_change(timestamp, NodeRef(node_status._name, node_id), node_status, NodeStatusProperty.SERIAL_NUMBER)
-                listener.on_node_change(timestamp, NodeRef(node_status._name, node_id), node_status, NodeStatusProperty.SOFTWARE_VERSION)
+        for node_id in self._node_status:
+            for property in NodeStatusProperty:
+                self._notify_node_change(timestamp, node_id, property)
 
-    def add_request_listener(self, listener: RequestListener):
+    def add_request_listener(self, listener: RequestListener,
+                             requests: List[Union[int, str]] | None = None):
         """
-        Adds a listener for request events. The listener will be called when a request is made.
+        Adds a listener for request events. The listener will be called when a request is made,
+        when requests are given only for those requests.
+
+        Example:
+        >>> master.add_request_listener(listener, requests=['WheelSpeed', 0x1100])
 
         :param listener: The listener to add
         :type listener: RequestListener
+        :param requests: Request codes or names the listener subscribes to, defaults to None in
+                         which case the listener receives every request
+        :type requests: List[Union[int, str]] | None, optional
         """
-        self._request_listeners.append(listener)
+        if requests is not None:
+            requests = {self._resolve_request(request) for request in requests}
+        self._request_listeners.append((listener, requests))
+        self._build_request_routes()
+
+    def subscribe_signal(self, request: Union[int, str], signal: str, callback: SignalCallback,
+                         deadband: float | None = None, on_change_only: bool = True) -> SignalSubscription:
+        """
+        Subscribes to changes of a single signal. The callback receives the timestamp and the
+        signal value, by default only when the raw value of the signal changed. With a deadband
+        the physical value additionally has to differ by at least the deadband from the value
+        that was last delivered, so slow drifts are still reported once they add up.
+
+        Example:
+        >>> master.subscribe_signal('WheelSpeed', 'FrontSpeed', print, deadband=0.5)
+
+        :param request: Request code or name
+        :type request: Union[int, str]
+        :param signal: Signal name
+        :type signal: str
+        :param callback: Called with the timestamp and the new value
+        :type callback: SignalCallback
+        :param deadband: Minimal change of the physical value, defaults to None
+        :type deadband: float | None, optional
+        :param on_change_only: Only deliver changed values, defaults to True
+        :type on_change_only: bool, optional
+        :raises ValueError: If a deadband is set for a signal without numeric values
+        :return: Subscription, used to unsubscribe
+        :rtype: SignalSubscription
+        """
+        if self.network is None:
+            raise ValueError("Network is not set, cannot resolve signals.")
+        ref = self.network.get_signal(request, signal)
+        if deadband is not None and isinstance(ref.signal.encoder, MappingEncoder):
+            raise ValueError(f'{signal}: Deadband requires a numeric signal')
+
+        subscription = SignalSubscription(ref, callback, deadband, on_change_only)
+        # The lists are replaced instead of modified, the master thread may be iterating them
+        subscriptions = self._signal_subscriptions.get(ref.request.id, [])
+        self._signal_subscriptions[ref.request.id] = subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe_signal(self, subscription: SignalSubscription):
+        """
+        Removes a subscription created by :meth:`subscribe_signal`.
+
+        :param subscription: The subscription to remove
+        :type subscription: SignalSubscription
+        """
+        subscriptions = self._signal_subscriptions.get(subscription.ref.request.id, [])
+        self._signal_subscriptions[subscription.ref.request.id] = [other for other in subscriptions
+                                                                   if other is not subscription]
+        if self.dispatcher is not None:
+            self.dispatcher.release(subscription)
+
+    def _build_request_routes(self):
+        # Listeners are looked up by request code on the master thread, the table is replaced
+        # as a whole so the master thread never sees a partially built one
+        self._request_routes = {request: [listener for (listener, requests) in self._request_listeners
+                                          if requests is None or request in requests]
+                                for request in self._user_requests}
 
     def add_node_status_listener(self, listener: NodeStatusListener):
         """
@@ -248,10 +473,48 @@ class LineMaster():
         """
         self._node_status_listeners.append(listener)
 
+    def _notify(self, listener: Any, fn: Callable[..., None], *args) -> None:
+        if self.dispatcher is None:
+            fn(*args)
+        else:
+            self.dispatcher.submit(listener, fn, *args)
+
+    def _deliverable(self, value: SignalValue | SignalValueContainer) -> SignalValue | SignalValueContainer:
+        # Values decoded in place change with the next response, dispatched listeners need a copy
+        if self.decode_in_place and self.dispatcher is not None:
+            return value.snapshot() if isinstance(value, SignalValueContainer) else value.copy()
+        return value
+
+    def _detached(self, value: SignalValue | SignalValueContainer) -> SignalValue | SignalValueContainer:
+        # Values returned to the caller outlive the next response, so they're never the live buffers
+        if self.decode_in_place:
+            return value.snapshot() if isinstance(value, SignalValueContainer) else value.copy()
+        return value
+
+    def _notify_node_change(self, timestamp: float, node_id: int, property: NodeStatusProperty) -> None:
+        status = self._node_status[node_id]
+        ref = NodeRef(status._name, node_id)
+        if self.dispatcher is not None:
+            # The status is updated in place, dispatched listeners get the state of this change
+            status = replace(status)
+        for listener in self._node_status_listeners:
+            self._notify(listener, listener.on_node_change, timestamp, ref, status, property)
+
+    def get_dispatch_statistics(self) -> DispatchStatistics | None:
+        """
+        Returns the statistics of the listener dispatcher, e.g.: the dispatch lag.
+
+        :return: Dispatch statistics, None if the listeners are called by the master thread
+        :rtype: DispatchStatistics | None
+        """
+        if self.dispatcher is None:
+            return None
+        return self.dispatcher.get_statistics()
+
     def _setup(self):
         if self.network is not None:
             for request in self.network.requests:
-                self._user_requests[request.id] = UserRequest(request)
+                self._user_requests[request.id] = UserRequest(request, self.decode_in_place)
 
         for node_id in range(LINE_DIAG_UNICAST_UNASSIGNED_ID + 1, LINE_DIAG_UNICAST_BROADCAST_ID):
             node_name = "Unset"
@@ -262,8 +525,12 @@ class LineMaster():
                 pass
             self._node_status[node_id] = NodeStatus(node_name, None, None, None, None)
 
+        self._build_request_routes()
+
     def __enter__(self):
         self._setup()
+        if self.dispatcher is not None:
+            self.dispatcher.start()
 
         self._running = True
         self._thread = Thread(target=self.run)
@@ -273,8 +540,7 @@ class LineMaster():
     def _process_opstatus_request(self, timestamp: float, node_id, data: List[int]) -> None:
         self._node_status[node_id].op_status = op_status_str(data[0])
         logger.info("Node %s (0x%02X) operation status: %s", self._node_status[node_id]._name, node_id, self._node_status[node_id].op_status)
-        for listener in self._node_status_listeners:
-            listener.on_node_change(timestamp, NodeRef(self._node_status[node_id]._name, node_id), self._node_status[node_id], NodeStatusProperty.OP_STATUS)
+        self._notify_node_change(timestamp, node_id, NodeStatusProperty.OP_STATUS)
 
     def _process_powerstatus_request(self, timestamp: float, node_id, data: List[int]) -> None:
         self._node_status[node_id].power_status = PowerStatus(data[0] / 10.0, data[1], data[2])
@@ -283,20 +549,17 @@ class LineMaster():
                     self._node_status[node_id].power_status.voltage,
                     self._node_status[node_id].power_status.op_current,
                     self._node_status[node_id].power_status.sleep_current)
-        for listener in self._node_status_listeners: 
-            listener.on_node_change(timestamp, NodeRef(self._node_status[node_id]._name, node_id), self._node_status[node_id], NodeStatusProperty.POWER_STATUS)
+        self._notify_node_change(timestamp, node_id, NodeStatusProperty.POWER_STATUS)
 
     def _process_serialnumber_request(self, timestamp: float, node_id, data: List[int]) -> None:
         self._node_status[node_id].serial_number = int.from_bytes(data[0:4], 'little')
         logger.info("Node %s (0x%02X) serial number: 0x%08X", self._node_status[node_id]._name, node_id, self._node_status[node_id].serial_number)
-        for listener in self._node_status_listeners:
-            listener.on_node_change(timestamp, NodeRef(self._node_status[node_id]._name, node_id), self._node_status[node_id], NodeStatusProperty.SERIAL_NUMBER)
+        self._notify_node_change(timestamp, node_id, NodeStatusProperty.SERIAL_NUMBER)
 
     def _process_swnumber_request(self, timestamp: float, node_id, data: List[int]) -> None:
         self._node_status[node_id].software_version = f"{data[0]}.{data[1]}.{data[2]}"
         logger.info("Node %s (0x%02X) software version: %s", self._node_status[node_id]._name, node_id, self._node_status[node_id].software_version)
-        for listener in self._node_status_listeners:
-            listener.on_node_change(timestamp, NodeRef(self._node_status[node_id]._name, node_id), self._node_status[node_id], NodeStatusProperty.SOFTWARE_VERSION)
+        self._notify_node_change(timestamp, node_id, NodeStatusProperty.SOFTWARE_VERSION)
 
     def _process_unicast_request(self, timestamp: float, request: int, data: List[int]) -> None:
         request_type = request & LINE_DIAG_UNICAST_REQUEST_ID_MASK
@@ -313,9 +576,14 @@ class LineMaster():
 
     def _process_user_request(self, timestamp: float, request: int, data: List[int]) -> SignalValueContainer | None:
         if request in self._user_requests:
-            signals = self._user_requests[request].request.decode(data)
-            self._user_requests[request].signals = signals
+            signals = self._user_requests[request].decode(data)
             self._user_requests[request].last_timestamp = timestamp
+            self._user_requests[request].last_update = time.monotonic()
+
+            for subscription in self._signal_subscriptions.get(request, ()):
+                value = signals[subscription.ref.signal.name]
+                if subscription._accept(value):
+                    self._notify(subscription, subscription.callback, timestamp, self._deliverable(value))
             return signals
 
         return None
@@ -377,10 +645,12 @@ class LineMaster():
                 logger.warning("Skipping processing for frame id 0x%04X (out of range)", event.frame.request)
 
             # Notify the listeners that the request was made
-            if event.frame.request in self._user_requests:
-                for listener in self._request_listeners:
-                    listener.on_user_request(timestamp, self._user_requests[event.frame.request].request,
-                                            response, self._user_requests[event.frame.request].signals)
+            listeners = self._request_routes.get(event.frame.request)
+            if listeners and event.frame.request in self._user_requests:
+                signals = self._deliverable(self._user_requests[event.frame.request].signals)
+                for listener in listeners:
+                    self._notify(listener, listener.on_user_request, timestamp,
+                                 self._user_requests[event.frame.request].request, response, signals)
         else:
             logger.error("Error during request 0x%04X: %s", event.frame.request, str(exception))
 
@@ -390,71 +660,439 @@ class LineMaster():
 
             # Notify the listeners of the error
             if event.frame.request in self._user_requests:
-                for listener in self._request_listeners:
-                    listener.on_error(timestamp, self._user_requests[event.frame.request].request, exception)
+                for listener in self._request_routes.get(event.frame.request, ()):
+                    self._notify(listener, listener.on_error, timestamp,
+                                 self._user_requests[event.frame.request].request, exception)
 
         event.response = response
         event.exception = exception
         event.timestamp = timestamp
-        event.event.set()
+        self._finish(event)
+
+    def _finish(self, event: TransmitEvent) -> None:
+        if isinstance(event.frame, RxRequest):
+            with self._pending_lock:
+                if self._pending.get(event.frame.request) is event:
+                    del self._pending[event.frame.request]
+        event._complete()
+
+    def _drop(self, event: TransmitEvent, exception: Exception) -> None:
+        event.exception = exception
+        event.timestamp = time.time()
+        self._finish(event)
+
+    def _expire(self, event: TransmitEvent) -> None:
+        logger.warning("Dropping request 0x%04X, deadline passed", event.frame.request)
+        self._expired += 1
+        self._drop(event, LineRequestExpired("Deadline passed before transmission."))
 
     def run(self):
         while self._running:
             try:
                 event = self._queue.get(timeout=1)
-                self._do_receive(event)
+                with self._frame_lock:
+                    if event.deadline is not None and time.monotonic() > event.deadline:
+                        self._expire(event)
+                    else:
+                        self._do_receive(event)
             except Empty as exc:
                 pass
 
+    def get_queue_statistics(self) -> QueueStatistics:
+        """
+        Returns the number of frames waiting in each priority class, the number of frames that were
+        dropped because their deadline passed or the queue was full and the number of coalesced
+        requests.
+
+        :return: Queue statistics
+        :rtype: QueueStatistics
+        """
+        return QueueStatistics(self._queue.depth(), self._expired, self._dropped, self._coalesced)
+
     def __exit__(self, exc_type, exc_value, traceback):
-        if self._schedule_running:
-            self.disable_schedule()
+        if self._schedule_thread is not None:
+            with self._schedule_condition:
+                self._schedule_running = False
+                self._schedule_stop = True
+                self._schedule_condition.notify_all()
+            self._schedule_thread.join()
+            self._schedule_thread = None
+            self._schedule_stop = False
 
         self._running = False
         self._thread.join()
 
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+
     # Schedule commands
-    def _schedule_frame(self, frame: RxRequest | TxRequest) -> TransmitEvent:
-        event = TransmitEvent(frame, self._event_id, Event())
-        self._queue.put(event)
-        self._event_id += 1 # TODO: thread safety
-        return event
+    def _schedule_frame(self, frame: RxRequest | TxRequest,
+                        priority: TransmitPriority = TransmitPriority.USER,
+                        deadline: float | None = None, coalesce: bool | None = None) -> TransmitEvent:
+        return self._schedule_frames([frame], priority, deadline, coalesce, raise_overflow=True)[0]
+
+    def _attach(self, frame: RxRequest, priority: TransmitPriority,
+                deadline: float | None) -> TransmitEvent | None:
+        with self._pending_lock:
+            event = self._pending.get(frame.request)
+            if event is None:
+                return None
+            # A more important caller must not wait behind the pending frame's class
+            if priority < event.priority:
+                self._queue.promote(event, priority)
+            # The pending frame has to live as long as any of its callers cares about it
+            if event.deadline is not None:
+                event.deadline = None if deadline is None else max(event.deadline, deadline)
+            self._coalesced += 1
+            return event
+
+    def _schedule_frames(self, frames: List[RxRequest | TxRequest],
+                         priority: TransmitPriority = TransmitPriority.USER,
+                         deadline: float | None = None, coalesce: bool | None = None,
+                         raise_overflow: bool = False) -> List[TransmitEvent]:
+        # Frames are queued under the lock so they're transmitted back-to-back. A frame that doesn't
+        # fit into the queue fails on its own, the rest of the batch is still queued.
+        if deadline is not None:
+            deadline += time.monotonic()
+        if coalesce is None:
+            coalesce = self._coalesce
+        events = []
+        # Event that is waiting for space in the queue
+        blocked = None
+        while len(events) < len(frames):
+            if blocked is not None:
+                # Other threads keep queueing while this one waits for the bus to drain the queue
+                self._queue.wait_for_space()
+            with self._event_lock:
+                while len(events) < len(frames):
+                    frame = frames[len(events)]
+                    if blocked is not None:
+                        (event, blocked) = (blocked, None)
+                    else:
+                        if coalesce and isinstance(frame, RxRequest):
+                            event = self._attach(frame, priority, deadline)
+                            if event is not None:
+                                events.append(event)
+                                continue
+
+                        event = TransmitEvent(frame, self._event_id, Event(), priority, deadline)
+                        self._event_id += 1
+                        if isinstance(frame, RxRequest):
+                            with self._pending_lock:
+                                self._pending.setdefault(frame.request, event)
+                    try:
+                        evicted = self._queue.put(event, block=False)
+                    except Full:
+                        if current_thread() is not self._thread:
+                            blocked = event
+                            break
+                        # The master thread would wait for itself, e.g.: in a listener or callback
+                        error = LineQueueOverflow('Transmit queue is full.')
+                    except LineQueueOverflow as e:
+                        error = e
+                    else:
+                        error = None
+                    if error is not None:
+                        self._dropped += 1
+                        self._drop(event, error)
+                        if raise_overflow:
+                            raise error
+                        events.append(event)
+                        continue
+                    if evicted is not None:
+                        logger.warning("Dropping request 0x%04X, transmit queue is full", evicted.frame.request)
+                        self._dropped += 1
+                        self._drop(evicted, LineQueueOverflow("Evicted from the full transmit queue."))
+                    events.append(event)
+        return events
+
+    @staticmethod
+    def _collect(events: List[TransmitEvent], timeout: float | None,
+                 value: Callable[[TransmitEvent], Any] | None = None) -> List[RequestResult]:
+        # The frames are processed one after the other, so the budget is shared by the batch
+        deadline = None if timeout is None else time.monotonic() + timeout * len(events)
+        results = []
+        for event in events:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            result = RequestResult(event.frame.request)
+            if not event.event.wait(remaining):
+                result.exception = LineTransportTimeout("Request wasn't processed in time.")
+            elif event.exception:
+                result.exception = event.exception
+            else:
+                result.response = event.response
+                result.value = value(event) if value is not None else None
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _future(event: TransmitEvent, result: Callable[[TransmitEvent], Any]) -> Future:
+        # Resolves the future from the master thread once the event is processed
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def resolve(event: TransmitEvent):
+            if event.exception:
+                future.set_exception(event.exception)
+            else:
+                future.set_result(result(event))
+
+        event.add_done_callback(resolve)
+        return future
 
     def _scheduler(self):
-        while self._schedule_running:
-            entry = self._active_schedule.next()
-            if entry is not None:
-                entry.perform(self)
-            self._active_schedule.wait()
+        while True:
+            with self._schedule_condition:
+                self._schedule_condition.wait_for(
+                    lambda: self._schedule_stop or (self._schedule_running and not self._schedule_paused))
+                if self._schedule_stop:
+                    return
+                if self._pending_schedule is not None and \
+                        (not self._pending_at_cycle_end or self._active_schedule.at_cycle_end()):
+                    # Switch between two slots, the new schedule continues the timeline
+                    self._pending_schedule.continue_timeline(self._active_schedule)
+                    self._active_schedule = self._pending_schedule
+                    self._pending_schedule = None
+                executor = self._active_schedule
+                self._schedule_busy = True
 
-    def enable_schedule(self, schedule: Union[str, Schedule]):
+            try:
+                entry = executor.next()
+                if entry is not None:
+                    entry.perform(self)
+            except Exception:
+                logger.exception("Error performing schedule entry")
+
+            with self._schedule_condition:
+                self._schedule_busy = False
+                self._schedule_condition.notify_all()
+            executor.wait(self._schedule_sleep)
+
+    def _schedule_sleep(self, duration: float):
+        # The rest of the slot is abandoned when the schedule is stopped or paused, a pending
+        # switch still waits for the slot boundary
+        with self._schedule_condition:
+            self._schedule_condition.wait_for(
+                lambda: self._schedule_stop or not self._schedule_running or self._schedule_paused, duration)
+
+    def _wait_schedule_idle(self):
+        # Called with the condition held, returns once the entry in progress is queued
+        if current_thread() is not self._schedule_thread:
+            self._schedule_condition.wait_for(lambda: not self._schedule_busy)
+
+    def enable_schedule(self, schedule: Union[str, Schedule],
+                        switch: Literal['immediate', 'cycle-end'] = 'immediate'):
         """
         Starts the schedule and runs it in a separate thread. The schedule can be either a string
         representing the schedule name or a Schedule object. If a string is provided, it will be
         resolved to a Schedule object from the network.
 
+        When a schedule is already running the scheduler thread switches to the new schedule
+        without a gap: 'immediate' switches after the slot in progress, 'cycle-end' after the
+        current cycle of the running schedule is complete. The new schedule continues the slot
+        timeline of the old one. A paused schedule is replaced right away and the new schedule
+        starts running.
+
         :param schedule: The schedule to run, can be a string or a Schedule object
         :type schedule: Union[str, Schedule]
+        :param switch: When to switch from a running schedule, defaults to 'immediate'
+        :type switch: Literal['immediate', 'cycle-end'], optional
         """
-        if self._schedule_running:
-            self.disable_schedule()
+        if switch not in ('immediate', 'cycle-end'):
+            raise ValueError(f'Unknown switch mode: {switch}')
 
         if isinstance(schedule, str):
             if self.network is None:
                 raise ValueError("Network is not set, cannot resolve schedule by name.")
             schedule = self.network.get_schedule(schedule)
-        self._schedule_running = True
-        self._active_schedule = schedule.create_executor()
-        self._schedule_thread = Thread(target=self._scheduler)
-        self._schedule_thread.start()
+        # Fixed slots are calculated from the wire time of the frames
+        baudrate = self.network.baudrate if self.network is not None else 0
+        if not baudrate and self.transport is not None:
+            baudrate = getattr(self.transport, 'baudrate', 0)
+        executor = schedule.create_executor(baudrate)
+
+        with self._schedule_condition:
+            if self._schedule_running and not self._schedule_paused:
+                self._pending_schedule = executor
+                self._pending_at_cycle_end = switch == 'cycle-end'
+            else:
+                self._active_schedule = executor
+                self._pending_schedule = None
+                self._schedule_paused = False
+                self._schedule_running = True
+            self._schedule_condition.notify_all()
+
+        if self._schedule_thread is None:
+            self._schedule_thread = Thread(target=self._scheduler, name='line-schedule', daemon=True)
+            self._schedule_thread.start()
 
     def disable_schedule(self):
         """
-        Stops the schedule and waits for the schedule thread to finish.
+        Stops the schedule and waits for the entry in progress to be queued. The scheduler thread
+        is kept for the next schedule.
         """
-        if self._schedule_running and self._schedule_thread is not None:
+        with self._schedule_condition:
+            if not self._schedule_running:
+                return
             self._schedule_running = False
-            self._schedule_thread.join()
+            self._schedule_paused = False
+            self._pending_schedule = None
+            self._schedule_condition.notify_all()
+            self._wait_schedule_idle()
+
+    def pause_schedule(self):
+        """
+        Pauses the active schedule after the entry in progress. The schedule keeps its position and
+        cycle counters, :meth:`resume_schedule` continues where it was paused. Does nothing when no
+        schedule is running.
+        """
+        with self._schedule_condition:
+            if not self._schedule_running:
+                return
+            self._schedule_paused = True
+            self._wait_schedule_idle()
+
+    def resume_schedule(self):
+        """
+        Resumes a paused schedule, its slot timeline starts again at the current time.
+        """
+        with self._schedule_condition:
+            if not self._schedule_paused:
+                return
+            self._schedule_paused = False
+            if self._active_schedule is not None:
+                self._active_schedule.restart_timeline()
+            self._schedule_condition.notify_all()
+
+    def get_schedule_statistics(self) -> ScheduleStatistics | None:
+        """
+        Returns the slot timing of the active schedule, or of the last one when the schedule was
+        disabled, compared to the planned timeline.
+
+        :return: Schedule statistics, None if no schedule was enabled
+        :rtype: ScheduleStatistics | None
+        """
+        if self._active_schedule is None:
+            return None
+        return self._active_schedule.get_statistics()
+
+    def _toggle_schedule_entry(self, entry: Union[int, ScheduleEntry], enabled: bool):
+        with self._schedule_condition:
+            if not self._schedule_running:
+                raise ValueError("No schedule is enabled.")
+            # A pending switch refers to the schedule that is about to become active
+            executor = self._pending_schedule or self._active_schedule
+            if enabled:
+                executor.enable_entry(entry)
+            else:
+                executor.disable_entry(entry)
+
+    def enable_schedule_entry(self, entry: Union[int, ScheduleEntry]):
+        """
+        Enables an entry of the active schedule that was disabled before, the schedule keeps running.
+        While a switch to another schedule is pending the entry refers to the new schedule.
+
+        :param entry: Index of the entry in the schedule or the entry itself
+        :type entry: Union[int, ScheduleEntry]
+        :raises ValueError: If no schedule is enabled
+        :raises LookupError: If the entry isn't part of the schedule
+        """
+        self._toggle_schedule_entry(entry, True)
+
+    def disable_schedule_entry(self, entry: Union[int, ScheduleEntry]):
+        """
+        Disables an entry of the active schedule without restarting it, e.g.: to stop polling a
+        node that is absent. Whether the entry's slot stays empty or is skipped depends on the
+        schedule's reserve_slots. While a switch to another schedule is pending the entry refers to
+        the new schedule.
+
+        :param entry: Index of the entry in the schedule or the entry itself
+        :type entry: Union[int, ScheduleEntry]
+        :raises ValueError: If no schedule is enabled
+        :raises LookupError: If the entry isn't part of the schedule
+        """
+        self._toggle_schedule_entry(entry, False)
+
+    def reload_network(self, network: Network) -> NetworkDiff:
+        """
+        Replaces the network definition of a running master without stopping it. The change is
+        applied between two frames: buffers of unchanged requests and the status of unchanged
+        nodes are kept, changed ones start from their initial state. The active schedule is only
+        restarted when it was changed, and stopped when it was removed.
+
+        Listener filters and signal subscriptions refer to request codes and signal names, they're
+        moved to the new definition. Subscriptions to signals that no longer exist are dropped.
+
+        :param network: New network definition
+        :type network: Network
+        :return: Differences that were applied
+        :rtype: NetworkDiff
+        """
+        if self.network is None:
+            diff = diff_networks(Network(), network)
+        else:
+            diff = diff_networks(self.network, network)
+
+        active = self._active_schedule.schedule if self._schedule_running else None
+        restart = active is not None and active.name in diff.changed_schedules
+        if active is not None and (restart or active.name in diff.removed_schedules):
+            self.disable_schedule()
+
+        with self._frame_lock:
+            self.network = network
+            if self._running:
+                self._apply_network(diff)
+
+        if restart:
+            self.enable_schedule(active.name)
+        return diff
+
+    def _apply_network(self, diff: NetworkDiff):
+        for request in diff.removed_requests:
+            self._user_requests.pop(request, None)
+        for request in self.network.requests:
+            if request.id in diff.added_requests or request.id in diff.changed_requests:
+                self._user_requests[request.id] = UserRequest(request, self.decode_in_place)
+            elif request.id in self._user_requests:
+                # Same layout, the buffered values are kept
+                self._user_requests[request.id].request = request
+
+        for address in diff.changed_nodes:
+            if address not in self._node_status:
+                continue
+            try:
+                name = self.network.get_node_by_address(address).name
+            except LookupError:
+                name = "Unset"
+            self._node_status[address] = NodeStatus(name, None, None, None, None)
+
+        for (request, subscriptions) in list(self._signal_subscriptions.items()):
+            kept = []
+            for subscription in subscriptions:
+                try:
+                    subscription.ref = self.network.get_signal(request, subscription.ref.signal.name)
+                    kept.append(subscription)
+                except (LookupError, KeyError):
+                    logger.warning("Dropping subscription of %s, signal was removed", subscription.ref.signal.name)
+                    if self.dispatcher is not None:
+                        self.dispatcher.release(subscription)
+            self._signal_subscriptions[request] = kept
+
+        self._build_request_routes()
+
+    def _resolve_node(self, node: Union[int, str]) -> int:
+        if isinstance(node, str):
+            if self.network is None:
+                raise ValueError("Network is not set, cannot resolve node by name.")
+            node = self.network.get_node(node).address
+        return node
+
+    def _resolve_request(self, request: Union[int, str]) -> int:
+        if isinstance(request, str):
+            if self.network is None:
+                raise ValueError("Network is not set, cannot resolve request by name.")
+            request = self.network.get_request(request).id
+        return request
 
     # Node control
     def get_node_status(self, node: Union[int, str]) -> NodeStatus:
@@ -471,14 +1109,12 @@ class LineMaster():
         :return: Node status
         :rtype: NodeStatus
         """
-        if isinstance(node, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve node by name.")
-            node = self.network.get_node(node).address
+        node = self._resolve_node(node)
         return self._node_status[node]
 
     # Frame insertion
-    def request(self, request: Union[int, str], wait: bool = False, timeout: float | None = None) -> List[int] | None:
+    def request(self, request: Union[int, str], wait: bool = False, timeout: float | None = None,
+                priority: TransmitPriority = TransmitPriority.USER, deadline: float | None = None) -> List[int] | Future:
         """
         Sends a request to the bus and waits for a response. The request can be either an integer
         representing the request code or a string representing the request name. If the request is
@@ -490,16 +1126,18 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to None
         :type timeout: float | None, optional
+        :param priority: Priority class of the frame, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
         :raises event.exception: If an error occurs during the request
-        :return: The response from the bus or None if not waiting
-        :rtype: List[int] | None
+        :return: The response from the bus or a Future of the response if not waiting
+        :rtype: List[int] | Future
         """
-        if isinstance(request, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve request by name.")
-            request = self.network.get_request(request).id
+        request = self._resolve_request(request)
 
-        event = self._schedule_frame(RxRequest(request))
+        event = self._schedule_frame(RxRequest(request), priority, deadline)
 
         if wait:
             event.event.wait(timeout)
@@ -507,10 +1145,60 @@ class LineMaster():
                 raise event.exception
             return event.response
 
-        return None
+        return self._future(event, lambda event: event.response)
+
+    def _buffered_signal(self, request: Union[int, str], name: str,
+                         max_age: float | None) -> Tuple[int, SignalValue | None]:
+        ref = self.network.get_signal(request, name) if self.network is not None else None
+        if ref is None or ref.request.id not in self._user_requests:
+            raise LookupError(f'No such request: {request}')
+        user_request = self._user_requests[ref.request.id]
+
+        last_update = user_request.last_update
+        if last_update is not None and (max_age is None or time.monotonic() - last_update <= max_age):
+            return (ref.request.id, self._detached(user_request.signals[name]))
+        return (ref.request.id, None)
+
+    def get_signal(self, request: Union[int, str], name: str, max_age: float | None = 0.2,
+                   timeout: float | None = 1) -> SignalValue:
+        """
+        Returns the last received value of a signal. When the value is older than max_age the
+        request is polled and the fresh value is returned. Concurrent readers of a stale value share
+        the same poll, so the bus sees at most one transaction for them.
+
+        Example:
+        >>> master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0.5).phy
+        12.5
+
+        :param request: Request code or name
+        :type request: Union[int, str]
+        :param name: Signal name
+        :type name: str
+        :param max_age: Maximum age of the buffered value in seconds, defaults to 0.2, None accepts
+                        any value that was received
+        :type max_age: float | None, optional
+        :param timeout: Time to wait for the poll, defaults to 1
+        :type timeout: float | None, optional
+        :raises LineTransportTimeout: If the poll wasn't processed in time
+        :raises event.exception: If an error occurs during the poll
+        :return: Signal value
+        :rtype: SignalValue
+        """
+        (request, value) = self._buffered_signal(request, name, max_age)
+        if value is not None:
+            return value
+
+        # Always coalesced, readers of the same stale request wait for the same poll
+        event = self._schedule_frame(RxRequest(request), coalesce=True)
+        if not event.event.wait(timeout):
+            raise LineTransportTimeout("Request wasn't processed in time.")
+        if event.exception:
+            raise event.exception
+        return self._detached(event.signals[name])
 
     def send_request(self, request: int, data: List[int], checksum: int | None = None,
-                     wait: bool = False, timeout: float | None = None) -> None:
+                     wait: bool = False, timeout: float | None = None,
+                     priority: TransmitPriority = TransmitPriority.USER, deadline: float | None = None) -> Future | None:
         """
         Sends a request to the bus with the specified data and checksum. The request is scheduled
         and can be waited for a response. If wait is True, the method will block until the response
@@ -528,13 +1216,49 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to None
         :type timeout: float, optional
+        :param priority: Priority class of the frame, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Future that completes once the frame is transmitted, None when waiting
+        :rtype: Future | None
         """
-        event = self._schedule_frame(TxRequest(request, data, checksum))
+        event = self._schedule_frame(TxRequest(request, data, checksum), priority, deadline)
         if wait:
             event.event.wait(timeout)
+            return None
+        return self._future(event, lambda event: None)
+
+    def request_many(self, requests: List[Union[int, str]], timeout: float | None = 1,
+                     priority: TransmitPriority = TransmitPriority.USER, deadline: float | None = None) -> List[RequestResult]:
+        """
+        Sends multiple requests back-to-back and waits for all of them. Errors don't stop the
+        batch, they're returned in the result of the given request.
+
+        Example:
+        >>> results = master.request_many(['WheelSpeed', 0x1001])
+        >>> [result.response for result in results if result.exception is None]
+
+        :param requests: Request codes or names
+        :type requests: List[Union[int, str]]
+        :param timeout: Time to wait for each request, defaults to 1
+        :type timeout: float | None, optional
+        :param priority: Priority class of the frames, defaults to USER
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frames have to be transmitted, otherwise they're dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Result of each request in the same order as the requests
+        :rtype: List[RequestResult]
+        """
+        frames = [RxRequest(self._resolve_request(request)) for request in requests]
+        events = self._schedule_frames(frames, priority, deadline)
+        return self._collect(events, timeout, lambda event: self._detached(event.signals))
 
     # Broadcast commands
-    def wakeup(self, wait: bool = False, timeout: float | None = None) -> None:
+    def wakeup(self, wait: bool = False, timeout: float | None = None,
+               priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> Future | None:
         """
         Sends a wakeup request to all nodes on the bus. This is used to wake up the nodes from sleep mode.
 
@@ -542,12 +1266,22 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to None
         :type timeout: float | None, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Future that completes once the frame is transmitted, None when waiting
+        :rtype: Future | None
         """
-        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_WAKEUP, [], None))
+        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_WAKEUP, [], None), priority, deadline)
         if wait:
-           event.event.wait(timeout)
+            event.event.wait(timeout)
+            return None
+        return self._future(event, lambda event: None)
 
-    def idle(self, wait: bool = False, timeout: float | None = None) -> None:
+    def idle(self, wait: bool = False, timeout: float | None = None,
+             priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> Future | None:
         """
         Sends an idle request to all nodes on the bus. This is used to put the nodes into idle mode.
 
@@ -555,12 +1289,22 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to None
         :type timeout: float | None, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Future that completes once the frame is transmitted, None when waiting
+        :rtype: Future | None
         """
-        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_IDLE, [], None))
+        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_IDLE, [], None), priority, deadline)
         if wait:
-           event.event.wait(timeout)
+            event.event.wait(timeout)
+            return None
+        return self._future(event, lambda event: None)
 
-    def shutdown(self, wait: bool = False, timeout: float | None = None) -> None:
+    def shutdown(self, wait: bool = False, timeout: float | None = None,
+                 priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> Future | None:
         """
         Sends a shutdown request to all nodes on the bus. This is used to shut down the nodes.
 
@@ -568,13 +1312,23 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to None
         :type timeout: float | None, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Future that completes once the frame is transmitted, None when waiting
+        :rtype: Future | None
         """
-        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_SHUTDOWN, [], None))
+        event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_SHUTDOWN, [], None), priority, deadline)
         if wait:
-           event.event.wait(timeout)
+            event.event.wait(timeout)
+            return None
+        return self._future(event, lambda event: None)
 
     # Diagnostic unicast commands
-    def conditional_change_address(self, serial: int, new_address: int, wait=True, timeout=1):
+    def conditional_change_address(self, serial: int, new_address: int, wait=True, timeout=1,
+                                   priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> Future | None:
         """
         Sends a conditional change address request to a node with the specified serial number.
 
@@ -586,13 +1340,64 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to 1
         :type timeout: int, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Future that completes once the frame is transmitted, None when waiting
+        :rtype: Future | None
         """
         event = self._schedule_frame(TxRequest(LINE_DIAG_REQUEST_COND_CHANGE_ADDRESS,
-                                             list(serial.to_bytes(4, 'little')) + [new_address], None))
+                                             list(serial.to_bytes(4, 'little')) + [new_address], None), priority, deadline)
         if wait:
-           event.event.wait(timeout)
+            event.event.wait(timeout)
+            return None
+        return self._future(event, lambda event: None)
+
+    def get_node_statuses(self, nodes: List[Union[int, str]],
+                          properties: List[NodeStatusProperty] | None = None,
+                          timeout: float | None = 1,
+                          priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> Dict[Union[int, str], Dict[NodeStatusProperty, RequestResult]]:
+        """
+        Requests the given status properties of multiple nodes in a single batch, the frames are
+        transmitted back-to-back.
 
-    def get_operation_status(self, node: Union[int, str], wait=True, timeout: float=1) -> OperationStatus | None:
+        Example:
+        >>> statuses = master.get_node_statuses(['RotorSensor', 0x02], [NodeStatusProperty.OP_STATUS])
+        >>> statuses['RotorSensor'][NodeStatusProperty.OP_STATUS].value
+        'Ok'
+
+        :param nodes: Node addresses or names
+        :type nodes: List[Union[int, str]]
+        :param properties: Properties to request, defaults to None meaning all properties
+        :type properties: List[NodeStatusProperty] | None, optional
+        :param timeout: Time to wait for each request, defaults to 1
+        :type timeout: float | None, optional
+        :param priority: Priority class of the frames, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frames have to be transmitted, otherwise they're dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
+        :return: Result of each property request by node, the value is the property of the node
+        :rtype: Dict[Union[int, str], Dict[NodeStatusProperty, RequestResult]]
+        """
+        if properties is None:
+            properties = list(NodeStatusProperty)
+        targets = [(node, self._resolve_node(node), prop) for node in nodes for prop in properties]
+        events = self._schedule_frames([RxRequest(_NODE_STATUS_REQUESTS[prop] | address)
+                                        for (_, address, prop) in targets], priority, deadline)
+        results = self._collect(events, timeout)
+
+        statuses = {}
+        for ((node, address, prop), result) in zip(targets, results):
+            if result.exception is None:
+                result.value = getattr(self._node_status[address], prop.value)
+            statuses.setdefault(node, {})[prop] = result
+        return statuses
+
+    def get_operation_status(self, node: Union[int, str], wait=True, timeout: float=1,
+                             priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> OperationStatus | Future:
         """
         Returns the operation status of a node, the node parameter may be either the node address
         or the node name.
@@ -606,23 +1411,26 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to 1sec
         :type timeout: float, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
         :raises event.exception: If an error occurs during the request
-        :return: Node's operation status
-        :rtype: OperationStatus
+        :return: Node's operation status, or a Future of it if not waiting
+        :rtype: OperationStatus | Future
         """
-        if isinstance(node, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve node by name.")
-            node = self.network.get_node(node).address
-        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_OP_STATUS | node))
+        node = self._resolve_node(node)
+        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_OP_STATUS | node), priority, deadline)
         if wait:
             event.event.wait(timeout)
             if event.exception:
                 raise event.exception
             return self._node_status[node].op_status
-        return None
+        return self._future(event, lambda event: self._node_status[node].op_status)
 
-    def get_power_status(self, node: Union[int, str], wait=True, timeout=1) -> PowerStatus | None:
+    def get_power_status(self, node: Union[int, str], wait=True, timeout=1,
+                         priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> PowerStatus | Future:
         """
         Returns the power status of a node, the node parameter may be either the node address
         or the node name.
@@ -636,23 +1444,26 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to 1
         :type timeout: int, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
         :raises event.exception: If an error occurs during the request
-        :return: Node's power status
-        :rtype: PowerStatus
+        :return: Node's power status, or a Future of it if not waiting
+        :rtype: PowerStatus | Future
         """
-        if isinstance(node, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve node by name.")
-            node = self.network.get_node(node).address
-        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_POWER_STATUS | node))
+        node = self._resolve_node(node)
+        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_POWER_STATUS | node), priority, deadline)
         if wait:
             event.event.wait(timeout)
             if event.exception:
                 raise event.exception
             return self._node_status[node].power_status
-        return None
+        return self._future(event, lambda event: self._node_status[node].power_status)
 
-    def get_serial_number(self, node: Union[int, str], wait=True, timeout=1) -> int | None:
+    def get_serial_number(self, node: Union[int, str], wait=True, timeout=1,
+                          priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> int | Future:
         """
         Returns the serial number of a node, the node parameter may be either the node address or
         the node name.
@@ -666,23 +1477,26 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to 1
         :type timeout: int, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
         :raises event.exception: If an error occurs during the request
-        :return: Serial number
-        :rtype: int
+        :return: Serial number, or a Future of it if not waiting
+        :rtype: int | Future
         """
-        if isinstance(node, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve node by name.")
-            node = self.network.get_node(node).address
-        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_SERIAL_NUMBER | node))
+        node = self._resolve_node(node)
+        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_SERIAL_NUMBER | node), priority, deadline)
         if wait:
             event.event.wait(timeout)
             if event.exception:
                 raise event.exception
             return self._node_status[node].serial_number
-        return None
+        return self._future(event, lambda event: self._node_status[node].serial_number)
 
-    def get_software_version(self, node: Union[int, str], wait=True, timeout=1) -> str | None:
+    def get_software_version(self, node: Union[int, str], wait=True, timeout=1,
+                             priority: TransmitPriority = TransmitPriority.DIAGNOSTIC, deadline: float | None = None) -> str | Future:
         """
         Returns the software version of a node, the node parameter may be either the node address
         or the node name.
@@ -693,18 +1507,20 @@ class LineMaster():
         :type wait: bool, optional
         :param timeout: Time to wait for a response, defaults to 1
         :type timeout: int, optional
+        :param priority: Priority class of the frame, defaults to DIAGNOSTIC
+        :type priority: TransmitPriority, optional
+        :param deadline: Seconds within which the frame has to be transmitted, otherwise it's dropped
+                         with LineRequestExpired, defaults to None
+        :type deadline: float | None, optional
         :raises event.exception: If an error occurs during the request
-        :return: Software version
-        :rtype: str
+        :return: Software version, or a Future of it if not waiting
+        :rtype: str | Future
         """
-        if isinstance(node, str):
-            if self.network is None:
-                raise ValueError("Network is not set, cannot resolve node by name.")
-            node = self.network.get_node(node).address
-        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_SW_NUMBER | node))
+        node = self._resolve_node(node)
+        event = self._schedule_frame(RxRequest(LINE_DIAG_REQUEST_SW_NUMBER | node), priority, deadline)
         if wait:
             event.event.wait(timeout)
             if event.exception:
                 raise event.exception
             return self._node_status[node].software_version
-        return None
+        return self._future(event, lambda event: self._node_status[node].software_version)
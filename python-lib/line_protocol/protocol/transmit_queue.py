@@ -0,0 +1,179 @@
+# System imports
+from typing import Dict, Literal, TYPE_CHECKING
+from threading import Condition
+from collections import deque
+from queue import Empty, Full
+from enum import IntEnum
+from dataclasses import dataclass
+
+# Local imports
+from line_protocol.protocol.transport import LineTransportError
+
+if TYPE_CHECKING:
+    from line_protocol.protocol.master import TransmitEvent
+
+class TransmitPriority(IntEnum):
+    """
+    Priority classes of the transmit queue, frames of a lower value are transmitted first. Within
+    the same class the frames are transmitted in order.
+    """
+    DIAGNOSTIC = 0
+    USER = 1
+    SCHEDULE = 2
+
+class LineRequestExpired(LineTransportError):
+    """Raised when the deadline of a frame passed before it could be transmitted"""
+    pass
+
+class LineQueueOverflow(LineTransportError):
+    """Raised when a frame is rejected or evicted because the transmit queue is full"""
+    pass
+
+OverflowPolicy = Literal['block', 'drop-oldest', 'reject']
+
+@dataclass
+class QueueStatistics():
+    """
+    Statistics of the transmit queue, depth contains the number of pending frames in each class.
+    Dropped frames were rejected or evicted due to overflow, coalesced requests were attached to
+    an already pending request.
+    """
+    depth: Dict[TransmitPriority, int]
+    expired: int
+    dropped: int = 0
+    coalesced: int = 0
+
+class TransmitQueue():
+    """
+    Transmit queue with a FIFO for each priority class.
+
+    The queue is unbounded when maxsize is zero. Otherwise the overflow policy decides what happens
+    when a frame is added to a full queue: 'block' waits for space, 'drop-oldest' evicts the oldest
+    frame of the lowest priority class and 'reject' raises an exception.
+
+    :param maxsize: Maximum number of queued frames, defaults to 0
+    :type maxsize: int, optional
+    :param overflow: Overflow policy, defaults to 'block'
+    :type overflow: OverflowPolicy, optional
+    """
+
+    def __init__(self, maxsize: int = 0, overflow: OverflowPolicy = 'block') -> None:
+        if overflow not in ('block', 'drop-oldest', 'reject'):
+            raise ValueError(f'Unknown overflow policy: {overflow}')
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._queues = {priority: deque() for priority in sorted(TransmitPriority)}
+        self._condition = Condition()
+        self._size = 0
+
+    def _full(self) -> bool:
+        return self.maxsize > 0 and self._size >= self.maxsize
+
+    def __len__(self) -> int:
+        return self._size
+
+    def depth(self) -> Dict[TransmitPriority, int]:
+        """
+        Returns the number of pending frames in each priority class.
+
+        :return: Queue depth by priority
+        :rtype: Dict[TransmitPriority, int]
+        """
+        with self._condition:
+            return {priority: len(queue) for (priority, queue) in self._queues.items()}
+
+    def put(self, event: 'TransmitEvent', timeout: float | None = None,
+            block: bool = True) -> 'TransmitEvent | None':
+        """
+        Adds the event to the end of its priority class.
+
+        :param event: Event to transmit
+        :type event: TransmitEvent
+        :param timeout: Time to wait for space when the policy is 'block', defaults to None
+        :type timeout: float | None, optional
+        :param block: Wait for space when the policy is 'block', defaults to True
+        :type block: bool, optional
+        :raises LineQueueOverflow: If the queue is full and the event can't be added
+        :raises Full: If the queue is full, the policy is 'block' and block is False
+        :return: The event that was evicted to make space for the new one
+        :rtype: TransmitEvent | None
+        """
+        evicted = None
+        with self._condition:
+            if self._full():
+                if self.overflow == 'reject':
+                    raise LineQueueOverflow('Transmit queue is full.')
+                elif self.overflow == 'block':
+                    if not block:
+                        raise Full()
+                    if not self._condition.wait_for(lambda: not self._full(), timeout):
+                        raise LineQueueOverflow('Transmit queue is full.')
+                else:
+                    for priority in reversed(self._queues):
+                        if priority < event.priority:
+                            # Everything queued is more important than the new frame
+                            return event
+                        if self._queues[priority]:
+                            evicted = self._queues[priority].popleft()
+                            self._size -= 1
+                            break
+            self._queues[event.priority].append(event)
+            self._size += 1
+            self._condition.notify_all()
+        return evicted
+
+    def wait_for_space(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the queue has space for another frame, used to wait for space without holding
+        other locks.
+
+        :param timeout: Time to wait, defaults to None
+        :type timeout: float | None, optional
+        :return: False if the queue was still full after the timeout
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._full(), timeout)
+
+    def promote(self, event: 'TransmitEvent', priority: TransmitPriority) -> bool:
+        """
+        Moves a queued event to the end of a more important priority class, used when a caller of
+        a higher class attaches to a pending frame.
+
+        :param event: Queued event
+        :type event: TransmitEvent
+        :param priority: New priority class
+        :type priority: TransmitPriority
+        :return: False if the event isn't queued anymore, e.g.: it's being transmitted
+        :rtype: bool
+        """
+        with self._condition:
+            if priority >= event.priority:
+                return True
+            try:
+                self._queues[event.priority].remove(event)
+            except ValueError:
+                return False
+            event.priority = priority
+            self._queues[priority].append(event)
+            return True
+
+    def get(self, timeout: float | None = None) -> 'TransmitEvent':
+        """
+        Removes and returns the oldest event of the highest priority class.
+
+        :param timeout: Time to wait for an event, defaults to None
+        :type timeout: float | None, optional
+        :raises Empty: If no event was queued in time
+        :return: Next event to transmit
+        :rtype: TransmitEvent
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._size > 0, timeout):
+                raise Empty()
+            for queue in self._queues.values():
+                if queue:
+                    self._size -= 1
+                    self._condition.notify_all()
+                    return queue.popleft()
+        raise Empty()
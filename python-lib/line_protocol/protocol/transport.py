@@ -7,7 +7,7 @@ import time
 import serial
 
 # Local imports
-from line_protocol.protocol.util import create_frame, create_header, data_checksum
+from line_protocol.protocol.util import create_frame, create_header, data_checksum, frame_time
 from line_protocol.protocol.constants import *
 
 logger = logging.getLogger(__name__)
@@ -59,7 +59,124 @@ class LineTransportListener():
         """Called when an error occurs on the bus (invalid request, bad checksum, timeout)"""
         raise NotImplementedError()
 
-class LineSerialTransport():
+class LineResponseParser():
+    """
+    Incremental parser for the bytes received after a request header was transmitted.
+
+    On one-wire buses the header is echoed back first, the echo is verified before the response
+    is processed. The parser accepts chunks of arbitrary length, :attr:`remaining` tells how many
+    bytes the current stage still needs, so reads never consume past the frame.
+
+    :param echo: Header that is expected to be echoed back, None if there's no echo
+    :type echo: bytes | None
+    """
+
+    def __init__(self, echo: bytes | None = None) -> None:
+        self.echo = bytes(echo) if echo else b''
+        self.state = 'echo' if self.echo else 'size'
+        self.size: int | None = None
+        self.data: List[int] = []
+        self.checksum: int | None = None
+        self._echo_index = 0
+
+    @property
+    def done(self) -> bool:
+        """True when the frame is complete and the checksum was verified"""
+        return self.state == 'done'
+
+    @property
+    def remaining(self) -> int:
+        """Number of bytes that are certainly part of the current stage but haven't been received yet"""
+        if self.state == 'echo':
+            return len(self.echo) - self._echo_index
+        elif self.state == 'size':
+            return 1
+        elif self.state == 'data':
+            return self.size - len(self.data) + 1
+        elif self.state == 'checksum':
+            return 1
+        return 0
+
+    def feed(self, chunk: bytes) -> int:
+        """
+        Processes the received bytes, bytes past the end of the frame are left unprocessed.
+
+        :param chunk: Received bytes
+        :type chunk: bytes
+        :raises LineTransportRequestError: If the echoed header doesn't match the transmitted one
+        :raises LineTransportDataError: If the checksum of the response is invalid
+        :return: Number of bytes consumed
+        :rtype: int
+        """
+        index = 0
+        length = len(chunk)
+        while index < length and self.state != 'done':
+            if self.state == 'echo':
+                count = min(len(self.echo) - self._echo_index, length - index)
+                if chunk[index:index + count] != self.echo[self._echo_index:self._echo_index + count]:
+                    raise LineTransportRequestError('Invalid self response.')
+                self._echo_index += count
+                index += count
+                if self._echo_index == len(self.echo):
+                    self.state = 'size'
+            elif self.state == 'size':
+                self.size = chunk[index]
+                index += 1
+                self.state = 'data' if self.size > 0 else 'checksum'
+            elif self.state == 'data':
+                count = min(self.size - len(self.data), length - index)
+                self.data.extend(chunk[index:index + count])
+                index += count
+                if len(self.data) == self.size:
+                    self.state = 'checksum'
+            elif self.state == 'checksum':
+                self.checksum = chunk[index]
+                index += 1
+                if data_checksum(self.data) != self.checksum:
+                    #logger.error('RX Checksum error!')
+                    raise LineTransportDataError('Invalid checksum.')
+                self.state = 'done'
+        return index
+
+class LineTransport():
+    """
+    Interface for the byte level transports used by the master. A transport transmits request
+    headers and frames, and returns the responses of the peripherals.
+    """
+
+    def __enter__(self) -> 'LineTransport':
+        return self
+
+    def request_data(self, request: int) -> List[int]:
+        """
+        Sends the request header and waits for a peripheral to respond.
+
+        :param request: Request code
+        :type request: int
+        :raises LineTransportTimeout: If no response was received
+        :raises LineTransportDataError: If the response is invalid
+        :return: Data section of the response
+        :rtype: List[int]
+        """
+        raise NotImplementedError()
+
+    def send_data(self, request: int, data: List[int], checksum: int | None = None):
+        """
+        Sends a complete frame, the checksum is calculated when not provided.
+
+        :param request: Request code
+        :type request: int
+        :param data: Data section of the frame
+        :type data: List[int]
+        :param checksum: Checksum, defaults to None
+        :type checksum: int | None, optional
+        """
+        raise NotImplementedError()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+class LineSerialTransport(LineTransport):
 
     def __init__(self, port: str, baudrate: int = 19200, one_wire: bool = True) -> None:
         self.port = port
@@ -72,65 +189,56 @@ class LineSerialTransport():
         self._serial.open()
         return self
 
+    def _read(self, size: int, timeout: float) -> bytes:
+        # Blocks in the serial driver until the bytes arrive or the timeout passes. Assigning the
+        # timeout reconfigures the port, so it's only done when the stage's timeout differs
+        if self._serial.timeout != timeout:
+            self._serial.timeout = timeout
+        return self._serial.read(size)
+
+    @staticmethod
+    def _stage_timeout(state: str) -> float:
+        if state == 'echo':
+            return LINE_ECHO_TIMEOUT
+        elif state == 'size':
+            return LINE_REQUEST_TIMEOUT
+        return LINE_DATA_TIMEOUT
+
+    def _receive(self, parser: 'LineResponseParser') -> None:
+        # Every read asks for exactly the number of bytes the parser still needs, so a frame is
+        # completed in a handful of reads instead of one syscall per byte
+        deadline = time.monotonic() + self._stage_timeout(parser.state)
+        while not parser.done:
+            state = parser.state
+            data = self._read(parser.remaining, self._stage_timeout(parser.state))
+            if len(data) > 0:
+                parser.feed(data)
+                if parser.state != state or state == 'data':
+                    deadline = time.monotonic() + self._stage_timeout(parser.state)
+                continue
+
+            if time.monotonic() < deadline:
+                continue
+            elif parser.state == 'echo':
+                #logger.error('RX No self response received!')
+                raise LineTransportTimeout("Self response timeout.")
+            elif parser.state == 'checksum':
+                #logger.error('RX Timeout! No checksum received.')
+                raise LineTransportTimeout('Missing checksum.')
+            else:
+                #logger.error('RX Timeout!')
+                raise LineTransportTimeout()
+
     def request_data(self, request: int) -> List[int]:
         header = create_header(request)
         self._serial.write(header)
         #logger.debug("TX REQ 0x%04X", request)
 
-        if self.one_wire:
-            received = 0
-            start = time.time()
-            # TODO: timeout to prevent infinite loop
-            while received < len(header):
-                data = self._serial.read(1)
-                if len(data) == 1:
-                    received += 1
-                if time.time() - start > 1.0:
-                    #logger.error('RX No self response received!')
-                    raise LineTransportTimeout("Self response timeout.")
-
-        start = time.time()
-        size = None
-        while time.time() - start < LINE_REQUEST_TIMEOUT:
-            a = self._serial.read(1)
-            if len(a) == 1:
-                size = a[0]
-                break
-
-        if size is None:
-            #logger.error('RX Timeout!')
-            raise LineTransportTimeout()
-
-        data = []
-        while time.time() - start < LINE_DATA_TIMEOUT and len(data) < size:
-            a = self._serial.read(1)
-            if len(a) == 1:
-                data.append(a[0])
-                start = time.time()
-
-        if len(data) != size:
-            #logger.error('RX Timeout! LEN=%d DATA=%s', size, data)
-            raise LineTransportTimeout()
-
-        checksum = None
-        start = time.time()
-        while time.time() - start < LINE_DATA_TIMEOUT:
-            a = self._serial.read(1)
-            if len(a) == 1:
-                checksum = a[0]
-                break
-
-        if checksum is None:
-            #logger.debug("RX LEN=%d DATA=%s", size, data)
-            #logger.error('RX Timeout! No checksum received.')
-            raise LineTransportTimeout('Missing checksum.')
-
-        #logger.debug("RX LEN=%d DATA=%s CHK=%02X", size, data, checksum)
-        if data_checksum(data) != checksum:
-            #logger.error('RX Checksum error!')
-            raise LineTransportDataError('Invalid checksum.')
-
-        return data
+        parser = LineResponseParser(header if self.one_wire else None)
+        self._receive(parser)
+
+        #logger.debug("RX LEN=%d DATA=%s CHK=%02X", parser.size, parser.data, parser.checksum)
+        return parser.data
 
     def send_data(self, request: int, data: List[int], checksum: int | None = None):
         frame = create_frame(request, data, checksum)
@@ -139,10 +247,16 @@ class LineSerialTransport():
         #logger.debug("TX REQ 0x%04X LEN=%d DATA=%s CHK=%s",
         #             request, len(data), data, 'ok' if checksum is None else hex(checksum))
 
-        time.sleep(0.1)
-
+        # Instead of a fixed delay only wait until the frame is on the wire
+        deadline = time.monotonic() + frame_time(len(frame), self.baudrate)
         if self.one_wire:
-            self._serial.read(len(frame))
+            # The echo is complete once the frame is on the wire
+            deadline += LINE_DATA_TIMEOUT
+            remaining = len(frame)
+            while remaining > 0 and time.monotonic() < deadline:
+                remaining -= len(self._read(remaining, LINE_DATA_TIMEOUT))
+        else:
+            time.sleep(max(deadline - time.monotonic(), 0))
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._serial.close()
@@ -83,6 +83,23 @@ def create_frame(request: int, data: List[int], checksum: int | None = None) ->
                       len(data)] + data +
                       [checksum])
 
+def frame_time(length: int, baudrate: int) -> float:
+    """
+    Calculates the time it takes to transmit the given number of bytes on the bus.
+
+    Example:
+    >>> frame_time(8, 19200)
+    0.004166666666666667
+
+    :param length: Number of bytes
+    :type length: int
+    :param baudrate: Bus baudrate
+    :type baudrate: int
+    :return: Wire time in seconds
+    :rtype: float
+    """
+    return length * LINE_BITS_PER_BYTE / baudrate
+
 OperationStatus = Literal['Init', 'Ok', 'Warn', 'Error', 'Boot', 'BootError']
 
 # Bidirectional mapping for operation status
@@ -5,7 +5,7 @@ import sys
 import time
 
 from line_protocol.protocol.transport import LineSerialTransport, LineTransportTimeout
-from line_protocol.protocol.master import LineMaster, NodeStatus
+from line_protocol.protocol.master import LineMaster, NodeStatus, NodeStatusProperty
 from line_protocol.protocol.constants import *
 from line_protocol.network import Network, load_network, Node
 
@@ -34,7 +34,25 @@ def network_discovery(master: LineMaster, start: int = 1, end: int = 14,
 
     nodes = {}
 
-    for address in range(start, end):
+    # The addresses are polled in batches, the remaining properties are only requested from the
+    # nodes that responded to the operation status request
+    addresses = list(range(start, end))
+    op_statuses = master.get_node_statuses(addresses, [NodeStatusProperty.OP_STATUS])
+    present = []
+    for address in addresses:
+        result = op_statuses[address][NodeStatusProperty.OP_STATUS]
+        if isinstance(result.exception, LineTransportTimeout):
+            continue
+        elif result.exception is not None:
+            raise result.exception
+        present.append(address)
+
+    # TODO: implement
+    # power status is not requested as it is not consistent across all devices
+    details = master.get_node_statuses(present, [NodeStatusProperty.SOFTWARE_VERSION,
+                                                 NodeStatusProperty.SERIAL_NUMBER])
+
+    for address in present:
         if network is not None:
             try:
                 key = network.get_node_by_address(address)
@@ -43,31 +61,17 @@ def network_discovery(master: LineMaster, start: int = 1, end: int = 14,
         else:
             key = address
 
-        try:
-            node_status = NodeStatus(None, None, None, None, None)
-            node_status.op_status = master.get_operation_status(address)
+        node_status = NodeStatus(None, None, None, None, None)
+        node_status.op_status = op_statuses[address][NodeStatusProperty.OP_STATUS].value
 
-            # TODO: implement
-            # disabled as power status is not consistent across all devices
-            # try:
-            #     pwr_status = master.get_power_status(address)
-            #     node.append(pwr_status)
-            # except LineTransportTimeout:
-            #     node.append('N/A')
+        for (prop, result) in details[address].items():
+            if isinstance(result.exception, LineTransportTimeout):
+                continue
+            elif result.exception is not None:
+                raise result.exception
+            setattr(node_status, prop.value, result.value)
 
-            try:
-                node_status.software_version = master.get_software_version(address)
-            except LineTransportTimeout:
-                pass
-
-            try:
-                node_status.serial_number = master.get_serial_number(address)
-            except LineTransportTimeout:
-                pass
-
-            nodes[key] = node_status
-        except LineTransportTimeout:
-            pass
+        nodes[key] = node_status
 
     return nodes
 
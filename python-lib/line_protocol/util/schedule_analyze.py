@@ -3,6 +3,7 @@ from dataclasses import dataclass
 import time
 from typing import Union
 from line_protocol.network import Schedule, Network
+from line_protocol.network.schedule import RequestScheduleEntry
 
 @dataclass
 class ScheduleAnalysisResult:
@@ -12,7 +13,8 @@ class ScheduleAnalysisResult:
     average_delay: float
     count: int
 
-def analyze_schedule(schedule: Union[str, Schedule], cycles: int, network: Network | None = None) -> dict[str | int, ScheduleAnalysisResult]:
+def analyze_schedule(schedule: Union[str, Schedule], cycles: int, network: Network | None = None,
+                     baudrate: int | None = None) -> dict[str | int, ScheduleAnalysisResult]:
     timestamp = 0
     request_data = {}
 
@@ -25,6 +27,9 @@ def analyze_schedule(schedule: Union[str, Schedule], cycles: int, network: Netwo
             nonlocal timestamp
             nonlocal request_data
 
+            # Schedule entries pass request codes, the results are reported by name
+            request = request_names.get(request, request)
+
             #body = network.get_request(request)
 
             if request not in request_data:
@@ -49,25 +54,25 @@ def analyze_schedule(schedule: Union[str, Schedule], cycles: int, network: Netwo
 
             #print("Requesting:", request, "at", timestamp)
 
-        def wakeup(self):
+        def wakeup(self, *args, **kwargs):
             self.request('Wakeup')
 
-        def idle(self):
+        def idle(self, *args, **kwargs):
             self.request('Idle')
 
-        def shutdown(self):
+        def shutdown(self, *args, **kwargs):
             self.request('Shutdown')
 
-        def get_operation_status(self, address):
+        def get_operation_status(self, address, *args, **kwargs):
             self.request(f'GetOperationStatus[{address}]')
 
-        def get_power_status(self, address):
+        def get_power_status(self, address, *args, **kwargs):
             self.request(f'GetPowerStatus[{address}]')
 
-        def get_serial_number(self, address):
+        def get_serial_number(self, address, *args, **kwargs):
             self.request(f'GetSerialNumber[{address}]')
 
-        def get_software_version(self, address):
+        def get_software_version(self, address, *args, **kwargs):
             self.request(f'GetSoftwareVersion[{address}]')
 
     line_master = FakeLineMaster(network)
@@ -78,16 +83,29 @@ def analyze_schedule(schedule: Union[str, Schedule], cycles: int, network: Netwo
         else:
             raise ValueError("Network must be provided when schedule is a string.")
 
-    # Mocking the function to return a fixed value for testing
-    with patch('time.sleep') as sleep_mock:
-        schedule_executor = schedule.create_executor()
+    request_names = {}
+    for entry in getattr(schedule, 'entries', []):
+        entry = getattr(entry, 'entry', entry)
+        if isinstance(entry, RequestScheduleEntry):
+            request_names[entry.request.id] = entry.request.name
+
+    def sleep(duration):
+        nonlocal timestamp
+        timestamp += duration
+
+    # The executors plan their slots on the monotonic clock, replace it with the simulated time
+    with patch('line_protocol.network.schedule.time') as time_mock:
+        time_mock.monotonic.side_effect = lambda: timestamp
+        time_mock.sleep.side_effect = sleep
+        if baudrate is None:
+            baudrate = network.baudrate if network is not None else 0
+        schedule_executor = schedule.create_executor(baudrate)
         for x in range(cycles):
             entry = schedule_executor.next()
             if entry is not None:
                 entry.perform(line_master)
                 #print("Requesting:", entry, "at", timestamp)
             schedule_executor.wait()
-            timestamp += sleep_mock.call_args.args[0]
 
     # Convert request_data to ScheduleAnalysisResult
     result = {}
@@ -31,6 +31,9 @@ setup(
         'dataclasses-json'
     ],
     extras_require={
+        'numpy': [
+            'numpy'
+        ],
         'dev': [
             # Packaging
             "setuptools",
@@ -39,6 +42,7 @@ setup(
             # Testing
             "pytest",
             "pytest-cov",
+            "numpy",
             # Linting
             "pylint",
             "flake8"
@@ -0,0 +1,114 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import time
+from threading import Event
+from unittest.mock import Mock
+import pytest
+
+from line_protocol.network import load_network
+from line_protocol.protocol.dispatch import ListenerDispatcher
+from line_protocol.protocol.master import LineMaster, RequestListener
+from line_protocol.protocol.simulation import SimulatedPeripheral
+
+class TestListenerDispatcher:
+
+    def test_Order_PerListener(self):
+        calls = {'a': [], 'b': []}
+        with ListenerDispatcher(workers=2) as dispatcher:
+            for index in range(50):
+                dispatcher.submit('a', calls['a'].append, index)
+                dispatcher.submit('b', calls['b'].append, index)
+        assert calls['a'] == list(range(50))
+        assert calls['b'] == list(range(50))
+        assert dispatcher.get_statistics().dispatched == 100
+
+    def test_Overflow_Reject(self):
+        dispatcher = ListenerDispatcher(maxsize=2, overflow='reject')
+        calls = []
+        assert dispatcher.submit('a', calls.append, 0)
+        assert dispatcher.submit('a', calls.append, 1)
+        assert not dispatcher.submit('a', calls.append, 2)
+        with dispatcher:
+            pass
+        assert calls == [0, 1]
+        assert dispatcher.get_statistics().dropped == 1
+
+    def test_Overflow_DropOldest(self):
+        dispatcher = ListenerDispatcher(maxsize=2, overflow='drop-oldest')
+        calls = []
+        for index in range(4):
+            dispatcher.submit('a', calls.append, index)
+        with dispatcher:
+            pass
+        assert calls == [2, 3]
+        assert dispatcher.get_statistics().dropped == 2
+
+    def test_Overflow_DefaultDropOldest(self):
+        dispatcher = ListenerDispatcher(maxsize=1)
+        calls = []
+        for index in range(3):
+            # The master thread isn't held up by a full queue
+            assert dispatcher.submit('a', calls.append, index)
+        with dispatcher:
+            pass
+        assert calls == [2]
+
+    def test_ListenerError_Logged(self):
+        calls = []
+        with ListenerDispatcher() as dispatcher:
+            dispatcher.submit('a', Mock(side_effect=RuntimeError()))
+            dispatcher.submit('a', calls.append, 1)
+        assert calls == [1]
+
+    def test_Lag(self):
+        with ListenerDispatcher() as dispatcher:
+            dispatcher.submit('a', time.sleep, 0.05)
+            dispatcher.submit('a', lambda: None)
+        assert dispatcher.get_statistics().max_lag >= 0.04
+
+    def test_Release(self):
+        dispatcher = ListenerDispatcher(workers=2)
+        dispatcher.submit('a', lambda: None)
+        dispatcher.submit('b', lambda: None)
+        dispatcher.release('a')
+        dispatcher.submit('c', lambda: None)
+        assert len(dispatcher._assigned) == 2
+        # The workers keep rotating regardless of how many listeners are assigned
+        assert dispatcher._worker('c') is dispatcher._workers[0]
+        assert dispatcher._worker('a') is dispatcher._workers[1]
+        with dispatcher:
+            pass
+
+class TestLineMaster_Dispatcher:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    def test_SlowListener_DoesNotBlockBus(self, network):
+        release = Event()
+        listener = Mock(RequestListener)
+        listener.on_user_request.side_effect = lambda *args: release.wait(1)
+
+        with LineMaster(network=network, dispatcher=ListenerDispatcher()) as master:
+            master.virtual_bus.add(SimulatedPeripheral(network.get_node('RotorSensor')))
+            master.add_request_listener(listener)
+            start = time.monotonic()
+            for _ in range(3):
+                master.request('WheelSpeed', wait=True, timeout=1)
+            assert time.monotonic() - start < 0.5
+            release.set()
+
+        assert listener.on_user_request.call_count == 3
+        assert master.get_dispatch_statistics().dispatched == 3
+
+    def test_NoDispatcher_Statistics(self, network):
+        assert LineMaster(network=network).get_dispatch_statistics() is None
+
+    def test_Unsubscribe_Released(self, network):
+        with LineMaster(network=network, dispatcher=ListenerDispatcher()) as master:
+            master.virtual_bus.add(SimulatedPeripheral(network.get_node('RotorSensor')))
+            subscription = master.subscribe_signal('WheelSpeed', 'FrontSpeed', Mock())
+            master.request('WheelSpeed', wait=True, timeout=1)
+            master.unsubscribe_signal(subscription)
+            assert id(subscription) not in master.dispatcher._assigned
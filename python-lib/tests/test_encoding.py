@@ -25,6 +25,14 @@ class TestNoneEncoder:
 
         assert encoder.decode(value) == value
 
+    def test_NoneEncode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = NoneEncoder("test")
+
+        assert encoder.encode_array(numpy.array([1, 2, 3])).tolist() == [1, 2, 3]
+        with pytest.raises(ValueError):
+            encoder.encode_array(numpy.array([1.5]))
+
 class TestFormulaEncoder:
 
     @pytest.mark.parametrize("value,expected", [
@@ -56,6 +64,27 @@ class TestFormulaEncoder:
 
         assert encoder.decode(value) == expected
 
+    def test_FormulaEncode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = FormulaEncoder("test", scale=0.5, offset=-10.0, unit="unit")
+        values = [-10.0, 0.0, 10.7, -10.9]
+
+        assert encoder.encode_array(numpy.array(values)).tolist() == [encoder.encode(value) for value in values]
+
+    def test_FormulaDecode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = FormulaEncoder("test", scale=0.5, offset=-10.0, unit="unit")
+
+        assert encoder.decode_array(numpy.array([0, 20, 41])).tolist() == [-10.0, 0.0, 10.5]
+
+    def test_FormulaDecode_Array_IntegerFactors(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = FormulaEncoder("test", scale=2, offset=-40, unit="unit")
+        values = [0, 20, 200, 255]
+
+        assert encoder.decode_array(numpy.array(values, dtype=numpy.uint8)).tolist() == \
+            [encoder.decode(value) for value in values]
+
 class TestMappingEncoder:
 
     @pytest.mark.parametrize("value,expected", [
@@ -95,3 +124,44 @@ class TestMappingEncoder:
 
         with pytest.raises(ValueError):
             encoder.decode(value)
+
+    def test_MappingEncode_DuplicateLabel(self):
+        encoder = MappingEncoder("test", {1: "A", 2: "A"})
+
+        assert encoder.encode("A") == 1
+
+    def test_MappingEncode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = MappingEncoder("test", {1: "A", 2: "B", 3: "C"})
+
+        assert encoder.encode_array(numpy.array(["C", "A", "C", "B"])).tolist() == [3, 1, 3, 2]
+        with pytest.raises(ValueError):
+            encoder.encode_array(numpy.array(["A", "D"]))
+
+    def test_MappingDecode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = MappingEncoder("test", {1: "A", 2: "B", 3: "C"})
+
+        assert encoder.decode_array(numpy.array([3, 1, 3, 2])).tolist() == ["C", "A", "C", "B"]
+        with pytest.raises(ValueError):
+            encoder.decode_array(numpy.array([1, 4]))
+
+class TestTwosComplementEncoder:
+
+    @pytest.mark.parametrize("value,expected", [(0, 0), (127, 127), (128, -128), (255, -1)])
+    def test_TwosComplementDecode_Valid(self, value, expected):
+        encoder = TwosComplementEncoder("test", 8)
+
+        assert encoder.decode(value) == expected
+
+    def test_TwosComplementEncode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = TwosComplementEncoder("test", 8)
+
+        assert encoder.encode_array(numpy.array([0, 127, -128, -1])).tolist() == [0, 127, 128, 255]
+
+    def test_TwosComplementDecode_Array(self):
+        numpy = pytest.importorskip('numpy')
+        encoder = TwosComplementEncoder("test", 8)
+
+        assert encoder.decode_array(numpy.array([0, 127, 128, 255], dtype=numpy.uint8)).tolist() == [0, 127, -128, -1]
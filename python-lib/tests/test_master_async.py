@@ -0,0 +1,116 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import asyncio
+import pytest
+
+from line_protocol.network import load_network
+from line_protocol.protocol.async_master import AsyncLineMaster
+from line_protocol.protocol.master import LineTransportTimeout, NodeStatusProperty
+from line_protocol.protocol.simulation import SimulatedPeripheral
+
+class TestAsyncLineMaster_VirtualBus:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.op_status = 'Ok'
+        peripheral.software_version = '1.0.0'
+        peripheral.serial_number = 0x12345678
+        yield peripheral
+
+    def run(self, network, peripheral, coroutine):
+        async def main():
+            async with AsyncLineMaster(network=network) as master:
+                master.virtual_bus.add(peripheral)
+                return await coroutine(master)
+        return asyncio.run(main())
+
+    def test_Request(self, network, peripheral):
+        async def body(master):
+            return await master.request('WheelSpeed', timeout=1)
+        assert len(self.run(network, peripheral, body)) == 5
+
+    def test_GetSignal(self, network, peripheral):
+        peripheral.requests.WheelSpeed.FrontSpeed = 10
+        async def body(master):
+            return await asyncio.gather(*[master.get_signal('WheelSpeed', 'FrontSpeed') for _ in range(3)])
+        values = self.run(network, peripheral, body)
+        assert [value.phy for value in values] == pytest.approx([10, 10, 10], abs=0.5)
+
+    def test_Request_Timeout(self, network, peripheral):
+        peripheral.connected = False
+        async def body(master):
+            return await master.request('WheelSpeed', timeout=1)
+        with pytest.raises(LineTransportTimeout):
+            self.run(network, peripheral, body)
+
+    def test_Diagnostics(self, network, peripheral):
+        async def body(master):
+            return await asyncio.gather(master.get_operation_status('RotorSensor'),
+                                        master.get_software_version('RotorSensor'),
+                                        master.get_serial_number('RotorSensor'))
+        assert self.run(network, peripheral, body) == ['Ok', '1.0.0', 0x12345678]
+
+    def test_ConcurrentRequests(self, network, peripheral):
+        async def body(master):
+            await master.wakeup(timeout=1)
+            return await asyncio.gather(*[master.request(0x1000, timeout=5) for _ in range(100)])
+        responses = self.run(network, peripheral, body)
+        assert len(responses) == 100
+
+    def test_RequestMany(self, network, peripheral):
+        async def body(master):
+            return await master.request_many(['WheelSpeed', 0x1000], timeout=1)
+        results = self.run(network, peripheral, body)
+        assert [result.exception for result in results] == [None, None]
+        assert results[0].value is not None
+
+    def test_GetNodeStatuses(self, network, peripheral):
+        async def body(master):
+            return await master.get_node_statuses(['RotorSensor'])
+        statuses = self.run(network, peripheral, body)
+        assert statuses['RotorSensor'][NodeStatusProperty.OP_STATUS].value == 'Ok'
+        assert statuses['RotorSensor'][NodeStatusProperty.SERIAL_NUMBER].value == 0x12345678
+
+    def test_ReloadNetwork(self, network, peripheral):
+        async def body(master):
+            return await master.reload_network(load_network('tests/data/network-1.json'))
+        assert not self.run(network, peripheral, body)
+
+    def test_Options_BoundedBlock(self, network):
+        with pytest.raises(ValueError):
+            AsyncLineMaster(network=network, queue_size=4)
+
+    def test_PauseSchedule(self, network, peripheral):
+        async def body(master):
+            master.enable_schedule('RotorSensorSchedule')
+            await master.pause_schedule()
+            paused = master.master._schedule_paused
+            await master.disable_schedule()
+            return (paused, master.master._schedule_running)
+        assert self.run(network, peripheral, body) == (True, False)
+
+    def test_Options(self, network):
+        master = AsyncLineMaster(network=network, queue_size=4, overflow='drop-oldest', coalesce=True,
+                                 decode_in_place=True)
+        assert master.master.decode_in_place
+        assert master.master._coalesce
+        assert sum(master.get_queue_statistics().depth.values()) == 0
+
+    def test_GetSignal_InPlaceCopy(self, network, peripheral):
+        peripheral.requests.WheelSpeed.FrontSpeed = 10
+        async def body(master):
+            value = await master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+            peripheral.requests.WheelSpeed.FrontSpeed = 20
+            await master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+            return value
+
+        async def main():
+            async with AsyncLineMaster(network=network, decode_in_place=True) as master:
+                master.virtual_bus.add(peripheral)
+                return await body(master)
+        assert asyncio.run(main()).phy == pytest.approx(10, abs=0.5)
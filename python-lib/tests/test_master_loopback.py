@@ -0,0 +1,50 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import pytest
+
+from line_protocol.network import load_network
+from line_protocol.protocol.master import LineMaster, LineTransportTimeout
+from line_protocol.protocol.loopback import LineLoopbackTransport
+from line_protocol.protocol.simulation import SimulatedPeripheral
+from unittest.mock import Mock
+
+class TestLineMaster_Loopback:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.op_status = 'Ok'
+        peripheral.software_version = '1.0.0'
+        peripheral.serial_number = 0x12345678
+        yield peripheral
+
+    @pytest.fixture(params=[True, False], ids=['OneWire', 'TwoWire'])
+    def master(self, request, network, peripheral):
+        with LineLoopbackTransport(network.baudrate, one_wire=request.param) as transport:
+            transport.add(peripheral)
+            with LineMaster(transport, network) as master:
+                yield master
+
+    def test_ReceiveRequest_Wait(self, master, peripheral):
+        peripheral.requests.WheelSpeed.FrontSpeed = 15
+        response = master.request("WheelSpeed", wait=True, timeout=1)
+
+        assert response == master.network.get_request('WheelSpeed').encode({'FrontSpeed': 15})
+
+    def test_ReceiveRequest_Timeout(self, master, peripheral):
+        peripheral.connected = False
+        with pytest.raises(LineTransportTimeout):
+            master.request("WheelSpeed", wait=True, timeout=1)
+
+    def test_GetSerialNumber_Wait(self, master):
+        assert master.get_serial_number('RotorSensor', wait=True, timeout=1) == 0x12345678
+
+    def test_TransmitRequest_Wait(self, master, peripheral):
+        peripheral.on_request_complete = Mock()
+        master.send_request(0x1100, [0x02, 0x03], wait=True, timeout=1)
+
+        peripheral.on_request_complete.assert_called_once_with(0x1100, [0x02, 0x03])
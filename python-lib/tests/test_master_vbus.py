@@ -1,14 +1,25 @@
 # pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
 # pylint: disable=invalid-name
+import json
 import pytest
 import time
+from threading import Event, Thread
 
 from line_protocol.network import load_network
 from line_protocol.network.request import SignalValueContainer
-from line_protocol.protocol.master import LineMaster, LineTransportTimeout, RequestListener, NodeStatusListener, NodeStatusProperty
+from line_protocol.network.schedule import FixedOrderSchedule, WakeupScheduleEntry
+from line_protocol.protocol.master import LineMaster, LineTransportTimeout, LineRequestExpired, LineQueueOverflow, TransmitPriority, RequestListener, NodeStatusListener, NodeStatusProperty
 from line_protocol.protocol.simulation import SimulatedPeripheral
+from line_protocol.protocol.transport import LineTransportListener
+from line_protocol.util.discovery import network_discovery
 from unittest.mock import Mock
 
+def wait_until(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'Condition not met in time'
+        time.sleep(0.01)
+
 class TestLineMaster_VirtualBus_Raw:
 
     # No nodes, do transmit, do requests
@@ -65,6 +76,28 @@ class TestLineMaster_VirtualBus_Network:
         with pytest.raises(LineTransportTimeout):
             master.request("WheelSpeed", wait=True, timeout=0.1)
 
+    def test_ReceiveRequest_Future(self, master, peripheral):
+        peripheral.connected = True
+        futures = [master.request("WheelSpeed", wait=False) for _ in range(10)]
+
+        assert all(len(future.result(timeout=1)) == 5 for future in futures)
+
+    def test_ReceiveRequest_Future_Timeout(self, master, peripheral):
+        peripheral.connected = False
+        future = master.request("WheelSpeed", wait=False)
+
+        with pytest.raises(LineTransportTimeout):
+            future.result(timeout=1)
+
+    def test_ReceiveRequest_Future_Callback(self, master, peripheral):
+        peripheral.connected = True
+        done = Event()
+        future = master.request("WheelSpeed", wait=False)
+        future.add_done_callback(lambda future: done.set())
+
+        assert done.wait(timeout=1)
+        assert len(future.result()) == 5
+
 class TestLineMaster_VirtualBus_Diagnostics:
 
     @pytest.fixture()
@@ -123,6 +156,10 @@ class TestLineMaster_VirtualBus_Diagnostics:
         time.sleep(0.5)
         assert master.get_node_status('RotorSensor').serial_number == 0x12345678
 
+    def test_GetSerialNumber_Future(self, master):
+        future = master.get_serial_number(node='RotorSensor', wait=False)
+        assert future.result(timeout=1) == 0x12345678
+
     def test_GetSerialNumberByName_Wait(self, master):
         serial_number = master.get_serial_number(node='RotorSensor', wait=True, timeout=1)
         assert serial_number == 0x12345678
@@ -144,6 +181,114 @@ class TestLineMaster_VirtualBus_Scheduling:
         time.sleep(5)
         master.disable_schedule()
 
+    def test_DisableScheduleEntry(self, master):
+        with pytest.raises(ValueError):
+            master.disable_schedule_entry(0)
+
+        master.get_serial_number = Mock(wraps=master.get_serial_number)
+        master.get_software_version = Mock(wraps=master.get_software_version)
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        # The serial number is the third entry, it's disabled before its slot
+        master.disable_schedule_entry(2)
+        time.sleep(1.2)
+        master.disable_schedule()
+        master.get_serial_number.assert_not_called()
+        master.get_software_version.assert_called()
+
+    def test_SwitchSchedule_Immediate(self, master):
+        master.get_operation_status = Mock(wraps=master.get_operation_status)
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        thread = master._schedule_thread
+        wait_until(lambda: master.get_operation_status.called)
+        master.enable_schedule("RotorSensorSchedule")
+        # The scheduler thread is kept, the new schedule runs after the slot in progress
+        wait_until(lambda: master._active_schedule.schedule.name == "RotorSensorSchedule")
+        assert master._schedule_thread is thread
+        master.disable_schedule()
+        assert thread.is_alive()
+
+    def test_SwitchSchedule_CycleEnd(self, master):
+        master.get_operation_status = Mock(wraps=master.get_operation_status)
+        master.get_software_version = Mock(wraps=master.get_software_version)
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        wait_until(lambda: master.get_operation_status.called)
+        master.enable_schedule("RotorSensorSchedule", switch='cycle-end')
+        # Still in the first cycle, the last entry isn't sent yet
+        assert master._active_schedule.schedule.name == "DumpRotorSensorInfoSchedule"
+        wait_until(lambda: master._active_schedule.schedule.name == "RotorSensorSchedule", timeout=3)
+        master.disable_schedule()
+        master.get_software_version.assert_called_once()
+
+    def test_DisableScheduleEntry_PendingSwitch(self, master):
+        master.request = Mock(wraps=master.request)
+        master.get_serial_number = Mock(wraps=master.get_serial_number)
+        master.get_software_version = Mock(wraps=master.get_software_version)
+        master.enable_schedule("RotorSensorSchedule")
+        wait_until(lambda: master.request.called)
+        master.enable_schedule("DumpRotorSensorInfoSchedule", switch='cycle-end')
+        # Applies to the schedule that becomes active at the switch
+        master.disable_schedule_entry(2)
+        wait_until(lambda: master.get_software_version.called, timeout=3)
+        assert master._active_schedule.schedule.name == "DumpRotorSensorInfoSchedule"
+        assert not master._active_schedule.is_entry_enabled(2)
+        master.disable_schedule()
+        master.get_serial_number.assert_not_called()
+
+    def test_PauseSchedule(self, master):
+        get_operation_status = master.get_operation_status
+        def pause_after_first(*args, **kwargs):
+            # Paused from the schedule thread, before the second entry's slot
+            master.pause_schedule()
+            return get_operation_status(*args, **kwargs)
+
+        master.get_operation_status = Mock(side_effect=pause_after_first)
+        master.get_power_status = Mock(wraps=master.get_power_status)
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        executor = master._active_schedule
+        wait_until(lambda: master._schedule_paused and not master._schedule_busy)
+        time.sleep(0.3)
+        master.get_power_status.assert_not_called()
+
+        master.resume_schedule()
+        wait_until(lambda: master.get_power_status.called)
+        master.disable_schedule()
+        # The schedule continues with its second entry
+        assert master._active_schedule is executor
+        master.get_power_status.assert_called_once()
+
+    def test_PauseSchedule_NotRunning(self, master):
+        master.pause_schedule()
+        master.enable_schedule("RotorSensorSchedule")
+        wait_until(lambda: master.get_schedule_statistics().slots > 0)
+
+    def test_PauseSchedule_Disabled(self, master):
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        master.pause_schedule()
+        master.disable_schedule()
+        master.enable_schedule("RotorSensorSchedule")
+        wait_until(lambda: master.get_schedule_statistics().slots > 0)
+
+    def test_PauseSchedule_DuringSlotWait(self, master):
+        schedule = FixedOrderSchedule('Slow', [WakeupScheduleEntry()], 'variable', reserve_slots=True, delay=5)
+        master.wakeup = Mock(wraps=master.wakeup)
+        master.enable_schedule(schedule)
+        wait_until(lambda: master.wakeup.called)
+
+        # Nothing is being sent, the rest of the slot isn't waited for
+        start = time.monotonic()
+        master.pause_schedule()
+        master.disable_schedule()
+        assert time.monotonic() - start < 1
+
+    def test_EnableSchedule_Paused(self, master):
+        master.enable_schedule("DumpRotorSensorInfoSchedule")
+        master.pause_schedule()
+        master.enable_schedule("RotorSensorSchedule")
+
+        assert master._active_schedule.schedule.name == "RotorSensorSchedule"
+        assert master._pending_schedule is None
+        assert not master._schedule_paused
+
 class TestLineMaster_VirtualBus_Listeners:
 
     @pytest.fixture()
@@ -215,3 +360,431 @@ class TestLineMaster_VirtualBus_Listeners:
         #assert request_listener.on_user_request.call_args.args[2] == master.
         assert isinstance(request_listener.on_user_request.call_args.args[3], SignalValueContainer)
         assert request_listener.on_user_request.call_args.args[3].get_signal('FrontSpeed').phy -15 < 0.1
+
+    def test_RequestListener_Filtered(self, master, peripheral):
+        peripheral.connected = True
+        subscribed = Mock(spec=RequestListener)
+        other = Mock(spec=RequestListener)
+        master.add_request_listener(subscribed, requests=['WheelSpeed'])
+        master.add_request_listener(other, requests=[0x1100])
+        master.request("WheelSpeed", wait=True, timeout=1)
+
+        assert subscribed.on_user_request.call_count == 1
+        assert not other.on_user_request.called
+
+    def test_RequestListener_UnknownRequest(self, master):
+        with pytest.raises(LookupError):
+            master.add_request_listener(Mock(spec=RequestListener), requests=['Unknown'])
+
+class TestLineMaster_VirtualBus_SignalSubscription:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        yield peripheral
+
+    @pytest.fixture()
+    def master(self, network, peripheral):
+        with LineMaster(network=network) as master:
+            master.virtual_bus.add(peripheral)
+            yield master
+
+    def poll(self, master, peripheral, values):
+        for value in values:
+            peripheral.requests.WheelSpeed.FrontSpeed = value
+            master.request("WheelSpeed", wait=True, timeout=1)
+
+    def test_OnChangeOnly(self, master, peripheral):
+        callback = Mock()
+        master.subscribe_signal('WheelSpeed', 'FrontSpeed', callback)
+        self.poll(master, peripheral, [10, 10, 20, 20, 10])
+
+        assert [call.args[1].phy for call in callback.call_args_list] == pytest.approx([10, 20, 10], abs=0.5)
+        assert isinstance(callback.call_args.args[0], float)
+
+    def test_EveryUpdate(self, master, peripheral):
+        callback = Mock()
+        master.subscribe_signal('WheelSpeed', 'FrontSpeed', callback, on_change_only=False)
+        self.poll(master, peripheral, [10, 10, 10])
+
+        assert callback.call_count == 3
+
+    def test_Deadband(self, master, peripheral):
+        callback = Mock()
+        master.subscribe_signal('WheelSpeed', 'FrontSpeed', callback, deadband=5)
+        self.poll(master, peripheral, [10, 12, 14, 16, 30])
+
+        assert [call.args[1].phy for call in callback.call_args_list] == pytest.approx([10, 16, 30], abs=0.5)
+
+    def test_Unsubscribe(self, master, peripheral):
+        callback = Mock()
+        subscription = master.subscribe_signal('WheelSpeed', 'FrontSpeed', callback)
+        self.poll(master, peripheral, [10])
+        master.unsubscribe_signal(subscription)
+        self.poll(master, peripheral, [20])
+
+        assert callback.call_count == 1
+
+    def test_InPlace_OnChangeOnly(self, network, peripheral):
+        callback = Mock()
+        with LineMaster(network=network, decode_in_place=True) as master:
+            master.virtual_bus.add(peripheral)
+            master.subscribe_signal('WheelSpeed', 'FrontSpeed', callback)
+            self.poll(master, peripheral, [10, 10, 20])
+
+        assert callback.call_count == 2
+
+    def test_Deadband_MappedSignal(self, master):
+        with pytest.raises(ValueError):
+            master.subscribe_signal('WheelSpeed', 'FrontSpeedStatus', Mock(), deadband=1)
+
+class TestLineMaster_VirtualBus_SignalCache:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.requests.WheelSpeed.FrontSpeed = 10
+        yield peripheral
+
+    @pytest.fixture()
+    def request_listener(self):
+        yield Mock(spec=RequestListener)
+
+    @pytest.fixture()
+    def master(self, network, peripheral, request_listener):
+        with LineMaster(network=network) as master:
+            master.virtual_bus.add(peripheral)
+            master.add_request_listener(request_listener)
+            yield master
+
+    def test_Fresh_NoPoll(self, master, request_listener):
+        assert master.get_signal('WheelSpeed', 'FrontSpeed').phy == pytest.approx(10, abs=0.5)
+        assert master.get_signal('WheelSpeed', 'FrontSpeed', max_age=10).phy == pytest.approx(10, abs=0.5)
+        assert request_listener.on_user_request.call_count == 1
+
+    def test_Stale_Poll(self, master, peripheral, request_listener):
+        master.get_signal('WheelSpeed', 'FrontSpeed')
+        peripheral.requests.WheelSpeed.FrontSpeed = 20
+        time.sleep(0.02)
+
+        assert master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0.01).phy == pytest.approx(20, abs=0.5)
+        assert request_listener.on_user_request.call_count == 2
+
+    def test_ConcurrentReaders_SinglePoll(self, master, request_listener):
+        release = Event()
+        blocker = Mock(spec=LineTransportListener)
+        blocker.on_request.side_effect = lambda request: release.wait(1) and None
+        master.virtual_bus.add(blocker)
+        master.request(0x1100, wait=False)
+
+        values = []
+        readers = [Thread(target=lambda: values.append(master.get_signal('WheelSpeed', 'FrontSpeed')))
+                   for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        while master.get_queue_statistics().coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        for reader in readers:
+            reader.join()
+
+        assert len(values) == 3
+        assert request_listener.on_user_request.call_count == 1
+
+    def test_UnknownRequest(self, master):
+        with pytest.raises(LookupError):
+            master.get_signal('Unknown', 'FrontSpeed')
+
+    def test_InPlace_ReusesValues(self, network, peripheral):
+        with LineMaster(network=network, decode_in_place=True) as master:
+            master.virtual_bus.add(peripheral)
+            buffered = master._user_requests[0x1000].signals['FrontSpeed']
+            first = master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+            peripheral.requests.WheelSpeed.FrontSpeed = 20
+            second = master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+
+            assert master._user_requests[0x1000].signals['FrontSpeed'] is buffered
+            assert buffered.phy == pytest.approx(20, abs=0.5)
+            assert second.phy == pytest.approx(20, abs=0.5)
+
+            master.reset_user_requests()
+            assert master._user_requests[0x1000].signals['FrontSpeed'] is buffered
+
+    def test_InPlace_ReturnsCopies(self, network, peripheral):
+        with LineMaster(network=network, decode_in_place=True) as master:
+            master.virtual_bus.add(peripheral)
+            value = master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+            [result] = master.request_many(['WheelSpeed'])
+            peripheral.requests.WheelSpeed.FrontSpeed = 20
+            master.get_signal('WheelSpeed', 'FrontSpeed', max_age=0)
+            master.request_many(['WheelSpeed'])
+
+            assert value.phy == pytest.approx(10, abs=0.5)
+            assert result.value['FrontSpeed'].phy == pytest.approx(10, abs=0.5)
+
+class TestLineMaster_VirtualBus_Reload:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.requests.WheelSpeed.FrontSpeed = 10
+        peripheral.op_status = 'Ok'
+        yield peripheral
+
+    @pytest.fixture()
+    def master(self, network, peripheral):
+        with LineMaster(network=network) as master:
+            master.virtual_bus.add(peripheral)
+            yield master
+
+    def reload(self, master, tmp_path, modify):
+        with open('tests/data/network-1.json') as f:
+            data = json.load(f)
+        modify(data)
+        path = tmp_path / 'network.json'
+        path.write_text(json.dumps(data))
+        return master.reload_network(load_network(str(path)))
+
+    def test_Reload_KeepsUnchanged(self, master, tmp_path):
+        master.request('WheelSpeed', wait=True, timeout=1)
+        master.get_operation_status('RotorSensor', wait=True, timeout=1)
+        def modify(data):
+            data['requests']['Light'] = {'id': '0x1100', 'size': 1, 'layout': {}}
+        diff = self.reload(master, tmp_path, modify)
+
+        assert diff.added_requests == {0x1100}
+        assert master.get_signal('WheelSpeed', 'FrontSpeed', max_age=None).phy == pytest.approx(10, abs=0.5)
+        assert master.get_node_status('RotorSensor').op_status == 'Ok'
+        assert 0x1100 in master._user_requests
+
+    def test_Reload_ResetsChanged(self, master, tmp_path):
+        master.request('WheelSpeed', wait=True, timeout=1)
+        master.get_operation_status('RotorSensor', wait=True, timeout=1)
+        def modify(data):
+            data['requests']['WheelSpeed']['layout']['RearSpeed']['initial'] = 1
+            data['nodes']['RotorSensor']['address'] = '0x02'
+        self.reload(master, tmp_path, modify)
+
+        assert master._user_requests[0x1000].last_update is None
+        assert master.get_node_status(0x01).op_status is None
+        assert master.get_node_status(0x02).op_status is None
+
+    def test_Reload_Schedule(self, master, tmp_path):
+        master.enable_schedule('RotorSensorSchedule')
+        executor = master._active_schedule
+        self.reload(master, tmp_path, lambda data: None)
+        assert master._active_schedule is executor
+
+        def modify(data):
+            data['schedules']['RotorSensorSchedule']['delay'] = 0.1
+        self.reload(master, tmp_path, modify)
+        assert master._active_schedule is not executor
+        assert master._active_schedule.schedule.delay == 0.1
+
+        def remove(data):
+            del data['schedules']['RotorSensorSchedule']
+        self.reload(master, tmp_path, remove)
+        assert not master._schedule_running
+
+class TestLineMaster_VirtualBus_Queue:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    def test_Deadline_Expired(self, network):
+        master = LineMaster(network=network)
+        future = master.request("WheelSpeed", wait=False, deadline=0.01)
+        time.sleep(0.05)
+        with master:
+            with pytest.raises(LineRequestExpired):
+                future.result(timeout=1)
+            assert master.get_queue_statistics().expired == 1
+
+    def test_Deadline_NotExpired(self, network):
+        with LineMaster(network=network) as master:
+            peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+            master.virtual_bus.add(peripheral)
+            assert len(master.request("WheelSpeed", wait=True, timeout=1, deadline=1)) == 5
+            assert master.get_queue_statistics().expired == 0
+
+    def test_Priority_DiagnosticFirst(self, network):
+        master = LineMaster(network=network)
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.op_status = 'Ok'
+        master.virtual_bus.add(peripheral)
+        order = []
+        for _ in range(3):
+            master.request("WheelSpeed", wait=False, priority=TransmitPriority.SCHEDULE) \
+                .add_done_callback(lambda future: order.append('schedule'))
+        master.get_operation_status('RotorSensor', wait=False) \
+            .add_done_callback(lambda future: order.append('diagnostic'))
+
+        depth = master.get_queue_statistics().depth
+        assert depth[TransmitPriority.SCHEDULE] == 3
+        assert depth[TransmitPriority.DIAGNOSTIC] == 1
+        with master:
+            master.request("WheelSpeed", wait=True, timeout=1, priority=TransmitPriority.SCHEDULE)
+        assert order[0] == 'diagnostic'
+
+    def test_Overflow_Reject(self, network):
+        master = LineMaster(network=network, queue_size=1, overflow='reject')
+        master.request("WheelSpeed", wait=False)
+        with pytest.raises(LineQueueOverflow):
+            master.send_request(0x1100, [1, 2], wait=False)
+        assert master.get_queue_statistics().dropped == 1
+
+    def test_Overflow_Reject_Batch(self, network):
+        master = LineMaster(network=network, queue_size=2, overflow='reject')
+        master.request("WheelSpeed", wait=False)
+        # The master isn't running, the queued frame isn't processed within the timeout
+        results = master.request_many(['WheelSpeed', 0x1001, 'WheelSpeed'], timeout=0)
+
+        assert [type(result.exception) for result in results] == \
+            [LineTransportTimeout, LineQueueOverflow, LineQueueOverflow]
+        assert master.get_queue_statistics().dropped == 2
+        assert sum(master.get_queue_statistics().depth.values()) == 2
+
+    def test_Overflow_Block_LockReleased(self, network):
+        master = LineMaster(network=network, queue_size=1, overflow='block', coalesce=True)
+        master.virtual_bus.add(SimulatedPeripheral(network.get_node('RotorSensor')))
+        master.request("WheelSpeed", wait=False)
+        blocked = Thread(target=master.send_request, args=(0x1100, [1]), daemon=True)
+        blocked.start()
+        time.sleep(0.05)
+
+        # Attaching doesn't need space, it isn't held up by the waiting sender
+        future = master.request("WheelSpeed", wait=False)
+        assert master.get_queue_statistics().coalesced == 1
+        with master:
+            assert len(future.result(timeout=1)) == 5
+            blocked.join(1)
+        assert not blocked.is_alive()
+
+    def test_Overflow_Block_MasterThread(self, network):
+        errors = []
+        def on_user_request(*args):
+            if not errors:
+                try:
+                    for _ in range(2):
+                        master.send_request(0x1100, [1], wait=False)
+                except LineQueueOverflow as e:
+                    errors.append(e)
+
+        listener = Mock(RequestListener)
+        listener.on_user_request.side_effect = on_user_request
+        with LineMaster(network=network, queue_size=1, overflow='block') as master:
+            master.virtual_bus.add(SimulatedPeripheral(network.get_node('RotorSensor')))
+            master.add_request_listener(listener)
+            # The listener runs on the master thread, waiting for space would deadlock it
+            master.request("WheelSpeed", wait=True, timeout=1)
+            deadline = time.monotonic() + 1
+            while not errors and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert len(errors) == 1
+
+    def test_Overflow_DropOldest(self, network):
+        master = LineMaster(network=network, queue_size=1, overflow='drop-oldest')
+        dropped = master.request("WheelSpeed", wait=False, priority=TransmitPriority.SCHEDULE)
+        master.get_operation_status('RotorSensor', wait=False)
+
+        with pytest.raises(LineQueueOverflow):
+            dropped.result(timeout=0)
+        assert master.get_queue_statistics().dropped == 1
+
+    def test_Coalesce(self, network):
+        master = LineMaster(network=network, coalesce=True)
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        master.virtual_bus.add(peripheral)
+        futures = [master.request("WheelSpeed", wait=False) for _ in range(3)]
+
+        statistics = master.get_queue_statistics()
+        assert statistics.depth[TransmitPriority.USER] == 1
+        assert statistics.coalesced == 2
+        with master:
+            responses = [future.result(timeout=1) for future in futures]
+        assert all(len(response) == 5 for response in responses)
+
+    def test_Coalesce_Promote(self, network):
+        master = LineMaster(network=network, coalesce=True)
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        master.virtual_bus.add(peripheral)
+        order = []
+        master.request("WheelSpeed", wait=False, priority=TransmitPriority.SCHEDULE) \
+            .add_done_callback(lambda future: order.append('WheelSpeed'))
+        master.send_request(0x1100, [1], wait=False, priority=TransmitPriority.SCHEDULE) \
+            .add_done_callback(lambda future: order.append('0x1100'))
+        # A user caller attaches to the scheduled frame and moves it to its own class
+        future = master.request("WheelSpeed", wait=False)
+
+        depth = master.get_queue_statistics().depth
+        assert depth[TransmitPriority.USER] == 1
+        assert depth[TransmitPriority.SCHEDULE] == 1
+        with master:
+            assert len(future.result(timeout=1)) == 5
+            time.sleep(0.1)
+        assert order == ['WheelSpeed', '0x1100']
+
+    def test_Coalesce_Disabled(self, network):
+        master = LineMaster(network=network)
+        for _ in range(3):
+            master.request("WheelSpeed", wait=False)
+        assert master.get_queue_statistics().depth[TransmitPriority.USER] == 3
+
+class TestLineMaster_VirtualBus_Batch:
+
+    @pytest.fixture()
+    def network(self):
+        yield load_network('tests/data/network-1.json')
+
+    @pytest.fixture()
+    def peripheral(self, network):
+        peripheral = SimulatedPeripheral(network.get_node('RotorSensor'))
+        peripheral.op_status = 'Ok'
+        peripheral.software_version = '1.0.0'
+        peripheral.serial_number = 0x12345678
+        yield peripheral
+
+    @pytest.fixture()
+    def master(self, network, peripheral):
+        with LineMaster(network=network) as master:
+            master.virtual_bus.add(peripheral)
+            yield master
+
+    def test_RequestMany(self, master):
+        results = master.request_many(['WheelSpeed', 0x1001, 'WheelSpeed'])
+
+        assert [result.request for result in results] == [0x1000, 0x1001, 0x1000]
+        assert len(results[0].response) == 5
+        assert isinstance(results[0].value, SignalValueContainer)
+        assert isinstance(results[1].exception, LineTransportTimeout)
+        assert results[2].exception is None
+
+    def test_GetNodeStatuses(self, master):
+        statuses = master.get_node_statuses(['RotorSensor', 0x02],
+                                            [NodeStatusProperty.OP_STATUS, NodeStatusProperty.SERIAL_NUMBER])
+
+        assert statuses['RotorSensor'][NodeStatusProperty.OP_STATUS].value == 'Ok'
+        assert statuses['RotorSensor'][NodeStatusProperty.SERIAL_NUMBER].value == 0x12345678
+        assert isinstance(statuses[0x02][NodeStatusProperty.OP_STATUS].exception, LineTransportTimeout)
+
+    def test_NetworkDiscovery(self, master, network):
+        nodes = network_discovery(master, network=network)
+
+        assert len(nodes) == 1
+        status = nodes[network.get_node('RotorSensor')]
+        assert status.op_status == 'Ok'
+        assert status.software_version == '1.0.0'
+        assert status.serial_number == 0x12345678
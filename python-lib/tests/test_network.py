@@ -0,0 +1,88 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import json
+import pytest
+
+from line_protocol.network import Network, Node, Request, load_network, diff_networks
+from line_protocol.network.schedule import RequestScheduleEntry
+from line_protocol.protocol.transmit_queue import TransmitPriority
+from unittest.mock import Mock
+
+class TestNetwork_Index:
+
+    @pytest.fixture()
+    def network(self):
+        network = Network()
+        network.nodes.append(Node('A', 1))
+        network.nodes.append(Node('B', 2))
+        network.requests.append(Request('Speed', 0x1000, 1, []))
+        yield network
+
+    def test_GetNode(self, network):
+        assert network.get_node('B').address == 2
+        assert network.get_node_by_address(1).name == 'A'
+        with pytest.raises(LookupError):
+            network.get_node('C')
+
+    def test_GetRequest_ByNameOrId(self, network):
+        assert network.get_request('Speed') is network.get_request(0x1000)
+        with pytest.raises(LookupError):
+            network.get_request(0x1001)
+
+    def test_Index_FollowsModification(self, network):
+        network.get_node('A')
+        network.nodes.append(Node('C', 3))
+        assert network.get_node_by_address(3).name == 'C'
+
+        network.nodes.remove(network.get_node('A'))
+        with pytest.raises(LookupError):
+            network.get_node('A')
+
+        network.requests += [Request('Light', 0x1001, 1, [])]
+        assert network.get_request(0x1001).name == 'Light'
+
+    def test_Index_AssignedList(self, network):
+        network.nodes = [Node('D', 4)]
+        assert network.get_node('D').address == 4
+        with pytest.raises(LookupError):
+            network.get_node('A')
+
+    def test_Index_FirstMatch(self, network):
+        network.nodes.append(Node('A', 5))
+        assert network.get_node('A').address == 1
+
+class TestRequestScheduleEntry:
+
+    def test_Perform_ById(self):
+        master = Mock()
+        RequestScheduleEntry(Request('Speed', 0x1000, 1, [])).perform(master)
+        master.request.assert_called_once_with(0x1000, priority=TransmitPriority.SCHEDULE)
+
+def modified_network(tmp_path, modify):
+    with open('tests/data/network-1.json') as f:
+        data = json.load(f)
+    modify(data)
+    path = tmp_path / 'network.json'
+    path.write_text(json.dumps(data))
+    return load_network(str(path))
+
+class TestNetworkDiff:
+
+    def test_Diff_Identical(self, tmp_path):
+        assert not diff_networks(load_network('tests/data/network-1.json'),
+                                 modified_network(tmp_path, lambda data: None))
+
+    def test_Diff_Changes(self, tmp_path):
+        def modify(data):
+            data['requests']['WheelSpeed']['layout']['FrontSpeed']['width'] = 12
+            data['requests']['Light'] = {'id': '0x1100', 'size': 1, 'layout': {}}
+            data['nodes']['RotorSensor']['address'] = '0x02'
+            data['schedules']['RotorSensorSchedule']['delay'] = 0.1
+            del data['schedules']['DumpRotorSensorInfoSchedule']
+        diff = diff_networks(load_network('tests/data/network-1.json'), modified_network(tmp_path, modify))
+
+        assert diff.changed_requests == {0x1000}
+        assert diff.added_requests == {0x1100}
+        assert diff.changed_nodes == {0x01, 0x02}
+        assert diff.changed_schedules == {'RotorSensorSchedule'}
+        assert diff.removed_schedules == {'DumpRotorSensorInfoSchedule'}
@@ -1,6 +1,7 @@
 # pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
 # pylint: disable=invalid-name
 import os
+import shutil
 from line_protocol.network import load_network
 
 class TestNetworkLoad:
@@ -29,3 +30,41 @@ class TestNetworkLoad:
         assert len(network.encoders) == 2
 
 
+
+class TestNetworkLoad_Cache:
+
+    def test_Cache_Hit(self, tmp_path):
+        path = os.path.join(os.path.dirname(__file__), 'data', 'network-1.json')
+        load_network(path, cache_dir=str(tmp_path))
+        assert len(os.listdir(tmp_path)) == 1
+
+        network = load_network(path, cache_dir=str(tmp_path))
+        request = network.get_request('WheelSpeed')
+        assert request.id == 0x1000
+        assert request.decode(request.encode({'FrontSpeedStatus': 'Valid'}))['FrontSpeedStatus'].phy == 'Valid'
+        assert network.get_node_by_address(0x01).name == 'RotorSensor'
+        assert network.master is network.get_node(network.master.name)
+
+    def test_Cache_SourceChanged(self, tmp_path):
+        path = tmp_path / 'network.json'
+        shutil.copy(os.path.join(os.path.dirname(__file__), 'data', 'network-1.json'), path)
+        cache = tmp_path / 'cache'
+        load_network(str(path), cache_dir=str(cache))
+
+        path.write_text(path.read_text().replace('WheelSpeed', 'WheelRate'))
+        network = load_network(str(path), cache_dir=str(cache))
+        assert network.get_request(0x1000).name == 'WheelRate'
+        assert len(os.listdir(cache)) == 2
+
+    def test_Cache_Corrupt(self, tmp_path):
+        path = os.path.join(os.path.dirname(__file__), 'data', 'network-1.json')
+        load_network(path, cache_dir=str(tmp_path))
+        for name in os.listdir(tmp_path):
+            (tmp_path / name).write_bytes(b'garbage')
+
+        assert load_network(path, cache_dir=str(tmp_path)).get_request('WheelSpeed').id == 0x1000
+
+    def test_Cache_Environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('LINE_NETWORK_CACHE', str(tmp_path))
+        load_network(os.path.join(os.path.dirname(__file__), 'data', 'network-1.json'))
+        assert len(os.listdir(tmp_path)) == 1
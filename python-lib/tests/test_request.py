@@ -0,0 +1,161 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import pytest
+
+from line_protocol.network import load_network, Request, Signal
+
+class TestRequest_Codec:
+
+    @pytest.fixture()
+    def request_(self):
+        yield load_network('tests/data/network-1.json').get_request('WheelSpeed')
+
+    def test_Encode_InitialValues(self, request_):
+        # FrontSpeedStatus and RearSpeedStatus are initially 'Invalid' which is mapped to 0
+        assert request_.encode({}) == [0, 0, 0, 0, 0]
+
+    def test_Encode_Decode(self, request_):
+        data = request_.encode({'FrontSpeed': 10, 'RearSpeedStatus': 'Valid'})
+        signals = request_.decode(data)
+
+        assert signals['FrontSpeed'].phy == pytest.approx(10, abs=0.5)
+        assert signals['RearSpeed'].raw == 0
+        assert signals['RearSpeedStatus'].phy == 'Valid'
+
+    def test_Encode_UnknownSignalIgnored(self, request_):
+        assert request_.encode({'Unknown': 1}) == request_.encode({})
+
+    def test_Encode_Masked(self, request_):
+        data = request_.encode({'FrontSpeed': 0x1FFFF * 0.3921})
+        assert request_.decode_raw(data)['RearSpeed'] == 0
+
+    def test_DecodeRaw(self, request_):
+        assert request_.decode_raw([0x34, 0x12, 0x78, 0x56, 0x09]) == {
+            'FrontSpeed': 0x1234, 'RearSpeed': 0x5678, 'FrontSpeedStatus': 1, 'RearSpeedStatus': 2
+        }
+
+    def test_DecodeRaw_InvalidSize(self, request_):
+        with pytest.raises(ValueError):
+            request_.decode_raw([0, 0])
+
+class TestRequest_EncodeRaw:
+
+    @pytest.fixture()
+    def request_(self):
+        yield load_network('tests/data/network-1.json').get_request('WheelSpeed')
+
+    def test_EncodeRaw_RoundTrip(self, request_):
+        data = [0x34, 0x12, 0x78, 0x56, 0x09]
+        assert request_.encode_raw(request_.decode_raw(data)) == data
+
+    def test_EncodeRaw_Initial(self, request_):
+        assert request_.encode_raw({'FrontSpeed': 0x1234}) == [0x34, 0x12, 0, 0, 0]
+
+    def test_EncodeRawInto(self, request_):
+        buffer = bytearray(8)
+        request_.encode_raw_into({'RearSpeed': 0xABCD, 'RearSpeedStatus': 3}, memoryview(buffer), offset=2)
+        assert list(buffer) == [0, 0, 0, 0, 0xCD, 0xAB, 0x0C, 0]
+
+    def test_EncodeRawInto_TooSmall(self, request_):
+        with pytest.raises(ValueError):
+            request_.encode_raw_into({}, bytearray(6), offset=2)
+
+class TestRequest_DecodeInto:
+
+    @pytest.fixture()
+    def request_(self):
+        yield load_network('tests/data/network-1.json').get_request('WheelSpeed')
+
+    def test_DecodeInto_SameAsDecode(self, request_):
+        container = request_.decode([0, 0, 0, 0, 0])
+        values = list(container)
+        data = [0x10, 0x20, 0x30, 0x40, 0x05]
+
+        assert request_.decode_into(data, container) is container
+        assert list(container) == list(request_.decode(data))
+        assert all(a is b for (a, b) in zip(container, values))
+
+    def test_DecodeInto_InvalidSize(self, request_):
+        container = request_.decode([0, 0, 0, 0, 0])
+        with pytest.raises(ValueError):
+            request_.decode_into([0, 0], container)
+
+    def test_Snapshot(self, request_):
+        container = request_.decode([1, 0, 0, 0, 0])
+        snapshot = container.snapshot()
+        request_.decode_into([2, 0, 0, 0, 0], container)
+
+        assert snapshot['FrontSpeed'].raw == 1
+        assert container['FrontSpeed'].raw == 2
+
+    def test_SignalValue_Slots(self, request_):
+        value = request_.decode([1, 0, 0, 0, 0])['FrontSpeed']
+        with pytest.raises(AttributeError):
+            value.extra = 1
+
+class TestRequest_DecodeMany:
+
+    @pytest.fixture()
+    def request_(self):
+        yield load_network('tests/data/network-1.json').get_request('WheelSpeed')
+
+    @pytest.fixture()
+    def frames(self, request_):
+        yield [request_.encode({'FrontSpeed': speed, 'RearSpeed': speed / 2,
+                                'FrontSpeedStatus': 'Valid' if speed % 2 else 'Invalid'})
+               for speed in range(0, 200, 7)]
+
+    def test_DecodeMany_Array(self, request_, frames):
+        numpy = pytest.importorskip('numpy')
+        columns = request_.decode_many(numpy.array(frames, dtype=numpy.uint8))
+
+        for name in ('FrontSpeed', 'RearSpeed', 'FrontSpeedStatus', 'RearSpeedStatus'):
+            assert columns[name].tolist() == [request_.decode(frame)[name].raw for frame in frames]
+        assert columns['FrontSpeed'].dtype == numpy.uint16
+        assert columns['FrontSpeedStatus'].dtype == numpy.uint8
+
+    def test_DecodeMany_Buffer_Phy(self, request_, frames):
+        numpy = pytest.importorskip('numpy')
+        columns = request_.decode_many(b''.join(bytes(frame) for frame in frames), phy=True)
+
+        assert numpy.allclose(columns['RearSpeed'], [request_.decode(frame)['RearSpeed'].phy for frame in frames])
+        assert columns['FrontSpeedStatus'].tolist() == [request_.decode(frame)['FrontSpeedStatus'].phy
+                                                        for frame in frames]
+
+    def test_DecodeMany_PartialFrame(self, request_):
+        pytest.importorskip('numpy')
+        with pytest.raises(ValueError):
+            request_.decode_many(bytes(7))
+
+    def test_DecodeMany_Unaligned64(self):
+        numpy = pytest.importorskip('numpy')
+        request_ = Request('Wide', 0x1000, 9, [Signal('Value', 4, 64, 0, None)])
+        frames = [[0xF0] + [0xFF] * 7 + [0x0F], [0x30, 0x12, 0, 0, 0, 0, 0, 0, 0x0F]]
+        columns = request_.decode_many(numpy.array(frames, dtype=numpy.uint8))
+
+        assert columns['Value'].tolist() == [request_.decode(frame)['Value'].raw for frame in frames]
+        assert columns['Value'].tolist()[0] == 2**64 - 1
+
+class TestRequest_EncodeMany:
+
+    @pytest.fixture()
+    def request_(self):
+        yield load_network('tests/data/network-1.json').get_request('WheelSpeed')
+
+    def test_EncodeMany_SameAsEncode(self, request_):
+        numpy = pytest.importorskip('numpy')
+        speeds = numpy.linspace(0, 100, 50)
+        frames = request_.encode_many({'FrontSpeed': speeds, 'RearSpeedStatus': 'Valid'})
+
+        assert frames.shape == (50, request_.size)
+        assert frames.tolist() == [request_.encode({'FrontSpeed': speed, 'RearSpeedStatus': 'Valid'})
+                                   for speed in speeds]
+
+    def test_EncodeMany_Count(self, request_):
+        pytest.importorskip('numpy')
+        assert request_.encode_many({}, count=3).tolist() == [request_.encode({})] * 3
+
+    def test_EncodeMany_LengthMismatch(self, request_):
+        numpy = pytest.importorskip('numpy')
+        with pytest.raises(ValueError):
+            request_.encode_many({'FrontSpeed': numpy.zeros(3), 'RearSpeed': numpy.zeros(4)})
@@ -0,0 +1,322 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import pytest
+import random
+from unittest.mock import patch
+
+from line_protocol.network import Request
+from line_protocol.network.schedule import (FixedOrderSchedule, PriorityAgingSchedule, PriorityScheduleEntry,
+                                            PriorityAgingScheduleExecutor,
+                                            RequestScheduleEntry, WakeupScheduleEntry, IdleScheduleEntry)
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.sleeps.append(duration)
+        self.now += duration
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch('line_protocol.network.schedule.time', clock):
+        yield clock
+
+def create_executor(overrun='skip'):
+    schedule = FixedOrderSchedule('Test', [WakeupScheduleEntry(), IdleScheduleEntry()], 'variable',
+                                  reserve_slots=True, delay=0.1, overrun=overrun)
+    return schedule.create_executor()
+
+class TestScheduleExecutor_Timing:
+
+    def test_Timing_SleepInterrupted(self, clock):
+        executor = create_executor()
+        # The sleep returns early, e.g.: the schedule was paused, the slot isn't counted
+        executor.wait(lambda duration: None)
+        assert executor.get_statistics().slots == 0
+        executor.wait()
+        assert executor.get_statistics().slots == 1
+
+    def test_Timing_NoDrift(self, clock):
+        executor = create_executor()
+        start = clock.now
+        for slot in range(1, 101):
+            # Queueing the entry takes time, it must not delay the next slot
+            clock.now += 0.03
+            executor.wait()
+            assert clock.now == pytest.approx(start + slot * 0.1)
+
+        statistics = executor.get_statistics()
+        assert statistics.slots == 100
+        assert statistics.overruns == 0
+        assert statistics.max_lateness == pytest.approx(0, abs=1e-9)
+
+    def test_Timing_Skip(self, clock):
+        executor = create_executor('skip')
+        start = clock.now
+        clock.now += 0.25
+        executor.wait()
+        # The slot at 0.1 is late, 0.2 was missed entirely
+        assert clock.sleeps == []
+        executor.wait()
+        assert clock.now == pytest.approx(start + 0.3)
+
+        statistics = executor.get_statistics()
+        assert statistics.overruns == 1
+        assert statistics.skipped == 1
+        assert statistics.max_lateness == pytest.approx(0.05)
+
+    def test_Timing_CatchUp(self, clock):
+        executor = create_executor('catch-up')
+        start = clock.now
+        clock.now += 0.25
+        executor.wait()
+        executor.wait()
+        assert clock.sleeps == []
+        executor.wait()
+        assert clock.now == pytest.approx(start + 0.3)
+
+        statistics = executor.get_statistics()
+        assert statistics.overruns == 2
+        assert statistics.skipped == 0
+        assert statistics.slots == 3
+
+    def test_Timing_Continue(self, clock):
+        previous = create_executor()
+        clock.now += 0.05
+        previous.wait()
+        executor = create_executor()
+        executor.continue_timeline(previous)
+        executor.wait()
+        assert clock.now == pytest.approx(previous._deadline + 0.1)
+
+    def test_Timing_Restart(self, clock):
+        executor = create_executor()
+        clock.now += 10
+        executor.restart_timeline()
+        executor.wait()
+        assert executor.get_statistics().overruns == 0
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    def test_Timing_InvalidPolicy(self):
+        with pytest.raises(ValueError):
+            create_executor('ignore')
+
+class TestScheduleExecutor_FixedSlots:
+
+    def test_FixedSlots_SlotTime(self, clock):
+        entries = [WakeupScheduleEntry(), RequestScheduleEntry(Request('Speed', 0x1000, 8, []))]
+        schedule = FixedOrderSchedule('Test', entries, 'fixed', reserve_slots=True, delay=0.01)
+        executor = schedule.create_executor(19200)
+        # Sync, request code, size, 8 data bytes and checksum at 10 bits per byte
+        assert executor.slot_time == pytest.approx(13 * 10 / 19200 + 0.01)
+
+        start = clock.now
+        for slot in range(1, 5):
+            executor.next()
+            executor.wait()
+            assert clock.now == pytest.approx(start + slot * executor.slot_time)
+
+    def test_FixedSlots_NoBaudrate(self):
+        schedule = FixedOrderSchedule('Test', [WakeupScheduleEntry()], 'fixed', reserve_slots=True, delay=0.01)
+        with pytest.raises(ValueError):
+            schedule.create_executor()
+
+    @pytest.mark.parametrize('reserve_slots', [True, False])
+    def test_FixedSlots_NothingDue(self, clock, reserve_slots):
+        entries = [PriorityScheduleEntry(WakeupScheduleEntry(), cycle=4, max_age=4)]
+        schedule = PriorityAgingSchedule('Test', entries, 'fixed', 'zero', reserve_slots=reserve_slots, delay=0)
+        executor = schedule.create_executor(19200)
+
+        start = clock.now
+        performed = 0
+        while performed < 2:
+            if executor.next() is not None:
+                performed += 1
+            executor.wait()
+        # Slots where no entry is due take time, reserved or not
+        assert clock.now == pytest.approx(start + 8 * executor.slot_time)
+
+def reference_order(schedule, slots):
+    # The cycle counter algorithm the compiled executor has to reproduce
+    entries = schedule.entries
+    if schedule.phase == 'zero':
+        counters = [0] * len(entries)
+    else:
+        counters = [entry.cycle / 2 for entry in entries]
+    order = []
+    for _ in range(slots):
+        for i in range(len(entries)):
+            counters[i] += 1
+        selected = None
+        for i in range(len(entries)):
+            if counters[i] >= entries[i].max_age:
+                selected = i
+                break
+        else:
+            for i in range(len(entries)):
+                if counters[i] >= entries[i].cycle:
+                    selected = i
+                    break
+        if selected is not None:
+            counters[selected] = 0
+        order.append(selected)
+    return order
+
+def create_priority_schedule(config, phase):
+    entries = [PriorityScheduleEntry(WakeupScheduleEntry(), cycle, max_age) for (cycle, max_age) in config]
+    return PriorityAgingSchedule('Test', entries, 'variable', phase, reserve_slots=True, delay=0)
+
+def executor_order(executor, slots):
+    entries = [entry.entry for entry in executor.schedule.entries]
+    order = []
+    for _ in range(slots):
+        entry = executor.next()
+        order.append(None if entry is None else entries.index(entry))
+    return order
+
+class HeapExecutor(PriorityAgingScheduleExecutor):
+    max_table_slots = 0
+
+class TestScheduleExecutor_PriorityAging:
+
+    configs = [
+        [(0, 3), (1, 3)],
+        [(2, 5), (4, 10)],
+        [(3, 7), (5, 11), (7, 13), (1, 100)],
+        [(1, 1), (1, 1)],
+        [(6, 6), (9, 9)],
+        [],
+    ]
+
+    @pytest.mark.parametrize('phase', ['zero', 'adjusted'])
+    @pytest.mark.parametrize('config', configs)
+    def test_PriorityAging_Table(self, config, phase):
+        schedule = create_priority_schedule(config, phase)
+        assert executor_order(schedule.create_executor(), 500) == reference_order(schedule, 500)
+
+    @pytest.mark.parametrize('phase', ['zero', 'adjusted'])
+    @pytest.mark.parametrize('config', configs)
+    def test_PriorityAging_Heap(self, config, phase):
+        schedule = create_priority_schedule(config, phase)
+        executor = HeapExecutor(schedule)
+        assert executor._table is None
+        assert executor_order(executor, 500) == reference_order(schedule, 500)
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_PriorityAging_Random(self, seed):
+        rng = random.Random(seed)
+        config = []
+        for _ in range(rng.randint(1, 12)):
+            cycle = rng.randint(0, 20)
+            config.append((cycle, rng.randint(cycle, 40)))
+        phase = rng.choice(['zero', 'adjusted'])
+        schedule = create_priority_schedule(config, phase)
+        expected = reference_order(schedule, 2000)
+        assert executor_order(schedule.create_executor(), 2000) == expected
+        assert executor_order(HeapExecutor(schedule), 2000) == expected
+
+    def test_PriorityAging_LongPeriod(self):
+        rng = random.Random(0)
+        config = []
+        for _ in range(300):
+            cycle = rng.randint(5, 200)
+            config.append((cycle, cycle * 2))
+        schedule = create_priority_schedule(config, 'zero')
+
+        executor = schedule.create_executor()
+        # The common period is far too long for a table, it isn't simulated
+        assert executor._table is None
+        assert executor_order(executor, 300) == reference_order(schedule, 300)
+
+    def test_PriorityAging_Starvation(self):
+        # The second entry is never selected, its counter never repeats
+        schedule = create_priority_schedule([(1, 1), (1, 1)], 'zero')
+        executor = schedule.create_executor()
+        assert executor._table is None
+        assert executor_order(executor, 10) == [0] * 10
+
+class TestScheduleExecutor_EnableEntry:
+
+    def create_fixed(self, reserve_slots):
+        entries = [WakeupScheduleEntry(), IdleScheduleEntry(), WakeupScheduleEntry()]
+        schedule = FixedOrderSchedule('Test', entries, 'variable', reserve_slots=reserve_slots, delay=0.1)
+        return schedule.create_executor()
+
+    def test_EnableEntry_Reserved(self, clock):
+        executor = self.create_fixed(True)
+        entries = executor.schedule.entries
+        executor.disable_entry(1)
+        assert not executor.is_entry_enabled(entries[1])
+
+        start = clock.now
+        order = []
+        for _ in range(6):
+            order.append(executor.next())
+            executor.wait()
+        assert order == [entries[0], None, entries[2]] * 2
+        assert clock.now == pytest.approx(start + 0.6)
+
+    def test_EnableEntry_Skipped(self, clock):
+        executor = self.create_fixed(False)
+        entries = executor.schedule.entries
+        executor.disable_entry(entries[1])
+
+        start = clock.now
+        order = []
+        for _ in range(4):
+            order.append(executor.next())
+            executor.wait()
+        assert order == [entries[0], entries[2]] * 2
+        assert clock.now == pytest.approx(start + 0.4)
+
+        executor.enable_entry(entries[1])
+        assert [executor.next() for _ in range(3)] == entries
+
+    def test_EnableEntry_AllDisabled(self, clock):
+        executor = self.create_fixed(False)
+        for index in range(3):
+            executor.disable_entry(index)
+        start = clock.now
+        assert executor.next() is None
+        executor.wait()
+        # Nothing to send, the slot still takes its time instead of spinning
+        assert clock.now == pytest.approx(start + 0.1)
+
+    def test_AtCycleEnd(self):
+        executor = self.create_fixed(True)
+        ends = []
+        for _ in range(6):
+            executor.next()
+            ends.append(executor.at_cycle_end())
+        assert ends == [False, False, True] * 2
+
+    def test_EnableEntry_Unknown(self):
+        executor = self.create_fixed(True)
+        with pytest.raises(LookupError):
+            executor.disable_entry(3)
+        with pytest.raises(LookupError):
+            executor.disable_entry(WakeupScheduleEntry())
+
+    @pytest.mark.parametrize('executor_type', [PriorityAgingScheduleExecutor, HeapExecutor])
+    @pytest.mark.parametrize('reserve_slots', [True, False])
+    def test_EnableEntry_PriorityAging(self, executor_type, reserve_slots):
+        schedule = create_priority_schedule([(0, 3), (1, 3), (2, 4)], 'zero')
+        schedule.reserve_slots = reserve_slots
+        expected = reference_order(schedule, 400)
+        executor = executor_type(schedule)
+        # The inner entry is what next() returns, it refers to the same slot
+        executor.disable_entry(schedule.entries[1].entry)
+
+        order = executor_order(executor, 200)
+        if reserve_slots:
+            assert order == [None if index == 1 else index for index in expected[:200]]
+        else:
+            # The slots of the disabled entry are passed over, slots where nothing is due remain
+            assert order == [index for index in expected if index != 1][:200]
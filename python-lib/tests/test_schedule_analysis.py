@@ -13,8 +13,11 @@ class TestScheduleAnalysis:
         return load_network(os.path.join(os.path.dirname(__file__), 'data/schedules-test.json'))
 
     def test_ScheduleAnalysis_ByName(self, network):
-        analyze_schedule('LegacySchedule', 10, network)
-        # TODO: Add assertions to verify the analysis results
+        result = analyze_schedule('LegacySchedule', 10, network)
+        assert result['Speed'].initial_delay == 0
+        assert result['Light'].initial_delay == pytest.approx(0.25)
+        assert result['Speed'].average_delay == pytest.approx(0.5)
+        assert result['Light'].maximum_delay == pytest.approx(0.5)
 
     def test_ScheduleAnalysis_ByObject(self, network):
         schedule = network.get_schedule('LegacySchedule')
@@ -0,0 +1,97 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+from queue import Empty, Full
+from threading import Event
+import pytest
+
+from line_protocol.protocol.master import TransmitEvent, RxRequest
+from line_protocol.protocol.transmit_queue import TransmitQueue, TransmitPriority, LineQueueOverflow
+
+def make_event(event_id: int, priority: TransmitPriority) -> TransmitEvent:
+    return TransmitEvent(RxRequest(0x1000 + event_id), event_id, Event(), priority)
+
+class TestTransmitQueue:
+
+    def test_Get_Empty(self):
+        queue = TransmitQueue()
+        with pytest.raises(Empty):
+            queue.get(timeout=0.01)
+
+    def test_Get_PriorityOrder(self):
+        queue = TransmitQueue()
+        queue.put(make_event(0, TransmitPriority.SCHEDULE))
+        queue.put(make_event(1, TransmitPriority.USER))
+        queue.put(make_event(2, TransmitPriority.SCHEDULE))
+        queue.put(make_event(3, TransmitPriority.DIAGNOSTIC))
+        queue.put(make_event(4, TransmitPriority.USER))
+
+        assert [queue.get().event_id for _ in range(5)] == [3, 1, 4, 0, 2]
+        assert len(queue) == 0
+
+    def test_Promote(self):
+        queue = TransmitQueue()
+        scheduled = make_event(0, TransmitPriority.SCHEDULE)
+        queue.put(scheduled)
+        queue.put(make_event(1, TransmitPriority.USER))
+
+        assert queue.promote(scheduled, TransmitPriority.USER)
+        assert scheduled.priority == TransmitPriority.USER
+        assert queue.depth()[TransmitPriority.SCHEDULE] == 0
+        assert [queue.get().event_id for _ in range(2)] == [1, 0]
+        # Not queued anymore
+        assert not queue.promote(scheduled, TransmitPriority.DIAGNOSTIC)
+
+    def test_Depth(self):
+        queue = TransmitQueue()
+        queue.put(make_event(0, TransmitPriority.SCHEDULE))
+        queue.put(make_event(1, TransmitPriority.SCHEDULE))
+        queue.put(make_event(2, TransmitPriority.USER))
+
+        assert queue.depth() == {TransmitPriority.DIAGNOSTIC: 0,
+                                 TransmitPriority.USER: 1,
+                                 TransmitPriority.SCHEDULE: 2}
+
+class TestTransmitQueue_Overflow:
+
+    def test_Reject(self):
+        queue = TransmitQueue(2, 'reject')
+        queue.put(make_event(0, TransmitPriority.USER))
+        queue.put(make_event(1, TransmitPriority.USER))
+        with pytest.raises(LineQueueOverflow):
+            queue.put(make_event(2, TransmitPriority.USER))
+        assert len(queue) == 2
+
+    def test_Block_Timeout(self):
+        queue = TransmitQueue(1, 'block')
+        queue.put(make_event(0, TransmitPriority.USER))
+        with pytest.raises(LineQueueOverflow):
+            queue.put(make_event(1, TransmitPriority.USER), timeout=0.01)
+
+    def test_Block_NonBlocking(self):
+        queue = TransmitQueue(1, 'block')
+        queue.put(make_event(0, TransmitPriority.USER))
+        with pytest.raises(Full):
+            queue.put(make_event(1, TransmitPriority.USER), block=False)
+        assert not queue.wait_for_space(0.01)
+        queue.get()
+        assert queue.wait_for_space(0)
+
+    def test_DropOldest_LowestPriority(self):
+        queue = TransmitQueue(3, 'drop-oldest')
+        queue.put(make_event(0, TransmitPriority.SCHEDULE))
+        queue.put(make_event(1, TransmitPriority.SCHEDULE))
+        queue.put(make_event(2, TransmitPriority.USER))
+
+        assert queue.put(make_event(3, TransmitPriority.USER)).event_id == 0
+        assert [queue.get().event_id for _ in range(3)] == [2, 3, 1]
+
+    def test_DropOldest_NewFrameLeastImportant(self):
+        queue = TransmitQueue(1, 'drop-oldest')
+        queue.put(make_event(0, TransmitPriority.DIAGNOSTIC))
+
+        assert queue.put(make_event(1, TransmitPriority.SCHEDULE)).event_id == 1
+        assert queue.get().event_id == 0
+
+    def test_UnknownPolicy(self):
+        with pytest.raises(ValueError):
+            TransmitQueue(1, 'ignore')
@@ -0,0 +1,157 @@
+# pylint: disable=missing-function-docstring, missing-class-docstring, missing-module-docstring
+# pylint: disable=invalid-name
+import time
+import pytest
+
+from line_protocol.protocol.transport import (LineSerialTransport, LineResponseParser,
+                                              LineTransportTimeout, LineTransportDataError,
+                                              LineTransportRequestError)
+from line_protocol.protocol.util import create_header, create_frame, data_checksum, frame_time
+
+class FakeSerial:
+    """Serial port double that returns the scripted bytes and counts the reads"""
+
+    def __init__(self, rx: bytes = b'') -> None:
+        self.rx = bytearray(rx)
+        self.tx = bytearray()
+        self.reads = 0
+        self.reconfigurations = 0
+        self._timeout = 0.001
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        # pyserial reconfigures the port for every assignment
+        self.reconfigurations += 1
+        self._timeout = value
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    def write(self, data) -> int:
+        self.tx += data
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        self.reads += 1
+        data = bytes(self.rx[:size])
+        del self.rx[:size]
+        return data
+
+def make_transport(rx: bytes, one_wire: bool = True) -> LineSerialTransport:
+    transport = LineSerialTransport(None, one_wire=one_wire)
+    transport._serial = FakeSerial(rx)
+    return transport
+
+def response(data) -> bytes:
+    return bytes([len(data)] + data + [data_checksum(data)])
+
+class TestLineResponseParser:
+
+    def test_Parse_ByteByByte(self):
+        header = create_header(0x1000)
+        parser = LineResponseParser(header)
+        for byte in bytes(header) + response([1, 2, 3]):
+            assert not parser.done
+            assert parser.feed(bytes([byte])) == 1
+        assert parser.done
+        assert parser.data == [1, 2, 3]
+
+    def test_Parse_SingleChunk(self):
+        parser = LineResponseParser(create_header(0x1000))
+        chunk = bytes(create_header(0x1000)) + response([4, 5])
+        assert parser.feed(chunk + b'\x00\x00') == len(chunk)
+        assert parser.done
+        assert parser.data == [4, 5]
+
+    def test_Parse_EmptyResponse(self):
+        parser = LineResponseParser()
+        parser.feed(response([]))
+        assert parser.done
+        assert parser.data == []
+
+    def test_Parse_Remaining(self):
+        parser = LineResponseParser(create_header(0x1000))
+        assert parser.remaining == 3
+        parser.feed(bytes(create_header(0x1000)) + bytes([3]))
+        assert parser.remaining == 4
+        parser.feed(bytes([1, 2, 3]))
+        assert parser.remaining == 1
+
+    def test_Parse_InvalidEcho(self):
+        parser = LineResponseParser(create_header(0x1000))
+        with pytest.raises(LineTransportRequestError):
+            parser.feed(bytes(create_header(0x1001)))
+
+    def test_Parse_InvalidChecksum(self):
+        parser = LineResponseParser()
+        with pytest.raises(LineTransportDataError):
+            parser.feed(bytes([1, 0x10, 0x00]))
+
+class TestLineSerialTransport_RequestData:
+
+    def test_RequestData_OneWire(self):
+        transport = make_transport(bytes(create_header(0x1000)) + response([1, 2, 3, 4, 5]))
+        assert transport.request_data(0x1000) == [1, 2, 3, 4, 5]
+        assert transport._serial.tx == create_header(0x1000)
+        assert transport._serial.reads <= 3
+
+    def test_RequestData_TwoWire(self):
+        transport = make_transport(response([0xAA]), one_wire=False)
+        assert transport.request_data(0x1000) == [0xAA]
+
+    def test_RequestData_TimeoutConfiguredOnce(self):
+        transport = make_transport(response([0xAA]) * 3, one_wire=False)
+        for _ in range(3):
+            assert transport.request_data(0x1000) == [0xAA]
+        assert transport._serial.reconfigurations == 1
+
+    def test_RequestData_NoEcho(self):
+        transport = make_transport(b'')
+        with pytest.raises(LineTransportTimeout):
+            transport.request_data(0x1000)
+
+    def test_RequestData_NoResponse(self):
+        transport = make_transport(bytes(create_header(0x1000)))
+        with pytest.raises(LineTransportTimeout):
+            transport.request_data(0x1000)
+
+    def test_RequestData_MissingData(self):
+        transport = make_transport(bytes(create_header(0x1000)) + bytes([3, 1]))
+        with pytest.raises(LineTransportTimeout):
+            transport.request_data(0x1000)
+
+    def test_RequestData_MissingChecksum(self):
+        transport = make_transport(bytes(create_header(0x1000)) + bytes([1, 1]))
+        with pytest.raises(LineTransportTimeout, match='checksum'):
+            transport.request_data(0x1000)
+
+    def test_RequestData_InvalidChecksum(self):
+        transport = make_transport(bytes(create_header(0x1000)) + bytes([1, 1, 0]))
+        with pytest.raises(LineTransportDataError):
+            transport.request_data(0x1000)
+
+class TestLineSerialTransport_SendData:
+
+    def test_FrameTime(self):
+        assert frame_time(8, 19200) == pytest.approx(8 * 10 / 19200)
+
+    def test_SendData_OneWire(self):
+        frame = create_frame(0x1000, [1, 2, 3])
+        transport = make_transport(bytes(frame))
+        start = time.monotonic()
+        transport.send_data(0x1000, [1, 2, 3])
+        assert time.monotonic() - start < 0.05
+        assert transport._serial.tx == frame
+        assert transport._serial.rx == b''
+
+    def test_SendData_TwoWire_WaitsForWireTime(self):
+        transport = make_transport(b'', one_wire=False)
+        transport.baudrate = 1200
+        start = time.monotonic()
+        transport.send_data(0x1000, [1, 2, 3])
+        assert time.monotonic() - start >= frame_time(7, 1200)